@@ -0,0 +1,71 @@
+"""
+Compare pickling vertices via arago.hiro.utils.serialization with a JSON round trip of their dicts.
+
+Not part of the test suite; run with e.g.
+    PYTHONPATH=src python benchmarks/serialization.py --count 10000 --repeat 5
+"""
+import argparse
+import json
+import time
+from typing import Callable, List, Tuple
+
+from arago.hiro.model.graph.vertex import Vertex
+from arago.hiro.utils.serialization import dumps, loads
+
+# noinspection SpellCheckingInspection
+VERTEX_DATA = {
+    'ogit/_created-on': 1585068142772,
+    '/ProcessIssue': 'process_me',
+    'ogit/status': 'TERMINATED',
+    'ogit/_modified-on': 1585069015158,
+    'ogit/_owner': 'arago.co',
+    'ogit/_v': 8,
+    'ogit/_modified-by-app': 'cjix82tev000ou473gko8jgey',
+    'ogit/_type': 'ogit/Automation/AutomationIssue',
+    'ogit/_id': 'ck864nagkv8qfgx02r2ybfoob',
+    'ogit/_creator': 'ffluegel@arago.co',
+    'ogit/_v-id': '1585069015158-fmpmKq',
+    'ogit/_is-deleted': False,
+    'ogit/_creator-app': 'cjix82rxi000gu473w5kvkpqv',
+    'ogit/_modified-by': 'hiro_engine',
+}
+
+
+def via_pickle(vertices: List[Vertex]) -> Tuple[int, List[Vertex]]:
+    data = dumps(vertices)
+    return len(data), loads(data)
+
+
+def via_json(vertices: List[Vertex]) -> Tuple[int, List[Vertex]]:
+    text = json.dumps([vertex.to_dict() for vertex in vertices])
+    return len(text.encode()), [Vertex(item, draft=False) for item in json.loads(text)]
+
+
+def measure(round_trip: Callable[[List[Vertex]], Tuple[int, List[Vertex]]], vertices: List[Vertex], repeat: int):
+    best = None
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        size, restored = round_trip(vertices)
+        elapsed = time.perf_counter_ns() - start
+        assert [v.to_dict() for v in restored] == [v.to_dict() for v in vertices]
+        best = elapsed if best is None else min(best, elapsed)
+    return size, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    vertices = [Vertex({**VERTEX_DATA, 'ogit/_id': f'ck864nagkv8qfgx02r2y{i:05}'}, draft=False) for i in range(args.count)]
+    results = {name: measure(f, vertices, args.repeat) for name, f in (('pickle', via_pickle), ('json', via_json))}
+    for name, (size, best) in results.items():
+        print(f'{name:>6}: {size:>10} bytes {best / 1e6:>9.1f} ms  ({best / args.count / 1e3:.2f} us per vertex)')
+    (p_size, p_time), (j_size, j_time) = results['pickle'], results['json']
+    print(f' ratio: size {p_size / j_size:.2f}, time {p_time / j_time:.2f} (pickle / json)')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,18 @@
 from abc import abstractmethod
+from datetime import datetime
 from typing import TYPE_CHECKING, Generator, Union, Dict, Any, Mapping, Optional, Type, TypeVar, Iterable, Tuple, \
-    Literal
+    Literal, List
 
 from requests import Response
 
 from arago.hiro.model.graph.edge import Edge, EDGE_TYPE_T
 from arago.hiro.model.graph.vertex import Vertex, VERTEX_ID_T, VERTEX_TYPE_T, VERTEX_T_co, VERTEX_XID_T, \
-    VERTEX_XID_T_co
-from arago.hiro.model.search import Order
+    VERTEX_XID_T_co, VertexId
+from arago.hiro.model.search import Order, RefreshResult, Subgraph
+from arago.hiro.utils.fanout import FanOut
+from arago.hiro.utils.paging import PagedRun, LookupRun
+from arago.hiro.utils.result_set import ResultSet
+from arago.hiro.utils.scan import Scan, ScanCursor
 from .common import AbcRest, AbcData, AbcModel
 from ..model.graph.attribute import ATTRIBUTE_T
 
@@ -168,6 +173,43 @@ class AbcSearchModel(AbcModel):
     ) -> Generator[VERTEX_T_co, None, None]:
         ...
 
+    @abstractmethod
+    def connected_count(
+            self,
+            vertex_id: VERTEX_ID_T,
+            edge_type: EDGE_TYPE_T,
+            direction: Optional[Literal['in', 'out', 'both']] = None,
+            vertex_types: Optional[Iterable[VERTEX_TYPE_T]] = None
+    ) -> int:
+        ...
+
+    @abstractmethod
+    def connected_many(
+            self,
+            vertex_ids: Iterable[VERTEX_ID_T],
+            edge_type: EDGE_TYPE_T,
+            direction: Optional[Literal['in', 'out', 'both']] = None,
+            vertex_types: Optional[Iterable[VERTEX_TYPE_T]] = None,
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            max_query_length: int = 8192
+    ) -> Generator[Tuple[VertexId, List[VERTEX_T_co]], None, None]:
+        ...
+
+    @abstractmethod
+    def subgraph(
+            self,
+            roots: Iterable[VERTEX_ID_T],
+            edge_types: Optional[Iterable[EDGE_TYPE_T]] = None,
+            direction: Optional[Literal['in', 'out', 'both']] = None,
+            depth: int = 1,
+            vertex_types: Optional[Iterable[VERTEX_TYPE_T]] = None,
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            max_vertices: Optional[int] = None,
+            concurrency: int = 4,
+            max_query_length: int = 8192
+    ) -> Subgraph:
+        ...
+
     @abstractmethod
     def external_id(
             self,
@@ -186,6 +228,29 @@ class AbcSearchModel(AbcModel):
     ) -> Generator[VERTEX_T_co, None, None]:
         ...
 
+    @abstractmethod
+    def get_by_ids_parallel(
+            self,
+            vertex_ids: Iterable[VERTEX_ID_T],
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            chunk_size: int = 500,
+            concurrency: int = 4,
+            window: Optional[int] = None,
+            keep_order: bool = True,
+            max_query_length: int = 65536,
+            retries: int = 2
+    ) -> LookupRun[VERTEX_T_co]:
+        ...
+
+    @abstractmethod
+    def refresh(
+            self,
+            vertices: Iterable[VERTEX_T_co],
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            chunk_size: int = 100
+    ) -> RefreshResult:
+        ...
+
     @abstractmethod
     def index(
             self,
@@ -197,6 +262,69 @@ class AbcSearchModel(AbcModel):
     ) -> Generator[VERTEX_T_co, None, None]:
         ...
 
+    @abstractmethod
+    def index_result_set(
+            self,
+            query: str,
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            order: Optional[Order] = None,
+            offset: Optional[int] = None,
+            limit: Optional[int] = None,
+            memory_items: int = 10000,
+            spill_dir: Optional[str] = None
+    ) -> ResultSet[VERTEX_T_co]:
+        ...
+
+    @abstractmethod
+    def index_count(self, query: str) -> int:
+        ...
+
+    @abstractmethod
+    def index_many(
+            self,
+            queries: Iterable[str],
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            order: Optional[Order] = None,
+            concurrency: int = 4,
+            buffer: int = 1000
+    ) -> FanOut[VERTEX_T_co]:
+        ...
+
+    @abstractmethod
+    def index_parallel(
+            self,
+            query: str,
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            order: Optional[Order] = None,
+            page_size: int = 1000,
+            concurrency: int = 4,
+            window: Optional[int] = None
+    ) -> PagedRun[VERTEX_T_co]:
+        ...
+
+    @abstractmethod
+    def scan(
+            self,
+            query: str,
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            key: Literal['ogit/_id', 'ogit/_created-on'] = 'ogit/_id',
+            page_size: int = 1000,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+            partitions: int = 1,
+            concurrency: int = 4,
+            cursor: Optional[Union[str, ScanCursor]] = None
+    ) -> Scan[VERTEX_T_co]:
+        ...
+
+    @abstractmethod
+    def graph_count(
+            self,
+            root: Union[VERTEX_ID_T, VERTEX_XID_T_co],
+            query: str
+    ) -> int:
+        ...
+
     @abstractmethod
     def graph(
             self,
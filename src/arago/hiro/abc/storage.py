@@ -6,6 +6,7 @@ from requests import Response
 
 from arago.hiro.model.storage import TimeSeriesId, BlobId, TimeSeriesValue
 from .common import AbcRest, AbcData, AbcModel
+from ..utils.download import Download, DOWNLOAD_TARGET_T
 from ..utils.datetime import timestamp_ms_to_datetime, datetime_to_timestamp_ms
 
 if TYPE_CHECKING:
@@ -72,6 +73,23 @@ class AbcStorageBlobData(AbcData):
         """
         ...
 
+    @abstractmethod
+    def download(
+            self,
+            blob_id: str,
+            target: DOWNLOAD_TARGET_T,
+            content_id: Optional[str],
+            include_deleted: Optional[bool],
+            part_size: int,
+            concurrency: int,
+            resume: bool
+    ) -> Download:
+        """
+        content_id: since HIRO 7 (param)
+        include_deleted: since HIRO 7 (param)
+        """
+        ...
+
 
 # noinspection PyUnusedLocal
 class AbcStorageBlobModel(AbcModel):
@@ -99,6 +117,19 @@ class AbcStorageBlobModel(AbcModel):
     ) -> None:
         ...
 
+    @abstractmethod
+    def download(
+            self,
+            blob_id: BlobId,
+            target: DOWNLOAD_TARGET_T,
+            content_id: Optional[str],
+            include_deleted: Optional[bool],
+            part_size: int,
+            concurrency: int,
+            resume: bool
+    ) -> Download:
+        ...
+
 
 # noinspection PyUnusedLocal
 class AbcStorageLogRest(AbcRest):
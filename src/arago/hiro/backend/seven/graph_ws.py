@@ -450,7 +450,7 @@ class HiroWebSocketClient:
     ) -> Generator[Dict[str, Any], None, None]:  # VERTEX_T_co
         # Gremlin Graph Query: g.V({vertex_id}).outE({edge_type}).has('ogit/_in-type',within({vertex_types})).inV().range({offset}, {limit}})
         # Gremlin Graph Query: g.V({vertex_id}).inE({edge_type}).has('ogit/_out-type',within({vertex_types})).outV().range({offset}, {limit}})
-        # Gremlin Graph Query: g.V({vertex_id}).{direction}({edge_type}).hasLabel(within({vertex_types})).range({offset}, {limit}})
+        # Gremlin Graph Query: g.V({vertex_id}).bothE({edge_type}).otherV().has('ogit/_type',within({vertex_types})).range({offset}, {limit}})
         # .order().by('age', asc)
         # .count()
 
@@ -474,7 +474,7 @@ class HiroWebSocketClient:
                 raise RuntimeError()
         elif direction is None:
             edge_dir_stmt = 'bothE'
-            vertex_dir_stmt = 'bothV'
+            vertex_dir_stmt = '.otherV()'
         else:
             raise RuntimeError()
 
@@ -490,13 +490,11 @@ class HiroWebSocketClient:
         else:
             # .has('ogit/_in-type',within({vertex_types}))
             # .has('ogit/_out-type',within({vertex_types}))
-            # .hasLabel(within({vertex_types}))
+            # .otherV().has('ogit/_type',within({vertex_types}))
 
             if direction in ('out', 'in'):
                 stmt += '.has'
-            elif direction == 'both':
-                stmt += '.hasLabel'
-            else:
+            elif direction not in ('both', None):
                 raise RuntimeError()
 
             if isinstance(vertex_types, Iterable) and not isinstance(vertex_types, str):
@@ -515,8 +513,9 @@ class HiroWebSocketClient:
                 stmt += f"('{str(VirtualAttribute.OGIT__IN_TYPE)}',{predicate})"
             elif direction == 'in':
                 stmt += f"('{str(VirtualAttribute.OGIT__OUT_TYPE)}',{predicate})"
-            elif direction == 'both':
-                stmt += f"({predicate})"
+            elif direction in ('both', None):
+                # an edge in either direction does not tell which end is the other vertex
+                vertex_dir_stmt += f".has('{str(SystemAttribute.OGIT__TYPE)}',{predicate})"
             else:
                 raise RuntimeError()
 
@@ -586,6 +585,43 @@ class HiroWebSocketClient:
         # vertices = to_vertices(items, self.__base_client)
         # yield from vertices
 
+    def count_index(
+            self,
+            query: str,
+            include_deleted: Optional[bool] = None,  # server default: False
+            req_data: Optional[Mapping[str, Any]] = None
+    ) -> int:
+        items = self.search_index(query, include_deleted, count=True, req_data=req_data)
+        return int(next(items))
+
+    def count_graph(
+            self,
+            root_id: str,  # VERTEX_ID_T
+            query: str,
+            include_deleted: Optional[bool] = None,
+            headers: Optional[Mapping[str, str]] = None,
+            req_body: Optional[Mapping[str, str]] = None
+    ) -> int:
+        # https://tinkerpop.apache.org/docs/current/reference/#count-step
+        items = self.search_graph(
+            root_id, query + '.count()', include_deleted=include_deleted, headers=headers, req_body=req_body)
+        return int(next(items))
+
+    def count_connected(
+            self,
+            vertex_id: str,  # VERTEX_ID_T
+            edge_type: EDGE_TYPE_T,  # EDGE_TYPE_T
+            direction: Optional[Literal['in', 'out', 'both']] = None,
+            vertex_types: Optional[Union[Iterable[VERTEX_TYPE_T], VERTEX_TYPE_T]] = None,  # VERTEX_TYPE_T
+            include_deleted: Optional[bool] = None,
+            headers: Optional[Mapping[str, str]] = None,
+            req_body: Optional[Mapping[str, str]] = None
+    ) -> int:
+        items = self.search_connected(
+            vertex_id, edge_type, direction, vertex_types=vertex_types, count=True,
+            include_deleted=include_deleted, headers=headers, req_body=req_body)
+        return int(next(items))
+
     def get_vertex(
             self,
             vertex_id: str,
@@ -1,8 +1,10 @@
+import threading
+from concurrent.futures import Future
 from datetime import datetime
 from functools import cached_property
 from types import MappingProxyType
 from typing import Dict, Any, overload, Optional, TYPE_CHECKING, Union, Mapping, Final, Generator, Literal, \
-    Iterable
+    Iterable, Tuple, List
 from urllib.parse import quote
 
 from requests.models import Response
@@ -11,16 +13,19 @@ from arago.hiro.abc.auth import AbcData
 from arago.hiro.abc.graph import AbcGraphEdgeRest, AbcGraphEdgeData, AbcGraphEdgeModel
 from arago.hiro.abc.graph import AbcGraphRest, AbcGraphData, AbcGraphModel
 from arago.hiro.abc.graph import AbcGraphVertexRest, AbcGraphVertexData, AbcGraphVertexModel
+from arago.hiro.client.exception import HiroClientError
 from arago.hiro.model.graph.attribute import ReadOnlyAttribute, FinalAttribute, SystemAttribute, to_attribute, \
-    attribute_to_str, ATTRIBUTE_T_co
+    attribute_to_str, ATTRIBUTE_T_co, VirtualAttribute
 from arago.hiro.model.graph.dict import GraphDict
-from arago.hiro.model.graph.edge import EdgeId, Edge, EDGE_ID_T, EDGE_TYPE_T
+from arago.hiro.model.graph.edge import EdgeId, Edge, EDGE_ID_T, EDGE_TYPE_T, make_edge_id
 from arago.hiro.model.graph.history import HistoryFormat, HistoryEntry, HistoryDiff, HistoryMeta, HistoryAction
+from arago.hiro.model.graph.projection import Projection
 from arago.hiro.model.graph.vertex import VertexId, Vertex, resolve_vertex_id, VERTEX_T, VERTEX_ID_T, VERTEX_TYPE_T, \
     VERTEX_T_co, ExternalVertexId, VERTEX_XID_T_co, resolve_vertex_type, VERTEX_ID_T_co, to_vertex_id, to_vertex_xid, \
-    vertex_id_to_str
+    vertex_id_to_str, resolve_vertex_xid, VersionId
 from arago.hiro.model.storage import BLOB_VERTEX_T_co, TIME_SERIES_VERTEX_T_co
-from arago.hiro.utils.cast_c import to_vertex
+from arago.hiro.utils.bulk import BulkRun
+from arago.hiro.utils.cast_c import to_vertex, to_vertices
 from arago.hiro.utils.datetime import datetime_to_timestamp_ms
 from arago.ogit import OgitAttribute
 from arago.ogit import OgitEntity
@@ -29,6 +34,7 @@ from arago.ontology import OntologyEntity, OntologyVerb, Attribute
 
 if TYPE_CHECKING:
     from arago.hiro.client.rest_base_client import HiroRestBaseClient
+    from arago.hiro.client.version_store import VersionStore
 
 
 # https://pod1159.saasarago.com/_api/index.html
@@ -81,18 +87,20 @@ class Hiro6GraphEdgeData(AbcGraphEdgeData):
 
 
 class Hiro6GraphEdgeModel(AbcGraphEdgeModel):
+    __base_client: Final['HiroRestBaseClient']
     __data_client: Final[Hiro6GraphEdgeData]
 
     def __init__(self, client: 'HiroRestBaseClient') -> None:
         super().__init__(client)
+        self.__base_client = client
         self.__data_client = Hiro6GraphEdgeData(client)
 
-    def create(
-            self,
+    @staticmethod
+    def __edge_args(
             out_vertex_id: Union[Vertex, VERTEX_ID_T],
             edge_type: EDGE_TYPE_T,
             in_vertex_id: Union[Vertex, VERTEX_ID_T]
-    ) -> Edge:
+    ) -> Tuple[str, str, str]:
         if isinstance(out_vertex_id, Vertex):
             out_vertex_id = out_vertex_id.id
         if isinstance(out_vertex_id, VertexId):
@@ -108,12 +116,99 @@ class Hiro6GraphEdgeModel(AbcGraphEdgeModel):
             in_vertex_id = in_vertex_id.id
         if isinstance(in_vertex_id, VertexId):
             in_vertex_id = str(in_vertex_id)
+        return out_vertex_id, edge_type, in_vertex_id
+
+    def create(
+            self,
+            out_vertex_id: Union[Vertex, VERTEX_ID_T],
+            edge_type: EDGE_TYPE_T,
+            in_vertex_id: Union[Vertex, VERTEX_ID_T]
+    ) -> Edge:
+        out_vertex_id, edge_type, in_vertex_id = self.__edge_args(out_vertex_id, edge_type, in_vertex_id)
         res_data = self.__data_client.create(
             out_vertex_id, edge_type, in_vertex_id
         )
         edge = Edge(res_data)
         return edge
 
+    def bulk_create(
+            self,
+            edges: Iterable[Tuple[Union[Vertex, VERTEX_ID_T], EDGE_TYPE_T, Union[Vertex, VERTEX_ID_T]]],
+            existing: Optional[Iterable[EDGE_ID_T]] = None,
+            fetch_existing: bool = False,
+            concurrency: int = 8,
+            window: Optional[int] = None
+    ) -> BulkRun[Any, Edge]:
+        """
+        Create many (out_vertex_id, edge_type, in_vertex_id) edges concurrently, in input order.
+
+        Edges listed in existing or, with fetch_existing, found among the outgoing edges of their out vertex
+        are not sent. Neither are 'already exists' (409) responses errors. Such items yield a draft Edge
+        carrying only the deterministic id, type and vertex ids. An edge repeated within the batch is sent
+        once; its copies wait for that attempt and share its outcome.
+        """
+        lock = threading.Lock()
+        # the first attempt per edge id; None for edges known to exist
+        claims: Dict[str, Optional['Future[None]']] = dict.fromkeys(
+            (str(edge_id) for edge_id in existing), None) if existing is not None else {}
+        fetched: Dict[Tuple[str, str], List[Any]] = {}
+        search = self.__base_client.root.model.search
+
+        def is_known(out_vertex_id: str, edge_type: str, edge_id: str) -> bool:
+            if not fetch_existing:
+                return False
+            key = (out_vertex_id, edge_type)
+            with lock:
+                entry = fetched.get(key)
+                if entry is None:
+                    entry = fetched[key] = [threading.Lock(), None]
+            with entry[0]:
+                # one lookup per out vertex and edge type, shared by all edges of that pair
+                if entry[1] is None:
+                    vertices = search.connected(out_vertex_id, edge_type, 'out', fields=(OgitAttribute.OGIT__ID,))
+                    entry[1] = {str(make_edge_id(out_vertex_id, edge_type, str(v.id))) for v in vertices}
+            return edge_id in entry[1]
+
+        def existing_edge(out_vertex_id: str, edge_type: str, in_vertex_id: str, edge_id: str) -> Edge:
+            return Edge({
+                OgitAttribute.OGIT__ID: edge_id,
+                OgitAttribute.OGIT__TYPE: edge_type,
+                VirtualAttribute.OGIT__OUT_ID: out_vertex_id,
+                VirtualAttribute.OGIT__IN_ID: in_vertex_id,
+            })
+
+        def create(item: Tuple[Any, Any, Any]) -> Edge:
+            out_vertex_id, edge_type, in_vertex_id = self.__edge_args(*item)
+            edge_id = str(make_edge_id(out_vertex_id, edge_type, in_vertex_id))
+            with lock:
+                claimed = edge_id in claims
+                if claimed:
+                    claim = claims[edge_id]
+                else:
+                    claim = claims[edge_id] = Future()
+            if claimed:
+                if claim is not None:
+                    # the first attempt runs on a worker taken earlier from the same queue; raises its error
+                    claim.result()
+                return existing_edge(out_vertex_id, edge_type, in_vertex_id, edge_id)
+            try:
+                if is_known(out_vertex_id, edge_type, edge_id):
+                    edge = existing_edge(out_vertex_id, edge_type, in_vertex_id, edge_id)
+                else:
+                    try:
+                        edge = Edge(self.__data_client.create(out_vertex_id, edge_type, in_vertex_id))
+                    except HiroClientError as e:
+                        if e.status_code != 409:
+                            raise
+                        edge = existing_edge(out_vertex_id, edge_type, in_vertex_id, edge_id)
+            except BaseException as e:
+                claim.set_exception(e)
+                raise
+            claim.set_result(None)
+            return edge
+
+        return BulkRun(create, edges, concurrency, window)
+
     def delete(
             self,
             edge_id: Union[Edge, EDGE_ID_T]
@@ -561,13 +656,18 @@ class Hiro6GraphVertexModel(AbcGraphVertexModel):
 
         res_data = self.__data_client.create(e_vertex_type.name.uri, req_data)
         vertex = to_vertex(res_data, self.__base_client)
+        if vertex.xid:
+            self.__base_client.root.xid_cache.put(vertex.xid, vertex.id)
         return vertex
 
     @overload
     def get(
             self,
             vertex: VERTEX_T,
-            fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None
+            fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None,
+            *,
+            v_id: Optional[VersionId] = None,
+            batch: Optional[bool] = None
     ) -> VERTEX_T_co:
         ...
 
@@ -575,7 +675,10 @@ class Hiro6GraphVertexModel(AbcGraphVertexModel):
     def get(
             self,
             vertex_id: VERTEX_ID_T,
-            fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None
+            fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None,
+            *,
+            v_id: Optional[VersionId] = None,
+            batch: Optional[bool] = None
     ) -> VERTEX_T_co:
         ...
 
@@ -583,17 +686,32 @@ class Hiro6GraphVertexModel(AbcGraphVertexModel):
     def get(
             self,
             vertex_xid: VERTEX_XID_T_co,
-            fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None
+            fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None,
+            *,
+            v_id: Optional[VersionId] = None,
+            batch: Optional[bool] = None
     ) -> VERTEX_T_co:
         ...
 
     def get(self, *args, **kwargs) -> VERTEX_T_co:
+        """
+        Fetch a vertex by id, external id or vertex; v_id fetches one of its versions.
+
+        With batch, or client.batch_gets, the get goes through client.vertex_loader: gets issued concurrently
+        from other threads within its delay are fetched with it in one /query/ids request. A loop in a single
+        thread gains nothing from that; it should hand all ids to the loader at once:
+
+            vertices = client.vertex_loader.load_many(vertex_ids)
+            futures = [client.vertex_loader.load_future(vertex_id) for vertex_id in vertex_ids]
+        """
         if not args and not kwargs:
             raise RuntimeError('Missing args and or kwargs')
         vertex: Optional[VERTEX_T] = None
         vertex_id: Optional[VERTEX_ID_T] = None
         vertex_xid: Optional[VERTEX_XID_T_co] = None
         fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None
+        v_id: Optional[VersionId] = None
+        batch: Optional[bool] = None
         if len(args) == 1:
             v = args[0]
             if isinstance(v, ExternalVertexId):
@@ -617,7 +735,7 @@ class Hiro6GraphVertexModel(AbcGraphVertexModel):
                     else:
                         raise TypeError(type(v))
                 elif i == 1:
-                    if isinstance(v, Attribute):
+                    if v is None or isinstance(v, Attribute):
                         fields = v
                     elif isinstance(v, Iterable):
                         fields = v
@@ -627,7 +745,7 @@ class Hiro6GraphVertexModel(AbcGraphVertexModel):
                     raise RuntimeError('Unreachable')
             del i, v
         else:
-            raise RuntimeError('Too much args; max 2')
+            raise RuntimeError('Too much args; max 2, v_id and batch are keyword-only')
         if kwargs:
             for k, v in kwargs.items():
                 if k == 'vertex_id':
@@ -641,7 +759,7 @@ class Hiro6GraphVertexModel(AbcGraphVertexModel):
                     else:
                         raise TypeError(type(v))
                 elif k == 'fields':
-                    if isinstance(v, Iterable):
+                    if v is None or isinstance(v, Iterable):
                         fields = v
                     else:
                         raise TypeError(type(v))
@@ -650,15 +768,41 @@ class Hiro6GraphVertexModel(AbcGraphVertexModel):
                         vertex = v
                     else:
                         raise TypeError(type(v))
+                elif k == 'v_id':
+                    if isinstance(v, str):
+                        v_id = VersionId(v)
+                    else:
+                        raise TypeError(type(v))
+                elif k == 'batch':
+                    if v is None or isinstance(v, bool):
+                        batch = v
+                    else:
+                        raise TypeError(type(v))
                 else:
                     raise KeyError(k)
             del k, v
 
         e_vertex_id = self.__base_client.root.resolve_vertex_id(vertex, vertex_id, vertex_xid)
-        e_fields = (attribute_to_str(field) for field in fields) if fields else None
-
-        res_data = self.__data_client.get(str(e_vertex_id), e_fields)
+        e_fields = [attribute_to_str(field) for field in fields] if fields else None
+        if v_id is not None:
+            return self.__get_version(str(e_vertex_id), v_id, e_fields)
+        if batch is None:
+            batch = self.__base_client.root.batch_gets
+        if batch:
+            # missing vertices raise KeyError from the loader
+            return self.__base_client.root.vertex_loader.load(e_vertex_id, e_fields)
+
+        cache = self.__base_client.root.vertex_cache
+        if cache is None:
+            res_data = self.__data_client.get(str(e_vertex_id), e_fields)
+        else:
+            res_data = cache.get_or_fetch(
+                cache.key('id', str(e_vertex_id), e_fields),
+                lambda: self.__data_client.get(str(e_vertex_id), e_fields)
+            )
         vertex = to_vertex(res_data, self.__base_client)
+        if e_fields:
+            Projection(self.__base_client.root, e_fields).add(vertex)
         return vertex
 
     def get_external(
@@ -666,12 +810,17 @@ class Hiro6GraphVertexModel(AbcGraphVertexModel):
             vertex_xid: VERTEX_XID_T_co,
             fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None
     ) -> Generator[VERTEX_T_co, None, None]:
-        e_fields = (attribute_to_str(field) for field in fields) if fields else None
+        e_fields = [attribute_to_str(field) for field in fields] if fields else None
 
-        items = self.__data_client.get_external(str(vertex_xid), e_fields)
-        for item in items:
-            vertex = to_vertex(item, self.__base_client)
-            yield vertex
+        cache = self.__base_client.root.vertex_cache
+        if cache is None:
+            items = self.__data_client.get_external(str(vertex_xid), e_fields)
+        else:
+            items = cache.get_or_fetch(
+                cache.key('xid', str(vertex_xid), e_fields),
+                lambda: list(self.__data_client.get_external(str(vertex_xid), e_fields))
+            )
+        yield from to_vertices(items, self.__base_client, e_fields)
 
     @overload
     def update(self, vertex: VERTEX_T) -> VERTEX_T_co:
@@ -799,6 +948,12 @@ class Hiro6GraphVertexModel(AbcGraphVertexModel):
 
         res_data = self.__data_client.update(e_vertex_id, req_data)
         vertex = to_vertex(res_data, self.__base_client)
+        self.__invalidate(vertex.id)
+        # the external id may have changed
+        xid_cache = self.__base_client.root.xid_cache
+        xid_cache.invalidate_id(vertex.id)
+        if vertex.xid:
+            xid_cache.put(vertex.xid, vertex.id)
         return vertex
 
     @overload
@@ -848,8 +1003,119 @@ class Hiro6GraphVertexModel(AbcGraphVertexModel):
 
         res_data = self.__data_client.delete(e_vertex_id)
         vertex = to_vertex(res_data, self.__base_client)
+        self.__invalidate(vertex.id)
+        xid_cache = self.__base_client.root.xid_cache
+        xid_cache.invalidate_id(vertex.id)
+        if vertex.xid:
+            xid_cache.invalidate(vertex.xid)
         return vertex
 
+    def __invalidate(self, vertex_id: Optional[VertexId]) -> None:
+        cache = self.__base_client.root.vertex_cache
+        if cache is not None and vertex_id is not None:
+            cache.invalidate_id(vertex_id)
+
+    def bulk_create(
+            self,
+            vertices: Iterable[VERTEX_T],
+            concurrency: int = 8,
+            window: Optional[int] = None
+    ) -> BulkRun[VERTEX_T, VERTEX_T_co]:
+        """
+        Create many vertices concurrently; the returned run yields one result per vertex in input order.
+        """
+        return BulkRun(self.create, vertices, concurrency, window)
+
+    def bulk_update(
+            self,
+            vertices: Iterable[Union[VERTEX_T, Tuple[Union[VERTEX_ID_T, VERTEX_XID_T_co, VERTEX_T], VERTEX_T]]],
+            concurrency: int = 8,
+            window: Optional[int] = None
+    ) -> BulkRun[Any, VERTEX_T_co]:
+        """
+        Update many vertices concurrently; items are either vertices or (vertex_id, vertex) pairs.
+        """
+
+        def update(item: Any) -> VERTEX_T_co:
+            if isinstance(item, tuple):
+                return self.update(*item)
+            return self.update(item)
+
+        return BulkRun(update, vertices, concurrency, window)
+
+    def bulk_delete(
+            self,
+            vertices: Iterable[Union[VERTEX_T, VERTEX_ID_T, VERTEX_XID_T_co]],
+            concurrency: int = 8,
+            window: Optional[int] = None
+    ) -> BulkRun[Any, VERTEX_T_co]:
+        """
+        Delete many vertices concurrently; the returned run yields one result per item in input order.
+        """
+        return BulkRun(self.delete, vertices, concurrency, window)
+
+    def upsert(
+            self,
+            vertices: Iterable[VERTEX_T],
+            chunk_size: int = 100,
+            concurrency: int = 8,
+            window: Optional[int] = None
+    ) -> BulkRun[VERTEX_T, VERTEX_T_co]:
+        """
+        Create or update vertices keyed by their ogit/_xid, in input order.
+
+        External ids are resolved per chunk of vertices with HiroClient.resolve_xids before the chunk is
+        submitted; newly created vertices are added to the client's xid cache.
+        """
+        client = self.__base_client.root
+        lock = threading.Lock()
+        # lock and number of calls using it per xid in flight; dropped once unused, so memory stays bounded by window
+        xid_locks: Dict[VERTEX_XID_T_co, List[Any]] = {}
+
+        def chunks() -> Generator[VERTEX_T, None, None]:
+            chunk = []
+            for vertex in vertices:
+                chunk.append(vertex)
+                if len(chunk) >= chunk_size:
+                    yield from resolved(chunk)
+                    chunk = []
+            if chunk:
+                yield from resolved(chunk)
+
+        def resolved(chunk: List[VERTEX_T]) -> List[VERTEX_T]:
+            xids = {resolve_vertex_xid(vertex, None) for vertex in chunk}
+            xids.discard(None)
+            try:
+                # fills the xid cache, including negative entries for unknown external ids
+                client.resolve_xids(xids)
+            except RuntimeError:
+                # ambiguous external ids are reported per item by resolve_xid
+                pass
+            return chunk
+
+        def upsert(vertex: VERTEX_T) -> VERTEX_T_co:
+            vertex_xid = resolve_vertex_xid(vertex, None)
+            if vertex_xid is None:
+                raise KeyError(f'Missing {OgitAttribute.OGIT__XID} key in vertex')
+            with lock:
+                entry = xid_locks.get(vertex_xid)
+                if entry is None:
+                    entry = xid_locks[vertex_xid] = [threading.Lock(), 0]
+                entry[1] += 1
+            try:
+                with entry[0]:
+                    vertex_id = client.resolve_xid(vertex_xid)
+                    if vertex_id is None:
+                        return self.create(vertex)
+            finally:
+                with lock:
+                    entry[1] -= 1
+                    if entry[1] == 0:
+                        del xid_locks[vertex_xid]
+            return self.update(vertex_id, vertex)
+
+        return BulkRun(upsert, chunks(), concurrency, window)
+
     def history(
             self,
             vertex_id: Union[VERTEX_T_co, VERTEX_ID_T_co, VERTEX_XID_T_co],
@@ -895,14 +1161,74 @@ class Hiro6GraphVertexModel(AbcGraphVertexModel):
         else:
             raise RuntimeError('Unreachable')
 
-        for item in self.__data_client.history(
+        store = self.__base_client.root.version_store
+        if store is not None and res_format is not HistoryFormat.DIFF \
+                and offset is None and limit is None and params is None and headers is None \
+                and (version is None or (e_start is None and e_end is None)):
+            items = self.__stored_history(
+                store, e_vertex_id, e_start, e_end, e_format or HistoryFormat.ELEMENT.value, version)
+        else:
+            items = self.__data_client.history(
                 e_vertex_id, start=e_start, end=e_end,
                 offset=offset, limit=limit,
                 res_format=e_format,
                 version=version,
-                params=params, headers=headers):
+                params=params, headers=headers)
+        for item in items:
             yield transform(item)
 
+    def __stored_history(
+            self,
+            store: 'VersionStore',
+            vertex_id: str,
+            start: Optional[int],
+            end: Optional[int],
+            res_format: str,
+            version: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        if version is not None:
+            item = store.get(vertex_id, res_format, version=version)
+            if item is not None:
+                return [item]
+            items = list(self.__data_client.history(vertex_id, res_format=res_format, version=version))
+            store.add(vertex_id, res_format, items)
+            return items
+        # stored history is complete up to the watermark and versions never change,
+        # so only entries from the watermark on are fetched (from is inclusive; duplicates are ignored)
+        watermark = store.watermark(vertex_id, res_format)
+        if watermark is None or end is None or end >= watermark:
+            high = store.add(vertex_id, res_format, self.__data_client.history(
+                vertex_id, start=watermark, res_format=res_format))
+            if high is not None:
+                store.set_watermark(vertex_id, res_format, high)
+        return store.items(vertex_id, res_format, start, end)
+
+    def __get_version(self, vertex_id: str, v_id: VersionId, e_fields: Optional[List[str]]) -> VERTEX_T_co:
+        # HIRO 6 cannot get a vertex by version id; its timestamp narrows the history down to that instant
+        store = self.__base_client.root.version_store
+        res_format = HistoryFormat.ELEMENT.value
+        if store is not None:
+            item = store.get(vertex_id, res_format, v_id=v_id)
+            if item is not None:
+                return self.__version_vertex(item, e_fields)
+        timestamp = v_id.timestamp_ms()
+        # the version may be the deletion of the vertex
+        items = list(self.__data_client.history(
+            vertex_id, start=timestamp, end=timestamp, res_format=res_format, params={'includeDeleted': 'true'}))
+        if store is not None:
+            store.add(vertex_id, res_format, items)
+        for item in items:
+            if item.get(attribute_to_str(SystemAttribute.OGIT__V_ID)) == v_id:
+                return self.__version_vertex(item, e_fields)
+        raise HiroClientError(f'Version {v_id} of vertex {vertex_id} not found')
+
+    def __version_vertex(self, item: Mapping[str, Any], e_fields: Optional[List[str]]) -> VERTEX_T_co:
+        if e_fields:
+            keep = {*e_fields, attribute_to_str(SystemAttribute.OGIT__ID), attribute_to_str(SystemAttribute.OGIT__TYPE)}
+            item = {k: v for k, v in item.items() if k in keep}
+        # no Projection: back-filling would load the current version, not this one
+        return to_vertex(item, self.__base_client)
+
 
 class Hiro6GraphRest(AbcGraphRest):
     __client: Final['HiroRestBaseClient']
@@ -1,20 +1,32 @@
 import logging
+from datetime import datetime, timezone
 from typing import Dict, Any, Generator, Tuple, Union, TYPE_CHECKING, Mapping, Type, Optional, Final, Iterable, \
-    Literal
+    Literal, Hashable, List, Callable
 from urllib.parse import quote
 
 from requests.models import Response
 
 from arago.hiro.abc.common import AbcData
 from arago.hiro.abc.search import AbcSearchRest, AbcSearchData, AbcSearchModel, T
-from arago.hiro.model.graph.attribute import attribute_to_str, ATTRIBUTE_T_co
+from arago.hiro.client.adaptive_fields import query_shape
+from arago.hiro.model.graph.attribute import attribute_to_str, ATTRIBUTE_T_co, SystemAttribute, VirtualAttribute
 from arago.hiro.model.graph.edge import EDGE_TYPE_T
+from arago.hiro.model.graph.projection import Projection
 from arago.hiro.model.graph.vertex import Vertex, VERTEX_XID_T, external_id_to_str, VERTEX_ID_T, \
-    VERTEX_TYPE_T, VERTEX_T_co, vertex_type_to_str, VERTEX_XID_T_co, ExternalVertexId, vertex_id_to_str
-from arago.hiro.model.search import Order
-from arago.hiro.utils.cast_c import to_vertices
+    VERTEX_TYPE_T, VERTEX_T_co, vertex_type_to_str, VERTEX_XID_T_co, ExternalVertexId, vertex_id_to_str, VertexId
+from arago.hiro.model.search import Order, RefreshResult, Subgraph, SubgraphEdge, quote_term, connected_query, \
+    connected_edges_query, chunk_by_length
+from arago.hiro.utils.bulk import BulkRun
+from arago.hiro.utils.cast_c import to_vertices, to_vertex
+from arago.hiro.utils.datetime import datetime_to_timestamp_ms
+from arago.hiro.utils.fanout import FanOut
+from arago.hiro.utils.paging import PagedRun, LookupRun
+from arago.hiro.utils.result_set import ResultSet
+from arago.hiro.utils.scan import Scan, ScanCursor, ScanPartition, split_range
+from arago.ogit import OgitVerb
 
 if TYPE_CHECKING:
+    from arago.hiro.client.adaptive_fields import FieldProfile
     from arago.hiro.client.rest_base_client import HiroRestBaseClient
 
 
@@ -87,10 +99,12 @@ class Hiro6SearchRest(AbcSearchRest):
 
 
 class Hiro6SearchData(AbcSearchData):
+    __base_client: Final['HiroRestBaseClient']
     __rest_client: Final[Hiro6SearchRest]
 
     def __init__(self, client: 'HiroRestBaseClient') -> None:
         super().__init__(client)
+        self.__base_client = client
         self.__rest_client = Hiro6SearchRest(client)
 
     def connected(
@@ -223,12 +237,20 @@ class Hiro6SearchData(AbcSearchData):
             order: Optional[Union[Tuple[str, str], Iterable[Tuple[str, str]]]] = None,
             fields: Optional[Union[str, Iterable[str]]] = None,
             req_data: Optional[Mapping[str, Any]] = None,
-            headers: Optional[Mapping[str, str]] = None
+            headers: Optional[Mapping[str, str]] = None,
+            max_query_length: Optional[int] = 65536  # virtual
     ) -> Generator[Dict[str, Any], None, None]:
         # https://pod1159.saasarago.com/_api/specs/api.yaml
         # https://pod1159.saasarago.com/_api/index.html#!/%5BQuery%5D_Search/get_query_type
         # https://pod1159.saasarago.com/_api/index.html#!/%5BQuery%5D_Search/post_query_type
 
+        if max_query_length is not None and sum(len(i) + 1 for i in vertex_ids) > max_query_length:
+            # one request per chunk of ids; order applies within each chunk
+            for chunk in chunk_by_length(vertex_ids, 0, max_query_length):
+                yield from self.get_by_ids(
+                    *chunk, order=order, fields=fields, req_data=req_data, headers=headers, max_query_length=None)
+            return
+
         # <editor-fold name="effective request data">
         e_req_data = {
             'query': ','.join(vertex_ids)
@@ -277,6 +299,7 @@ class Hiro6SearchData(AbcSearchData):
             offset: Optional[int] = None,  # server default: 0
             limit: Optional[int] = None,  # server default: 20
             fields: Optional[Union[str, Iterable[str]]] = None,
+            count: Optional[bool] = None,  # server default: False
             req_data: Optional[Mapping[str, Any]] = None,
             headers: Optional[Mapping[str, str]] = None
     ) -> Generator[Dict[str, Any], None, None]:
@@ -326,6 +349,12 @@ class Hiro6SearchData(AbcSearchData):
             else:
                 raise TypeError(type(fields))
 
+        if count is not None:
+            if isinstance(count, bool):
+                e_req_data['count'] = str(count).lower()
+            else:
+                raise TypeError(type(count))
+
         if req_data is not None:
             if isinstance(req_data, Mapping):
                 e_req_data.update(req_data)
@@ -342,9 +371,15 @@ class Hiro6SearchData(AbcSearchData):
                 raise TypeError(type(headers))
         # </editor-fold>
 
-        response = self.__rest_client.index(e_req_data, e_headers, stream=True)
-        items = AbcData.items_generator(response)
-        yield from items
+        def fetch() -> Generator[Dict[str, Any], None, None]:
+            response = self.__rest_client.index(e_req_data, e_headers, stream=True)
+            return AbcData.items_generator(response)
+
+        cache = self.__base_client.root.query_cache
+        if cache is None:
+            yield from fetch()
+        else:
+            yield from cache.get_or_fetch(cache.key('index', e_req_data, e_headers), fetch)
 
     def graph(
             self,
@@ -354,6 +389,7 @@ class Hiro6SearchData(AbcSearchData):
             offset: Optional[int] = None,  # virtual
             limit: Optional[int] = None,  # virtual
             fields: Optional[Union[str, Iterable[str]]] = None,
+            count: Optional[bool] = None,  # virtual
             req_data: Optional[Mapping[str, Any]] = None,
             headers: Optional[Mapping[str, str]] = None
     ) -> Generator[Dict[str, Any], None, None]:
@@ -399,11 +435,13 @@ class Hiro6SearchData(AbcSearchData):
         if fields:
             e_req_data['fields'] = ','.join(fields)
 
-        if False and 'count' is not None:
-            # https://tinkerpop.apache.org/docs/current/reference/#count-step
-            e_req_data['query'] += '.count()'
-            # TODO impl count hint
-            raise RuntimeError('count()')
+        if count is not None:
+            if isinstance(count, bool):
+                if count is True:
+                    # https://tinkerpop.apache.org/docs/current/reference/#count-step
+                    e_req_data['query'] += '.count()'
+            else:
+                raise TypeError(type(count))
 
         if req_data is not None:
             if isinstance(req_data, Mapping):
@@ -421,9 +459,15 @@ class Hiro6SearchData(AbcSearchData):
                 raise TypeError(type(headers))
         # </editor-fold>
 
-        response = self.__rest_client.graph(e_req_data, e_headers, stream=True)
-        items = AbcData.items_generator(response)
-        yield from items
+        def fetch() -> Generator[Dict[str, Any], None, None]:
+            response = self.__rest_client.graph(e_req_data, e_headers, stream=True)
+            return AbcData.items_generator(response)
+
+        cache = self.__base_client.root.query_cache
+        if cache is None:
+            yield from fetch()
+        else:
+            yield from cache.get_or_fetch(cache.key('graph', e_req_data, e_headers), fetch)
 
 
 class Hiro6SearchModel(AbcSearchModel):
@@ -455,14 +499,190 @@ class Hiro6SearchModel(AbcSearchModel):
         # Gremlin Graph Query: g.V({vertex_id}).inE({edge_type}).has('ogit/_out-type',within({vertex_types})).outV().range({offset}, {limit}})
         # Gremlin Graph Query: g.V({vertex_id}).{direction}({edge_type}).hasLabel(within({vertex_types})).range({offset}, {limit}})
         e_fields = [attribute_to_str(field) for field in fields] if fields else None
-        e_vertex_types = (vertex_type_to_str(vertex_type) for vertex_type in vertex_types) if vertex_types else None
+        e_vertex_types = tuple(vertex_type_to_str(vertex_type) for vertex_type in vertex_types) if vertex_types else None
+        profile = None
+        if e_fields is None:
+            e_fields, profile = self.__learned_fields(('connected', edge_type, direction, e_vertex_types))
 
-        #             if count is True:
-        #                 return next(items)
         items = self.__data_client.connected(vertex_id, edge_type, direction, e_fields, e_vertex_types, offset, limit)
-        vertices = to_vertices(items, self.__base_client)
+        vertices = to_vertices(items, self.__base_client, e_fields, profile)
         yield from vertices
 
+    def connected_count(
+            self,
+            vertex_id: VERTEX_ID_T,
+            edge_type: EDGE_TYPE_T,
+            direction: Optional[Literal['in', 'out', 'both']] = None,
+            vertex_types: Optional[Iterable[VERTEX_TYPE_T]] = None
+    ) -> int:
+        """
+        Number of vertices connected to vertex_id; counted by a gremlin query as /connected has no count.
+        """
+        e_vertex_id = vertex_id_to_str(vertex_id)
+        e_vertex_types = [vertex_type_to_str(vertex_type) for vertex_type in vertex_types] if vertex_types else None
+        e_edge_type = str(edge_type.value) if isinstance(edge_type, OgitVerb) else str(edge_type)
+        query = connected_query(e_edge_type, direction, e_vertex_types)
+        items = self.__data_client.graph(e_vertex_id, query, count=True)
+        return int(next(items))
+
+    def connected_many(
+            self,
+            vertex_ids: Iterable[VERTEX_ID_T],
+            edge_type: EDGE_TYPE_T,
+            direction: Optional[Literal['in', 'out', 'both']] = None,
+            vertex_types: Optional[Iterable[VERTEX_TYPE_T]] = None,
+            fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None,
+            max_query_length: int = 8192
+    ) -> Generator[Tuple[VertexId, List[VERTEX_T_co]], None, None]:
+        """
+        connected() for many roots; yields (root, connected vertices) for every root in input order.
+
+        Roots are sent in chunks of up to max_query_length characters of gremlin. Per chunk one traversal
+        returns the edges of all roots, which tell the root of every connected vertex, and one /query/ids
+        call fetches the connected vertices, each once.
+        """
+        e_vertex_ids = list(dict.fromkeys(vertex_id_to_str(vertex_id) for vertex_id in vertex_ids))
+        e_edge_type = str(edge_type.value) if isinstance(edge_type, OgitVerb) else str(edge_type)
+        e_vertex_types = [vertex_type_to_str(vertex_type) for vertex_type in vertex_types] if vertex_types else None
+        e_fields = [attribute_to_str(field) for field in fields] if fields else None
+        e_id = attribute_to_str(SystemAttribute.OGIT__ID)
+        if e_fields is not None and e_id not in e_fields:
+            # ogit/_id is needed to hand the vertices to their roots
+            e_fields.append(e_id)
+        e_out_id = attribute_to_str(VirtualAttribute.OGIT__OUT_ID)
+        e_in_id = attribute_to_str(VirtualAttribute.OGIT__IN_ID)
+        e_out_type = attribute_to_str(VirtualAttribute.OGIT__OUT_TYPE)
+        e_in_type = attribute_to_str(VirtualAttribute.OGIT__IN_TYPE)
+        e_edge_fields = [e_out_id, e_in_id, e_out_type, e_in_type]
+        type_filter = set(e_vertex_types) if e_vertex_types else None
+
+        overhead = len(connected_edges_query((), e_edge_type, direction, e_vertex_types))
+        # every id is quoted and separated by a comma
+        for chunk in chunk_by_length(e_vertex_ids, overhead, max_query_length, 3):
+            query = connected_edges_query(chunk, e_edge_type, direction, e_vertex_types)
+            edges = self.__data_client.graph(chunk[0], query, fields=e_edge_fields)
+            connected: Dict[str, Dict[str, None]] = {e_vertex_id: {} for e_vertex_id in chunk}
+            for edge in edges:
+                out_id, in_id = edge[e_out_id], edge[e_in_id]
+                if direction != 'in' and out_id in connected and \
+                        (type_filter is None or edge.get(e_in_type) in type_filter):
+                    connected[out_id][in_id] = None
+                if direction != 'out' and in_id in connected and \
+                        (type_filter is None or edge.get(e_out_type) in type_filter):
+                    connected[in_id][out_id] = None
+
+            neighbour_ids = list(dict.fromkeys(i for ids in connected.values() for i in ids))
+            items = self.__data_client.get_by_ids(*neighbour_ids, fields=e_fields) if neighbour_ids else ()
+            vertices = {str(vertex.id): vertex for vertex in to_vertices(items, self.__base_client, e_fields)}
+            for e_vertex_id in chunk:
+                yield VertexId(e_vertex_id), [vertices[i] for i in connected[e_vertex_id] if i in vertices]
+
+    def subgraph(
+            self,
+            roots: Iterable[VERTEX_ID_T],
+            edge_types: Optional[Iterable[EDGE_TYPE_T]] = None,
+            direction: Optional[Literal['in', 'out', 'both']] = None,
+            depth: int = 1,
+            vertex_types: Optional[Iterable[VERTEX_TYPE_T]] = None,
+            fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None,
+            max_vertices: Optional[int] = None,
+            concurrency: int = 4,
+            max_query_length: int = 8192
+    ) -> Subgraph:
+        """
+        Fetch the vertices up to depth edges away from roots, and the edges followed to reach them.
+
+        Every level is expanded with connected_many's traversals, run concurrently over chunks of the
+        frontier. Vertices already seen are not expanded again; expansion stops once max_vertices are
+        known. Vertex bodies are fetched once, after the traversal.
+        """
+        if depth < 0:
+            raise ValueError(f'Expected depth >= 0; got {depth}')
+        e_edge_types = [
+            str(edge_type.value) if isinstance(edge_type, OgitVerb) else str(edge_type) for edge_type in edge_types
+        ] if edge_types else None
+        e_vertex_types = [vertex_type_to_str(vertex_type) for vertex_type in vertex_types] if vertex_types else None
+        e_fields = [attribute_to_str(field) for field in fields] if fields else None
+        e_id = attribute_to_str(SystemAttribute.OGIT__ID)
+        if e_fields is not None and e_id not in e_fields:
+            e_fields.append(e_id)
+        e_type = attribute_to_str(SystemAttribute.OGIT__TYPE)
+        e_out_id = attribute_to_str(VirtualAttribute.OGIT__OUT_ID)
+        e_in_id = attribute_to_str(VirtualAttribute.OGIT__IN_ID)
+        e_out_type = attribute_to_str(VirtualAttribute.OGIT__OUT_TYPE)
+        e_in_type = attribute_to_str(VirtualAttribute.OGIT__IN_TYPE)
+        e_edge_fields = [e_type, e_out_id, e_in_id, e_out_type, e_in_type]
+        type_filter = set(e_vertex_types) if e_vertex_types else None
+        overhead = len(connected_edges_query((), e_edge_types, direction, e_vertex_types))
+
+        def fetch_edges(chunk: List[str]) -> List[Dict[str, Any]]:
+            query = connected_edges_query(chunk, e_edge_types, direction, e_vertex_types)
+            return list(self.__data_client.graph(chunk[0], query, fields=e_edge_fields))
+
+        seen: Dict[str, None] = dict.fromkeys(vertex_id_to_str(root) for root in roots)
+        edges: Dict[Tuple[str, str, str], None] = {}
+        frontier = list(seen)
+        truncated = max_vertices is not None and len(seen) > max_vertices
+        level = 0
+        while frontier and level < depth and not truncated:
+            chunks = chunk_by_length(frontier, overhead, max_query_length, 3)
+            expanding = set(frontier)
+            frontier = []
+            with BulkRun(fetch_edges, chunks, concurrency) as run:
+                for result in run:
+                    if result.error is not None:
+                        raise result.error
+                    for edge in result.value:
+                        out_id, in_id = edge[e_out_id], edge[e_in_id]
+                        # the end a traversal started from, and the vertex it reached
+                        ends = []
+                        if direction != 'in' and out_id in expanding:
+                            ends.append((in_id, edge.get(e_in_type)))
+                        if direction != 'out' and in_id in expanding:
+                            ends.append((out_id, edge.get(e_out_type)))
+                        for vertex_id, vertex_type in ends:
+                            if type_filter is not None and vertex_type not in type_filter:
+                                continue
+                            if vertex_id not in seen:
+                                if max_vertices is not None and len(seen) >= max_vertices:
+                                    truncated = True
+                                    continue
+                                seen[vertex_id] = None
+                                frontier.append(vertex_id)
+                            edges[(out_id, edge.get(e_type), in_id)] = None
+            level += 1
+
+        # fetch the bodies once; edges to vertices left out by the budget are dropped
+        id_chunks = chunk_by_length(seen, 0, max_query_length)
+        vertices: Dict[str, VERTEX_T_co] = {}
+        with BulkRun(
+                lambda chunk: list(to_vertices(
+                    self.__data_client.get_by_ids(*chunk, fields=e_fields), self.__base_client, e_fields)),
+                id_chunks, concurrency
+        ) as run:
+            for result in run:
+                if result.error is not None:
+                    raise result.error
+                for vertex in result.value:
+                    vertices[str(vertex.id)] = vertex
+        return Subgraph(
+            {VertexId(i): vertices[i] for i in seen if i in vertices},
+            [
+                SubgraphEdge(VertexId(out_id), edge_type, VertexId(in_id))
+                for out_id, edge_type, in_id in edges if out_id in vertices and in_id in vertices
+            ],
+            level,
+            truncated
+        )
+
+    def __learned_fields(self, key: Hashable) -> Tuple[Optional[List[str]], Optional['FieldProfile']]:
+        adaptive = self.__base_client.root.adaptive_fields
+        if adaptive is None:
+            return None, None
+        profile = adaptive.profile(key)
+        fields = profile.execute()
+        return (sorted(fields) if fields is not None else None), profile
+
     # TODO add external_id VERTEX_T
     def external_id(
             self,
@@ -482,7 +702,7 @@ class Hiro6SearchModel(AbcSearchModel):
         e_order = (attribute_to_str(order.field), order.dir) if order else None
 
         items = self.__data_client.external_id(e_external_id, e_fields, e_order)
-        vertices = to_vertices(items, self.__base_client)
+        vertices = to_vertices(items, self.__base_client, e_fields)
         yield from vertices
 
     # TODO add vertex_ids VERTEX_T
@@ -498,9 +718,111 @@ class Hiro6SearchModel(AbcSearchModel):
         e_order = (attribute_to_str(order.field), order.dir) if order else None
 
         items = self.__data_client.get_by_ids(*e_vertex_ids, fields=e_fields, order=e_order)
-        vertices = to_vertices(items, self.__base_client)
+        vertices = to_vertices(items, self.__base_client, e_fields)
         yield from vertices
 
+    def get_by_ids_parallel(
+            self,
+            vertex_ids: Iterable[VERTEX_ID_T],
+            fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None,
+            chunk_size: int = 500,
+            concurrency: int = 4,
+            window: Optional[int] = None,
+            keep_order: bool = True,
+            max_query_length: int = 65536,
+            retries: int = 2
+    ) -> LookupRun[VERTEX_T_co]:
+        """
+        Like get_by_ids(), for any number of ids: ids are sent in /query/ids calls of up to chunk_size ids
+        and max_query_length characters, fetched concurrently and yielded chunk by chunk.
+
+        vertex_ids is consumed lazily, so memory stays bounded by window chunks. With keep_order the vertices
+        of every chunk are yielded in input order. Ids without a vertex end up in run.missing. A failed call
+        is retried up to retries times; the ids of a chunk that still fails end up in run.failed with the
+        error, while the other chunks are still fetched.
+        """
+        if chunk_size < 1:
+            raise ValueError(f'Expected chunk_size >= 1; got {chunk_size}')
+        e_fields = [attribute_to_str(field) for field in fields] if fields else None
+        e_id = attribute_to_str(SystemAttribute.OGIT__ID)
+        if e_fields is not None and e_id not in e_fields:
+            # ogit/_id is needed to tell the missing ids
+            e_fields.append(e_id)
+        e_vertex_ids = (vertex_id_to_str(vertex_id) for vertex_id in vertex_ids)
+        chunks = chunk_by_length(e_vertex_ids, 0, max_query_length, max_items=chunk_size)
+
+        def fetch(chunk: List[str]) -> Tuple[List[VERTEX_T_co], List[str]]:
+            items = self.__data_client.get_by_ids(*chunk, fields=e_fields, max_query_length=None)
+            vertices = {str(vertex.id): vertex for vertex in to_vertices(items, self.__base_client, e_fields)}
+            unique = list(dict.fromkeys(chunk))
+            missing = [i for i in unique if i not in vertices]
+            if keep_order:
+                return [vertices[i] for i in unique if i in vertices], missing
+            return list(vertices.values()), missing
+
+        return LookupRun(fetch, chunks, concurrency, window, retries)
+
+    def refresh(
+            self,
+            vertices: Iterable[VERTEX_T_co],
+            fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None,
+            chunk_size: int = 100
+    ) -> RefreshResult:
+        """
+        Bring previously fetched vertices up to date.
+
+        Only ogit/_id and ogit/_v are requested for every vertex; full bodies are fetched for those whose
+        version moved.
+        """
+        if chunk_size < 1:
+            raise ValueError(f'Expected chunk_size >= 1; got {chunk_size}')
+        e_fields = [attribute_to_str(field) for field in fields] if fields else None
+        e_probe = [attribute_to_str(SystemAttribute.OGIT__ID), attribute_to_str(SystemAttribute.OGIT__V)]
+        cache = self.__base_client.root.vertex_cache
+
+        result = list(vertices)
+        changed = []
+        missing = []
+        for offset in range(0, len(result), chunk_size):
+            chunk = result[offset:offset + chunk_size]
+            versions: Dict[str, Any] = {
+                item[e_probe[0]]: item.get(e_probe[1])
+                for item in self.__data_client.get_by_ids(*{str(v.id) for v in chunk}, fields=e_probe)
+            }
+            stale = set()
+            for vertex in chunk:
+                e_vertex_id = str(vertex.id)
+                if e_vertex_id not in versions:
+                    missing.append(vertex.id)
+                elif vertex.v is None or int(versions[e_vertex_id]) != vertex.v:
+                    stale.add(e_vertex_id)
+            if not stale:
+                continue
+            if cache is not None:
+                for e_vertex_id in stale:
+                    cache.invalidate_id(e_vertex_id)
+            # ogit/_id is needed to match the bodies to the input
+            e_full_fields = e_fields + e_probe[:1] if e_fields else None
+            current = {
+                item[e_probe[0]]: item
+                for item in self.__data_client.get_by_ids(*stale, fields=e_full_fields)
+            }
+            projection = Projection(self.__base_client.root, e_full_fields) if e_full_fields else None
+            for i, vertex in enumerate(chunk, offset):
+                e_vertex_id = str(vertex.id)
+                if e_vertex_id not in stale:
+                    continue
+                item = current.get(e_vertex_id)
+                if item is None:
+                    # deleted in between
+                    missing.append(vertex.id)
+                else:
+                    result[i] = to_vertex(item, self.__base_client)
+                    if projection is not None:
+                        projection.add(result[i])
+                    changed.append(VertexId(e_vertex_id))
+        return RefreshResult(result, changed, missing)
+
     def index(
             self,
             query: str,
@@ -517,13 +839,222 @@ class Hiro6SearchModel(AbcSearchModel):
         # TODO maybe impl --list
         e_fields = [attribute_to_str(field) for field in fields] if fields else None
         e_order = (attribute_to_str(order.field), order.dir) if order else None
+        profile = None
+        if e_fields is None:
+            e_fields, profile = self.__learned_fields(('index', query_shape(query), e_order))
 
         items = self.__data_client.index(query, e_order, offset, limit, e_fields)
-        # if count is True:
-        #     return next(gen)
-        vertices = to_vertices(items, self.__base_client)
+        vertices = to_vertices(items, self.__base_client, e_fields, profile)
         yield from vertices
 
+    def index_result_set(
+            self,
+            query: str,
+            fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None,
+            order: Optional[Order] = None,
+            offset: Optional[int] = None,
+            limit: Optional[int] = None,
+            memory_items: int = 10000,
+            spill_dir: Optional[str] = None
+    ) -> ResultSet[VERTEX_T_co]:
+        """
+        Like index(), as a ResultSet: the vertices are fetched once and can be read any number of times;
+        beyond memory_items they are spilled to a temporary file in spill_dir. close() the result set, or use
+        it as a context manager, to release the response and the spill file early.
+        """
+        return ResultSet(
+            self.index(query, fields, order, offset, limit), memory_items, spill_dir, client=self.__base_client)
+
+    def index_count(self, query: str) -> int:
+        """
+        Number of vertices matching query; no vertices are transferred.
+        """
+        items = self.__data_client.index(query, count=True)
+        return int(next(items))
+
+    def index_many(
+            self,
+            queries: Iterable[str],
+            fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None,
+            order: Optional[Order] = None,
+            concurrency: int = 4,
+            buffer: int = 1000
+    ) -> FanOut[VERTEX_T_co]:
+        """
+        The union of several index() queries, run concurrently; every vertex is yielded once.
+
+        Without order vertices are yielded as they arrive, with up to concurrency queries running at a time.
+        With order every query is sorted by the server and the results are merged into one sorted stream; all
+        queries then run at once, one connection each, and more distinct queries than concurrency raise
+        ValueError.
+        """
+        e_fields = [attribute_to_str(field) for field in fields] if fields else None
+        e_order = (attribute_to_str(order.field), order.dir) if order else None
+        e_id = attribute_to_str(SystemAttribute.OGIT__ID)
+        if e_fields is not None:
+            # the merge needs the keys
+            e_fields = list(dict.fromkeys(e_fields + [e_id] + ([e_order[0]] if e_order else [])))
+        projection = Projection(self.__base_client.root, e_fields) if e_fields else None
+
+        def source(query: str) -> Callable[[], Generator[Dict[str, Any], None, None]]:
+            return lambda: self.__data_client.index(query, e_order, fields=e_fields)
+
+        def convert(item: Dict[str, Any]) -> VERTEX_T_co:
+            vertex = to_vertex(item, self.__base_client)
+            return projection.add(vertex) if projection is not None else vertex
+
+        def sort_key(item: Dict[str, Any]) -> Tuple[bool, Any]:
+            # vertices without the attribute come last
+            value = item.get(e_order[0])
+            return (value is None) != reverse, value if value is not None else ''
+
+        reverse = e_order is not None and e_order[1] != 'asc'
+        return FanOut(
+            [source(query) for query in dict.fromkeys(queries)],
+            key=lambda item: item[e_id],
+            sort_key=sort_key if e_order else None,
+            reverse=reverse,
+            convert=convert,
+            concurrency=concurrency,
+            buffer=buffer
+        )
+
+    def index_parallel(
+            self,
+            query: str,
+            fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None,
+            order: Optional[Order] = None,
+            page_size: int = 1000,
+            concurrency: int = 4,
+            window: Optional[int] = None
+    ) -> PagedRun[VERTEX_T_co]:
+        """
+        Like index(), but sizes the result with a count query and fetches offset/limit pages concurrently.
+
+        Pages need a stable order; without order they are sorted by ogit/_id. The last page is unbounded so
+        vertices added after the count are still returned. Deep offsets are subject to the server's
+        result window.
+        """
+        if page_size < 1:
+            raise ValueError(f'Expected page_size >= 1; got {page_size}')
+        e_fields = [attribute_to_str(field) for field in fields] if fields else None
+        e_order = (attribute_to_str(order.field), order.dir) if order \
+            else (attribute_to_str(SystemAttribute.OGIT__ID), 'asc')
+
+        total = self.index_count(query)
+        offsets = range(0, total, page_size) or range(1)
+        last = offsets[-1]
+
+        def fetch(offset: int) -> Generator[VERTEX_T_co, None, None]:
+            items = self.__data_client.index(
+                query, e_order, offset or None, None if offset == last else page_size, e_fields)
+            return to_vertices(items, self.__base_client, e_fields)
+
+        return PagedRun(fetch, offsets, concurrency, window)
+
+    def scan(
+            self,
+            query: str,
+            fields: Optional[Union[ATTRIBUTE_T_co, Iterable[ATTRIBUTE_T_co]]] = None,
+            key: Literal['ogit/_id', 'ogit/_created-on'] = 'ogit/_id',
+            page_size: int = 1000,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+            partitions: int = 1,
+            concurrency: int = 4,
+            cursor: Optional[Union[str, ScanCursor]] = None
+    ) -> Scan[VERTEX_T_co]:
+        """
+        Enumerate all vertices matching query by keyset instead of offset.
+
+        Pages are sorted by key and every next page starts after the last key seen, so deep scans stay as
+        fast as the first page. With key ogit/_created-on the range from start to end (default now) can be
+        split into partitions scanned in parallel. Pass scan.cursor.token() as cursor to resume a scan
+        after the last vertex it emitted.
+
+        The scan is managed: it starts fetching when entered and must be iterated within the with block,
+        which stops its threads however the iteration ends.
+
+            with client.model.search.scan(query) as scan:
+                for vertex in scan:
+                    ...
+        """
+        if page_size < 1:
+            raise ValueError(f'Expected page_size >= 1; got {page_size}')
+        if isinstance(cursor, str):
+            cursor = ScanCursor.from_token(cursor)
+        if cursor is not None:
+            if cursor.query != query:
+                raise ValueError('Cursor belongs to a different query')
+            key = cursor.key
+        elif key == 'ogit/_id':
+            if start is not None or end is not None or partitions != 1:
+                raise ValueError('Time ranges and partitions require key ogit/_created-on')
+            cursor = ScanCursor(query, key, (ScanPartition(),))
+        elif key == 'ogit/_created-on':
+            if partitions == 1 and start is None and end is None:
+                cursor = ScanCursor(query, key, (ScanPartition(),))
+            elif start is None:
+                raise ValueError('Partitions require a start')
+            else:
+                e_start = datetime_to_timestamp_ms(start)
+                e_end = datetime_to_timestamp_ms(end if end is not None else datetime.now(timezone.utc))
+                cursor = ScanCursor(query, key, split_range(e_start, e_end, partitions))
+        else:
+            raise ValueError(f'Unsupported scan key: {key!r}')
+
+        e_id = attribute_to_str(SystemAttribute.OGIT__ID)
+        e_created_on = attribute_to_str(SystemAttribute.OGIT__CREATED_ON)
+        e_fields = [attribute_to_str(field) for field in fields] if fields else None
+        if e_fields is not None:
+            # the keys are needed to continue after a page
+            e_fields = list(dict.fromkeys(e_fields + [e_id, e_created_on]))
+        if key == e_id:
+            e_order = [(e_id, 'asc')]
+        else:
+            e_order = [(e_created_on, 'asc'), (e_id, 'asc')]
+
+        def fetch(partition: ScanPartition) -> List[VERTEX_T_co]:
+            terms = [f'+({query})']
+            if partition.lower is not None or partition.upper is not None:
+                lower = '%i' % partition.lower if partition.lower is not None else '*'
+                upper = '%i' % partition.upper if partition.upper is not None else '*'
+                terms.append(f'+ogit\\/_created\\-on:[{lower} TO {upper}}}')
+            if partition.last_id is not None:
+                last_id = quote_term(partition.last_id)
+                if key == e_id:
+                    terms.append(f'+ogit\\/_id:{{{last_id} TO *}}')
+                else:
+                    last_on = '%i' % partition.last_on
+                    terms.append(
+                        f'+(ogit\\/_created\\-on:{{{last_on} TO *}} OR '
+                        f'(+ogit\\/_created\\-on:{last_on} +ogit\\/_id:{{{last_id} TO *}}))'
+                    )
+            items = self.__data_client.index(' '.join(terms), e_order, None, page_size, e_fields)
+            return list(to_vertices(items, self.__base_client, e_fields))
+
+        def key_of(vertex: VERTEX_T_co) -> Tuple[Optional[int], str]:
+            return vertex.created_on_ms, str(vertex.id)
+
+        return Scan(fetch, key_of, cursor, page_size, concurrency, managed=True)
+
+    def graph_count(
+            self,
+            root: Union[VERTEX_ID_T, VERTEX_XID_T_co],
+            query: str
+    ) -> int:
+        """
+        Number of results of a gremlin query; .count() is appended to query.
+        """
+        if isinstance(root, ExternalVertexId):
+            vertex_id = self.__base_client.root.resolve_xid(root)
+            e_root = vertex_id_to_str(vertex_id)
+        else:
+            e_root = vertex_id_to_str(root)
+
+        items = self.__data_client.graph(e_root, query, count=True)
+        return int(next(items))
+
     def graph(
             self,
             root: Union[VERTEX_ID_T, VERTEX_XID_T_co],
@@ -545,13 +1076,21 @@ class Hiro6SearchModel(AbcSearchModel):
 
         e_fields = [attribute_to_str(field) for field in fields] if fields else None
         e_order = (attribute_to_str(order.field), order.dir) if order else None
+        profile = None
+        if e_fields is None and issubclass(result_type, Vertex):
+            e_fields, profile = self.__learned_fields(('graph', query_shape(query), e_order))
 
         items = self.__data_client.graph(e_root, query, e_fields, e_order, offset, limit)
 
         if isinstance(result_type, Vertex):
-            vertices = to_vertices(items, self.__base_client)
+            vertices = to_vertices(items, self.__base_client, e_fields, profile)
             yield from vertices
         else:
+            projection = None
+            if (e_fields or profile is not None) and issubclass(result_type, Vertex):
+                projection = Projection(self.__base_client.root, e_fields, profile=profile)
             for item in items:
                 instance = result_type(item, client=self.__base_client.root, draft=False)
+                if projection is not None:
+                    projection.add(instance)
                 yield instance
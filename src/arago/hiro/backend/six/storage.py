@@ -18,6 +18,7 @@ from arago.hiro.abc.storage import AbcStorageTimeSeriesRest, AbcStorageTimeSerie
 from arago.hiro.model.storage import TimeSeriesValue, BlobVertex, TimeSeriesVertex, \
     TIME_SERIES_ID_T, BLOB_ID_T, TimeSeriesId, BlobId
 from arago.hiro.utils.datetime import datetime_to_timestamp_ms
+from arago.hiro.utils.download import Download, DOWNLOAD_TARGET_T, download
 
 if TYPE_CHECKING:
     from arago.hiro.client.rest_base_client import HiroRestBaseClient
@@ -113,6 +114,30 @@ class Hiro6StorageBlobData(AbcStorageBlobData):
             headers = None
         self.__rest_client.set(blob_id, content, headers)
 
+    def download(
+            self,
+            blob_id: str,
+            target: DOWNLOAD_TARGET_T,
+            content_id: Optional[str] = None,
+            include_deleted: Optional[bool] = False,
+            part_size: int = 8 * 1024 * 1024,
+            concurrency: int = 4,
+            resume: bool = True
+    ) -> Download:
+        """
+        Download the content into target, a file path or a writable buffer, with concurrent range requests.
+        """
+        params = {}
+        if content_id is not None:
+            params['contentId'] = content_id
+        if include_deleted:
+            params['includeDeleted'] = include_deleted
+
+        def fetch(headers: Mapping[str, str]) -> Response:
+            return self.__rest_client.get(blob_id, params, headers)
+
+        return download(fetch, target, part_size, concurrency, resume)
+
 
 class Hiro6StorageBlobModel(AbcStorageBlobModel):
     __data_client: Final[Hiro6StorageBlobData]
@@ -155,6 +180,28 @@ class Hiro6StorageBlobModel(AbcStorageBlobModel):
             raise TypeError(type(blob_id))
         self.__data_client.set(e_blob_id, content, content_type)
 
+    def download(
+            self,
+            blob_id: Union[BlobVertex, BLOB_ID_T],
+            target: DOWNLOAD_TARGET_T,
+            content_id: Optional[str] = None,
+            include_deleted: Optional[bool] = False,
+            part_size: int = 8 * 1024 * 1024,
+            concurrency: int = 4,
+            resume: bool = True
+    ) -> Download:
+        e_blob_id: str
+        if isinstance(blob_id, BlobVertex):
+            e_blob_id = str(blob_id.id)
+        elif isinstance(blob_id, BlobId):
+            e_blob_id = str(blob_id)
+        elif isinstance(blob_id, str):
+            e_blob_id = blob_id
+        else:
+            raise TypeError(type(blob_id))
+        return self.__data_client.download(
+            e_blob_id, target, content_id, include_deleted, part_size, concurrency, resume)
+
 
 class Hiro6StorageLogRest(AbcStorageLogRest):
     def __init__(self, client: 'HiroRestBaseClient') -> None:
@@ -0,0 +1,139 @@
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Set, FrozenSet, Final, Hashable, Iterator, NamedTuple, List
+
+from arago.hiro.model.graph.attribute import SystemAttribute, VirtualAttribute, attribute_to_str
+from arago.hiro.utils.cache import LruCache
+from arago.ontology import Attribute
+
+# system attributes back the fields of Vertex and are always requested
+BASE_FIELDS: Final[FrozenSet[str]] = frozenset(
+    attribute_to_str(a) for a in SystemAttribute
+    if a.value not in {v.value for v in VirtualAttribute}
+)
+
+query_name: ContextVar[Optional[str]] = ContextVar('query_name', default=None)
+
+_QUOTED: Final = r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''
+_literal_re: Final = re.compile(
+    # quoted strings, term values, groups and ranges after an unescaped colon, numbers
+    rf'{_QUOTED}|(?<!\\):\s*(?:\([^()]*\)|[\[{{][^\]}}]*[\]}}]|(?:\\.|[^\s()\[\]{{}}"\'\\])+)|\b\d+(?:\.\d+)?\b'
+)
+_repeated_re: Final = re.compile(r'\?(?:\s*,?\s*\?)+')
+
+
+def query_shape(query: str) -> str:
+    """
+    query with its literal values replaced by '?', so executions differing only in ids, scopes or other
+    values share a profile: +ogit\\/_id:(a b) and +ogit\\/_id:c both become +ogit\\/_id:?.
+    """
+    shape = _literal_re.sub(lambda m: ':?' if m.group().startswith(':') else '?', query)
+    return _repeated_re.sub('?', shape)
+
+
+class FieldProfile:
+    """
+    Attributes read from the vertices of one query, over all of its executions.
+    """
+    key: Final[Hashable]
+    warmup: Final[int]
+    attributes: Final[Set[str]]
+    executions: int
+    misses: int
+    __lock: Final[threading.Lock]
+
+    def __init__(self, key: Hashable, warmup: int) -> None:
+        self.key = key
+        self.warmup = warmup
+        self.attributes = set()
+        self.executions = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+
+    def record(self, attribute: object) -> None:
+        if isinstance(attribute, Attribute):
+            name = attribute_to_str(attribute)
+            with self.__lock:
+                self.attributes.add(name)
+
+    def fields(self) -> Optional[FrozenSet[str]]:
+        """
+        The projection to request; None while still learning from unprojected executions.
+        """
+        with self.__lock:
+            if self.executions < self.warmup:
+                return None
+            return BASE_FIELDS | self.attributes
+
+    def execute(self) -> Optional[FrozenSet[str]]:
+        """
+        Count an execution and return the projection it requests.
+        """
+        with self.__lock:
+            fields = None if self.executions < self.warmup else BASE_FIELDS | self.attributes
+            self.executions += 1
+            return fields
+
+    def miss(self) -> None:
+        with self.__lock:
+            self.misses += 1
+
+
+class ProfileReport(NamedTuple):
+    key: Hashable
+    fields: Optional[FrozenSet[str]]
+    executions: int
+    misses: int
+
+
+class AdaptiveFields:
+    """
+    Opt-in learning of field projections for search index, graph and connected calls made without fields.
+
+    The first warmup executions of a query fetch full vertices and record which attributes are read.
+    Later executions request only those (plus the system attributes); anything else is back-filled on
+    access and added to the projection for the next execution. Queries are told apart by their shape
+    (see query_shape()), or by the name given with `named()`. At most maxsize profiles are kept, the least
+    recently used are dropped. Enable it with `client.adaptive_fields = AdaptiveFields()`.
+    """
+    warmup: Final[int]
+    __profiles: Final[LruCache[Hashable, FieldProfile]]
+
+    def __init__(self, warmup: int = 1, maxsize: int = 1024) -> None:
+        if warmup < 1:
+            raise ValueError(f'Expected warmup >= 1; got {warmup}')
+        self.warmup = warmup
+        self.__profiles = LruCache(maxsize)
+
+    @staticmethod
+    @contextmanager
+    def named(name: str) -> Iterator[None]:
+        """
+        Profile the queries executed (iterated) within the block under name instead of their shape.
+        """
+        token = query_name.set(name)
+        try:
+            yield
+        finally:
+            query_name.reset(token)
+
+    def profile(self, key: Hashable) -> FieldProfile:
+        name = query_name.get()
+        if name is not None:
+            key = name
+        return self.__profiles.get_or_load(key, lambda k: FieldProfile(k, self.warmup))
+
+    def reset(self, key: Optional[Hashable] = None) -> None:
+        if key is None:
+            self.__profiles.clear()
+        else:
+            self.__profiles.invalidate(key)
+
+    def report(self) -> List[ProfileReport]:
+        """
+        The projection chosen for every query seen so far.
+        """
+        profiles = [p for p in (self.__profiles.get(k) for k in self.__profiles) if p is not None]
+        return [ProfileReport(p.key, p.fields(), p.executions, p.misses) for p in profiles]
@@ -1,22 +1,37 @@
-from functools import cached_property, lru_cache
-from typing import TypeVar, Optional
+from functools import cached_property
+from typing import TypeVar, Optional, Dict, Iterable
 
 import requests
 from requests.auth import AuthBase
 
 from arago.extension.requests import HiroPasswordAuth
+from arago.hiro.client.adaptive_fields import AdaptiveFields
 from arago.hiro.client.model_client import HiroRestClient, HiroDataClient, HiroModelClient
+from arago.hiro.client.query_cache import QueryCache
 from arago.hiro.client.rest_base_client import HiroRestBaseClient
+from arago.hiro.client.vertex_cache import VertexCache
+from arago.hiro.client.version_store import VersionStore
+from arago.hiro.client.vertex_loader import VertexLoader
+from arago.hiro.client.xid_cache import XidCache
 from arago.hiro.model.auth import ClientCredentials, AccountCredentials, SessionCredentials
 from arago.hiro.model.graph.attribute import SystemAttribute
 from arago.hiro.model.graph.vertex import VERTEX_XID_T_co, VERTEX_ID_T_co, VERTEX_T_co, \
-    resolve_vertex_id, resolve_vertex_xid
+    resolve_vertex_id, resolve_vertex_xid, to_vertex_xid
+from arago.hiro.model.search import quote_term
+from arago.hiro.utils.read_ahead import ReadAhead
 from arago.hiro.utils.user_agent import build_user_agent
 
 _AUTH_BASE_T_co = TypeVar('_AUTH_BASE_T_co', bound=AuthBase, covariant=True)
 
 
 class HiroClient(HiroRestBaseClient):
+    __vertex_cache: Optional[VertexCache] = None
+    __version_store: Optional[VersionStore] = None
+    __adaptive_fields: Optional[AdaptiveFields] = None
+    __query_cache: Optional[QueryCache] = None
+    __read_ahead: Optional[ReadAhead] = None
+    __batch_gets: bool = False
+
     def __init__(self, parent: Optional['HiroRestBaseClient'] = None) -> None:
         super().__init__(parent)
         if parent is None:
@@ -83,14 +98,121 @@ class HiroClient(HiroRestBaseClient):
 
         raise RuntimeError()
 
-    @lru_cache(maxsize=None, typed=True)
-    def resolve_xid(self, vertex_xid: VERTEX_XID_T_co) -> VERTEX_ID_T_co:
+    @cached_property
+    def xid_cache(self) -> XidCache:
+        if self.root is not self:
+            return self.root.xid_cache
+        return XidCache()
+
+    @cached_property
+    def vertex_loader(self) -> VertexLoader:
+        if self.root is not self:
+            return self.root.vertex_loader
+        return VertexLoader(self)
+
+    @property
+    def vertex_cache(self) -> Optional[VertexCache]:
+        return self.root.__vertex_cache
+
+    @vertex_cache.setter
+    def vertex_cache(self, value: Optional[VertexCache]) -> None:
+        self.root.__vertex_cache = value
+
+    @property
+    def version_store(self) -> Optional[VersionStore]:
+        return self.root.__version_store
+
+    @version_store.setter
+    def version_store(self, value: Optional[VersionStore]) -> None:
+        self.root.__version_store = value
+
+    @property
+    def adaptive_fields(self) -> Optional[AdaptiveFields]:
+        return self.root.__adaptive_fields
+
+    @adaptive_fields.setter
+    def adaptive_fields(self, value: Optional[AdaptiveFields]) -> None:
+        self.root.__adaptive_fields = value
+
+    @property
+    def query_cache(self) -> Optional[QueryCache]:
+        return self.root.__query_cache
+
+    @query_cache.setter
+    def query_cache(self, value: Optional[QueryCache]) -> None:
+        self.root.__query_cache = value
+
+    @property
+    def read_ahead(self) -> Optional[ReadAhead]:
+        return self.root.__read_ahead
+
+    @read_ahead.setter
+    def read_ahead(self, value: Optional[ReadAhead]) -> None:
+        self.root.__read_ahead = value
+
+    @property
+    def batch_gets(self) -> bool:
+        """
+        Route model.graph.vertex.get() through vertex_loader unless a get passes batch itself.
+        """
+        return self.root.__batch_gets
+
+    @batch_gets.setter
+    def batch_gets(self, value: bool) -> None:
+        self.root.__batch_gets = value
+
+    def __load_xid(self, vertex_xid: VERTEX_XID_T_co) -> Optional[VERTEX_ID_T_co]:
         gen = self.model.search.external_id(vertex_xid, fields={
             SystemAttribute.OGIT__ID
         })
-        vertex = next(gen)
-        try:
-            next(gen)
+        vertex = next(gen, None)
+        if vertex is None:
+            return None
+        if next(gen, None) is not None:
             raise RuntimeError(f'''External ID '{vertex_xid}' is ambiguous and is associated with multiple vertices''')
-        except StopIteration:
-            return vertex.id
+        return vertex.id
+
+    def resolve_xid(self, vertex_xid: VERTEX_XID_T_co) -> Optional[VERTEX_ID_T_co]:
+        """
+        Resolve an external id to its vertex id, or None if no vertex has it; results are kept in xid_cache.
+        """
+        return self.xid_cache.get_or_load(to_vertex_xid(vertex_xid), self.__load_xid)
+
+    def resolve_xids(
+            self,
+            vertex_xids: Iterable[VERTEX_XID_T_co],
+            chunk_size: int = 100
+    ) -> Dict[VERTEX_XID_T_co, VERTEX_ID_T_co]:
+        """
+        Resolve many external ids with one index search per chunk; unknown external ids are left out.
+        """
+        cache = self.xid_cache
+        result = {}
+        missing: Dict[VERTEX_XID_T_co, None] = {}
+        for vertex_xid in vertex_xids:
+            e_vertex_xid = to_vertex_xid(vertex_xid)
+            found, vertex_id = cache.lookup(e_vertex_xid)
+            if not found:
+                missing[e_vertex_xid] = None
+            elif vertex_id is not None:
+                result[e_vertex_xid] = vertex_id
+
+        missing = list(missing)
+        for i in range(0, len(missing), chunk_size):
+            chunk = missing[i:i + chunk_size]
+            # Elasticsearch Query DSL Query String Query: +ogit\/_xid:("{external_id}" ...)
+            terms = ' '.join(quote_term(xid) for xid in chunk)
+            # twice the chunk size leaves room to detect ambiguous external ids
+            gen = self.model.search.index(f'+ogit\\/_xid:({terms})', fields=(
+                SystemAttribute.OGIT__ID, SystemAttribute.OGIT__XID
+            ), limit=2 * len(chunk))
+            found: Dict[VERTEX_XID_T_co, VERTEX_ID_T_co] = {}
+            for vertex in gen:
+                if vertex.xid in found and found[vertex.xid] != vertex.id:
+                    raise RuntimeError(
+                        f'''External ID '{vertex.xid}' is ambiguous and is associated with multiple vertices''')
+                found[vertex.xid] = vertex.id
+            for vertex_xid in chunk:
+                cache.put(vertex_xid, found.get(vertex_xid))
+            result.update(found)
+        return result
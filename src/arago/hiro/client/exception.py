@@ -1,9 +1,14 @@
-from typing import Mapping, Any, List
+from typing import Mapping, Any, List, Optional
 
 
 class HiroClientError(Exception):
-    def __init__(self, *args: object) -> None:
+    status_code: Optional[int]  # HTTP status of the response
+    code: Optional[int]  # error code of the response body
+
+    def __init__(self, *args: object, status_code: Optional[int] = None, code: Optional[int] = None) -> None:
         super().__init__(*args)
+        self.status_code = status_code
+        self.code = code
 
 
 class OntologyValidatorError(HiroClientError):
@@ -0,0 +1,291 @@
+import io
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import time
+from typing import Optional, Dict, Callable, Final, Any, Tuple, Set, FrozenSet, Iterable, Mapping, Generator, \
+    Hashable
+
+from arago.hiro.model.graph.vertex import VERTEX_TYPE_T, vertex_type_to_str
+from arago.hiro.utils.cache import LruCache, CacheStats, _DEFAULT
+
+# (kind, normalised request data, headers)
+QUERY_CACHE_KEY_T = Tuple[str, Tuple[Tuple[str, Hashable], ...], Tuple[Tuple[str, str], ...]]
+
+# entries whose vertices' types are unknown are dropped by every type invalidation
+ANY_TYPE: Final[str] = '*'
+
+# quoted strings in a query; ontology entities are the ones with an upper case name
+_quoted_re = re.compile(r'''"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*\'''')
+_entity_re = re.compile(r'[A-Za-z][\w-]*/[A-Z][\w/.-]*')
+_space_re = re.compile(r'\s+')
+
+
+def normalise_query(query: str) -> str:
+    """
+    Collapse runs of whitespace outside of quoted strings, so equivalent queries share one cache entry.
+    """
+    parts = []
+    pos = 0
+    for match in _quoted_re.finditer(query):
+        parts.append(_space_re.sub(' ', query[pos:match.start()]))
+        parts.append(match.group())
+        pos = match.end()
+    parts.append(_space_re.sub(' ', query[pos:]))
+    return ''.join(parts).strip()
+
+
+def query_types(query: str) -> Set[str]:
+    """
+    The ontology entities named in query, e.g. by +ogit\\/_type:"ogit/Node" or hasLabel('ogit/Node').
+    """
+    terms = (m.group()[1:-1].replace('\\/', '/') for m in _quoted_re.finditer(query))
+    return {term for term in terms if _entity_re.fullmatch(term)}
+
+
+class QueryCacheStats(CacheStats):
+    spills: int
+    memory_bytes: int
+    disk_bytes: int
+    kinds: Dict[str, CacheStats]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.spills = 0
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.kinds = {}
+
+    def kind(self, kind: str) -> CacheStats:
+        stats = self.kinds.get(kind)
+        if stats is None:
+            stats = self.kinds[kind] = CacheStats()
+        return stats
+
+    def __repr__(self) -> str:
+        return super().__repr__()[:-1] + \
+               f', spills={self.spills}, memory_bytes={self.memory_bytes}, disk_bytes={self.disk_bytes})'
+
+
+class _Entry:
+    __slots__ = ('data', 'path', 'size', 'types')
+
+    def __init__(self, data: Optional[bytes], path: Optional[str], size: int, types: FrozenSet[str]) -> None:
+        self.data = data  # pickled items, unless spilled to path
+        self.path = path
+        self.size = size
+        self.types = types
+
+
+class QueryCache(LruCache[QUERY_CACHE_KEY_T, _Entry]):
+    """
+    Opt-in cache of search index and graph results, keyed by the normalised request data.
+
+    Results are kept pickled so hits hand out fresh items; those larger than spill_bytes are written to
+    spill_dir instead of memory. In-memory results are bounded by max_bytes in total, all results by
+    maxsize. Entries expire after ttl seconds, or the ttl set for their query with set_ttl().
+    invalidate_type() drops the results holding vertices of a type or naming it in their query.
+    Enable it with `client.query_cache = QueryCache()`.
+    """
+    max_bytes: Final[int]
+    spill_bytes: Final[int]
+    stats: Final[QueryCacheStats]
+    __spill_dir: Optional[str]
+    __own_spill_dir: bool
+    __ttls: Final[Dict[str, Optional[float]]]
+    _keys_by_type: Final[Dict[str, Set[QUERY_CACHE_KEY_T]]]
+
+    def __init__(
+            self,
+            maxsize: int = 256,
+            ttl: Optional[float] = 60.0,
+            max_bytes: int = 64 * 1024 * 1024,
+            spill_bytes: int = 4 * 1024 * 1024,
+            spill_dir: Optional[str] = None,
+            clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        super().__init__(maxsize, ttl, clock)
+        self.max_bytes = max_bytes
+        self.spill_bytes = spill_bytes
+        self.stats = QueryCacheStats()
+        self.__spill_dir = spill_dir
+        self.__own_spill_dir = spill_dir is None
+        self.__ttls = {}
+        self._keys_by_type = {}
+
+    @staticmethod
+    def key(
+            kind: str,
+            req_data: Mapping[str, Any],
+            headers: Optional[Mapping[str, str]] = None
+    ) -> QUERY_CACHE_KEY_T:
+        items = []
+        for name, value in req_data.items():
+            if name == 'query':
+                value = normalise_query(value)
+            elif name == 'fields' and isinstance(value, str):
+                value = frozenset(value.split(','))
+            elif not isinstance(value, Hashable):
+                value = repr(value)
+            items.append((name, value))
+        e_headers = tuple(sorted(headers.items())) if headers else ()
+        return kind, tuple(sorted(items, key=lambda item: item[0])), e_headers
+
+    def set_ttl(self, query: str, ttl: Optional[float]) -> None:
+        """
+        Keep the results of query for ttl seconds; None keeps them until evicted, 0 disables caching.
+        """
+        with self._lock:
+            self.__ttls[normalise_query(query)] = ttl
+
+    def __ttl(self, key: QUERY_CACHE_KEY_T) -> Any:
+        query = dict(key[1]).get('query')
+        return self.__ttls.get(query, _DEFAULT)
+
+    def _removed(self, key: QUERY_CACHE_KEY_T, value: _Entry) -> None:
+        for vertex_type in value.types:
+            keys = self._keys_by_type.get(vertex_type)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_type[vertex_type]
+        if value.path is None:
+            self.stats.memory_bytes -= value.size
+        else:
+            self.stats.disk_bytes -= value.size
+            try:
+                os.remove(value.path)
+            except OSError:
+                # still open for reading on platforms not allowing that
+                pass
+
+    def put(self, key: QUERY_CACHE_KEY_T, value: _Entry, ttl: Any = _DEFAULT) -> None:
+        with self._lock:
+            super().put(key, value, ttl)
+            for vertex_type in value.types:
+                self._keys_by_type.setdefault(vertex_type, set()).add(key)
+            if value.path is None:
+                self.stats.memory_bytes += value.size
+            else:
+                self.stats.disk_bytes += value.size
+            while self.stats.memory_bytes > self.max_bytes:
+                oldest = next(k for k, (v, _) in self._entries.items() if v.path is None)
+                self._pop(oldest)
+                self.stats.evictions += 1
+
+    def __spill_file(self) -> Tuple[int, str]:
+        with self._lock:
+            if self.__spill_dir is None:
+                self.__spill_dir = tempfile.mkdtemp(prefix='hiro-query-cache-')
+            spill_dir = self.__spill_dir
+        return tempfile.mkstemp(suffix='.pickle', dir=spill_dir)
+
+    @staticmethod
+    def __read(stream: io.IOBase) -> Generator[Dict[str, Any], None, None]:
+        with stream:
+            while True:
+                try:
+                    yield pickle.load(stream)
+                except EOFError:
+                    break
+
+    def get_or_fetch(
+            self,
+            key: QUERY_CACHE_KEY_T,
+            fetch: Callable[[], Iterable[Dict[str, Any]]]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yield the cached items for key; on a miss stream them from fetch and keep them once fully read.
+        """
+        kind_stats = self.stats.kind(key[0])
+        ttl = self.__ttl(key)
+        if ttl == 0:
+            yield from fetch()
+            return
+        with self._lock:
+            found, entry = self._lookup(key)
+            stream = None
+            if found:
+                try:
+                    stream = io.BytesIO(entry.data) if entry.path is None else open(entry.path, 'rb')
+                except OSError:
+                    self._pop(key)
+                    self.stats.hits -= 1
+                    self.stats.misses += 1
+                    found = False
+        if found:
+            kind_stats.hits += 1
+            yield from self.__read(stream)
+            return
+        kind_stats.misses += 1
+        yield from self.__fetch(key, fetch, ttl)
+
+    def __fetch(
+            self,
+            key: QUERY_CACHE_KEY_T,
+            fetch: Callable[[], Iterable[Dict[str, Any]]],
+            ttl: Any
+    ) -> Generator[Dict[str, Any], None, None]:
+        buffer = io.BytesIO()
+        spill = None
+        path = None
+        types = set(query_types(dict(key[1]).get('query', '')))
+        complete = False
+        try:
+            for item in fetch():
+                (spill or buffer).write(pickle.dumps(item, pickle.HIGHEST_PROTOCOL))
+                if isinstance(item, Mapping):
+                    types.add(item.get('ogit/_type', ANY_TYPE))
+                else:
+                    types.add(ANY_TYPE)
+                if spill is None and buffer.tell() > self.spill_bytes:
+                    fd, path = self.__spill_file()
+                    spill = os.fdopen(fd, 'wb')
+                    spill.write(buffer.getvalue())
+                    buffer = None
+                yield item
+            complete = True
+        finally:
+            if spill is not None:
+                size = spill.tell()
+                spill.close()
+            else:
+                size = buffer.tell()
+            if complete:
+                if spill is None:
+                    entry = _Entry(buffer.getvalue(), None, size, frozenset(types))
+                else:
+                    entry = _Entry(None, path, size, frozenset(types))
+                    with self._lock:
+                        self.stats.spills += 1
+                with self._lock:
+                    self.stats.loads += 1
+                    self.put(key, entry, ttl)
+            elif path is not None:
+                # consumer stopped early or the request failed; partial results are not kept
+                os.remove(path)
+
+    def invalidate_type(self, vertex_type: VERTEX_TYPE_T) -> int:
+        """
+        Drop the results holding vertices of vertex_type or naming it in their query.
+        """
+        e_vertex_type = vertex_type_to_str(vertex_type)
+        with self._lock:
+            keys = self._keys_by_type.get(e_vertex_type, set()) | self._keys_by_type.get(ANY_TYPE, set())
+            for key in keys:
+                self.invalidate(key)
+            return len(keys)
+
+    def close(self) -> None:
+        """
+        Drop all entries and remove the spill directory created by the cache.
+        """
+        with self._lock:
+            self.clear()
+            spill_dir = self.__spill_dir if self.__own_spill_dir else None
+            if self.__own_spill_dir:
+                self.__spill_dir = None
+        if spill_dir is not None:
+            shutil.rmtree(spill_dir, ignore_errors=True)
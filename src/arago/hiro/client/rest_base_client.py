@@ -235,7 +235,9 @@ class HiroRestBaseClient(ABC):
                             if logger.isEnabledFor(logging.DEBUG):
                                 logger.debug(http_debug(response))
                             else:
-                                raise HiroClientError(error['message']) from e
+                                raise HiroClientError(
+                                    error['message'], status_code=response.status_code, code=error.get('code')
+                                ) from e
                     else:
                         raise HiroServerError(response.reason) from e
                 elif 500 <= response.status_code < 600:
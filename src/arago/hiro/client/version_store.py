@@ -0,0 +1,125 @@
+import json
+import sqlite3
+import threading
+from typing import Optional, Dict, Any, Iterable, List, Final, Tuple, Union
+from os import PathLike
+
+
+def version_of(res_format: str, item: Dict[str, Any]) -> Tuple[int, Optional[str], int]:
+    """
+    Return (version, version id, timestamp ms) of a history item in element or full format.
+    """
+    if res_format == 'full':
+        meta = item['meta']
+        return int(meta['version']), meta.get('vid'), int(meta['timestamp'])
+    # a deletion is a version of its own, stamped with the time of the deletion
+    timestamp = item.get('ogit/_deleted-on', item.get('ogit/_modified-on', item.get('ogit/_created-on', 0)))
+    return int(item['ogit/_v']), item.get('ogit/_v-id'), int(timestamp)
+
+
+class VersionStore:
+    """
+    Persistent SQLite store of immutable vertex versions, as returned by the history API.
+
+    A watermark per vertex and format records up to which timestamp the stored history is known to be
+    complete, so later reads only need to fetch newer versions. Enable it with
+    `client.version_store = VersionStore('history.sqlite')`.
+    """
+    __connection: Final[sqlite3.Connection]
+    __lock: Final[threading.Lock]
+
+    def __init__(self, path: Union[str, PathLike] = ':memory:') -> None:
+        self.__connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.__lock = threading.Lock()
+        with self.__lock:
+            c = self.__connection
+            c.execute('PRAGMA journal_mode=WAL')
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS version (
+                    vertex_id TEXT NOT NULL,
+                    format TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    v_id TEXT,
+                    timestamp INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (vertex_id, format, version)
+                )''')
+            c.execute('CREATE INDEX IF NOT EXISTS version_v_id ON version (vertex_id, format, v_id)')
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS watermark (
+                    vertex_id TEXT NOT NULL,
+                    format TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
+                    PRIMARY KEY (vertex_id, format)
+                )''')
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__connection.close()
+
+    def add(self, vertex_id: str, res_format: str, items: Iterable[Dict[str, Any]]) -> Optional[int]:
+        """
+        Store history items, ignoring versions already present; returns the highest timestamp seen.
+        """
+        rows = []
+        high = None
+        for item in items:
+            version, v_id, timestamp = version_of(res_format, item)
+            rows.append((vertex_id, res_format, version, v_id, timestamp, json.dumps(item)))
+            high = timestamp if high is None else max(high, timestamp)
+        if rows:
+            with self.__lock:
+                self.__connection.executemany('INSERT OR IGNORE INTO version VALUES (?, ?, ?, ?, ?, ?)', rows)
+        return high
+
+    def watermark(self, vertex_id: str, res_format: str) -> Optional[int]:
+        with self.__lock:
+            row = self.__connection.execute(
+                'SELECT timestamp FROM watermark WHERE vertex_id = ? AND format = ?', (vertex_id, res_format)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, vertex_id: str, res_format: str, timestamp: int) -> None:
+        with self.__lock:
+            self.__connection.execute(
+                'INSERT INTO watermark VALUES (?, ?, ?) '
+                'ON CONFLICT (vertex_id, format) DO UPDATE SET timestamp = max(timestamp, excluded.timestamp)',
+                (vertex_id, res_format, timestamp)
+            )
+
+    def items(
+            self,
+            vertex_id: str,
+            res_format: str,
+            start: Optional[int] = None,
+            end: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        query = 'SELECT data FROM version WHERE vertex_id = ? AND format = ?'
+        args: List[Any] = [vertex_id, res_format]
+        if start is not None:
+            query += ' AND timestamp >= ?'
+            args.append(start)
+        if end is not None:
+            query += ' AND timestamp <= ?'
+            args.append(end)
+        query += ' ORDER BY version'
+        with self.__lock:
+            rows = self.__connection.execute(query, args).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get(
+            self,
+            vertex_id: str,
+            res_format: str,
+            version: Optional[int] = None,
+            v_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        if version is not None:
+            query, arg = 'SELECT data FROM version WHERE vertex_id = ? AND format = ? AND version = ?', version
+        elif v_id is not None:
+            query, arg = 'SELECT data FROM version WHERE vertex_id = ? AND format = ? AND v_id = ?', str(v_id)
+        else:
+            raise ValueError('Expected version or v_id')
+        with self.__lock:
+            row = self.__connection.execute(query, (vertex_id, res_format, arg)).fetchone()
+        return json.loads(row[0]) if row else None
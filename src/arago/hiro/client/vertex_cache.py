@@ -0,0 +1,142 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Callable, Final, Any, Tuple, Set, Hashable, FrozenSet, Iterable, Mapping
+
+from arago.hiro.utils.cache import LruCache, CacheStats
+
+# (kind, id or xid, field projection)
+VERTEX_CACHE_KEY_T = Tuple[str, str, Optional[FrozenSet[str]]]
+
+
+class VertexCacheStats(CacheStats):
+    stale_hits: int
+    refreshes: int
+    refresh_errors: int
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def __repr__(self) -> str:
+        return super().__repr__()[:-1] + \
+               f', stale_hits={self.stale_hits}, refreshes={self.refreshes}, refresh_errors={self.refresh_errors})'
+
+
+class VertexCache(LruCache[VERTEX_CACHE_KEY_T, Tuple[Any, float]]):
+    """
+    Opt-in read-through cache for the response data of vertex get and get_external.
+
+    Entries are fresh for ttl seconds. For another stale_ttl seconds they are still served while a single
+    background refresh replaces them (stale-while-revalidate). Enable it with `client.vertex_cache = VertexCache()`.
+    """
+    fresh_ttl: Final[float]
+    stale_ttl: Final[float]
+    stats: Final[VertexCacheStats]
+    _keys_by_id: Final[Dict[str, Set[VERTEX_CACHE_KEY_T]]]
+    _refreshing: Final[Set[VERTEX_CACHE_KEY_T]]
+    _executor: Optional[ThreadPoolExecutor]
+
+    def __init__(
+            self,
+            maxsize: int = 10_000,
+            ttl: float = 60.0,
+            stale_ttl: float = 0.0,
+            clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        super().__init__(maxsize, ttl + stale_ttl, clock)
+        self.fresh_ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stats = VertexCacheStats()
+        self._keys_by_id = {}
+        self._refreshing = set()
+        self._executor = None
+
+    @staticmethod
+    def key(kind: str, value: str, fields: Optional[Iterable[str]] = None) -> VERTEX_CACHE_KEY_T:
+        return kind, value, frozenset(fields) if fields else None
+
+    @staticmethod
+    def __ids(key: VERTEX_CACHE_KEY_T, data: Any) -> Set[str]:
+        items = data if isinstance(data, list) else [data]
+        ids = {item['ogit/_id'] for item in items if isinstance(item, Mapping) and 'ogit/_id' in item}
+        if key[0] == 'id':
+            # the projection may have left out ogit/_id
+            ids.add(key[1])
+        return ids
+
+    def _removed(self, key: VERTEX_CACHE_KEY_T, value: Tuple[Any, float]) -> None:
+        for vertex_id in self.__ids(key, value[0]):
+            keys = self._keys_by_id.get(vertex_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_id[vertex_id]
+
+    def put(self, key: VERTEX_CACHE_KEY_T, value: Tuple[Any, float], ttl: Any = None) -> None:
+        with self._lock:
+            super().put(key, value)
+            for vertex_id in self.__ids(key, value[0]):
+                self._keys_by_id.setdefault(vertex_id, set()).add(key)
+
+    def __entry(self, data: Any) -> Tuple[Any, float]:
+        return data, self._clock() + self.fresh_ttl
+
+    def get_or_fetch(self, key: VERTEX_CACHE_KEY_T, fetch: Callable[[], Any]) -> Any:
+        """
+        Return the cached response data for key, calling fetch on a miss and refreshing stale entries.
+        """
+        with self._lock:
+            found, entry = self._lookup(key)
+            if found:
+                data, fresh_until = entry
+                if fresh_until <= self._clock():
+                    self.stats.stale_hits += 1
+                    self.__revalidate(key, fetch)
+                return data
+            # undo the miss counted by _lookup; get_or_load counts it again
+            self.stats.misses -= 1
+        data, _ = self.get_or_load(key, lambda _: self.__entry(fetch()))
+        return data
+
+    def __revalidate(self, key: VERTEX_CACHE_KEY_T, fetch: Callable[[], Any]) -> None:
+        # called with the lock held
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='hiro-vertex-cache')
+
+        def refresh() -> None:
+            try:
+                entry = self.__entry(fetch())
+                with self._lock:
+                    self.stats.refreshes += 1
+                    # an entry invalidated meanwhile must not be brought back
+                    if key in self._entries:
+                        self.put(key, entry)
+            except Exception:
+                with self._lock:
+                    self.stats.refresh_errors += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(refresh)
+
+    def invalidate_id(self, vertex_id: Hashable) -> int:
+        """
+        Drop every entry containing the vertex, whatever field projection or external id it was read by.
+        """
+        with self._lock:
+            keys = list(self._keys_by_id.get(str(vertex_id), ()))
+            for key in keys:
+                self.invalidate(key)
+            return len(keys)
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Optional, Dict, List, Tuple, FrozenSet, Final, Iterable, TYPE_CHECKING
+
+from arago.hiro.model.graph.attribute import ATTRIBUTE_T_co, SystemAttribute, attribute_to_str
+from arago.hiro.model.graph.vertex import VERTEX_ID_T, VERTEX_T_co, VertexId, to_vertex_id
+
+if TYPE_CHECKING:
+    from arago.hiro.client.client import HiroClient
+
+_FIELDS_KEY_T = Optional[FrozenSet[str]]
+
+
+class VertexLoader:
+    """
+    Coalesces single vertex gets into /query/ids requests.
+
+    Calls made within delay seconds of each other, from any thread or task, are fetched together in
+    batches of up to max_batch ids and with the same field projection. Vertices the server does not
+    return resolve to KeyError.
+
+    A loop should queue all its ids before waiting for any vertex, as load() blocks until its batch is in:
+
+        vertices = client.vertex_loader.load_many(vertex_ids)
+        futures = [client.vertex_loader.load_future(vertex_id) for vertex_id in vertex_ids]
+
+    model.graph.vertex.get(..., batch=True), or every get with client.batch_gets, coalesces the gets of
+    concurrent threads.
+    """
+    max_batch: Final[int]
+    delay: Final[float]
+    __client: Final['HiroClient']
+    __lock: Final[threading.Lock]
+    __pending: Final[Dict[_FIELDS_KEY_T, Dict[VertexId, List[Future]]]]
+    __timers: Final[Dict[_FIELDS_KEY_T, threading.Timer]]
+    batches: int
+    loads: int
+
+    def __init__(self, client: 'HiroClient', max_batch: int = 100, delay: float = 0.005) -> None:
+        if max_batch < 1:
+            raise ValueError(f'Expected max_batch >= 1; got {max_batch}')
+        self.max_batch = max_batch
+        self.delay = delay
+        self.__client = client
+        self.__lock = threading.Lock()
+        self.__pending = {}
+        self.__timers = {}
+        self.batches = 0
+        self.loads = 0
+
+    def load_future(
+            self,
+            vertex_id: VERTEX_ID_T,
+            fields: Optional[Iterable[ATTRIBUTE_T_co]] = None
+    ) -> 'Future[VERTEX_T_co]':
+        e_vertex_id = to_vertex_id(vertex_id)
+        key = frozenset(attribute_to_str(field) for field in fields) if fields else None
+        future = Future()
+        flush = None
+        with self.__lock:
+            self.loads += 1
+            batch = self.__pending.setdefault(key, {})
+            batch.setdefault(e_vertex_id, []).append(future)
+            if len(batch) >= self.max_batch:
+                flush = self.__take(key)
+            elif key not in self.__timers:
+                timer = threading.Timer(self.delay, self.__flush, (key,))
+                timer.daemon = True
+                self.__timers[key] = timer
+                timer.start()
+        if flush is not None:
+            self.__fetch(key, flush)
+        return future
+
+    def load(
+            self,
+            vertex_id: VERTEX_ID_T,
+            fields: Optional[Iterable[ATTRIBUTE_T_co]] = None
+    ) -> VERTEX_T_co:
+        return self.load_future(vertex_id, fields).result()
+
+    async def load_async(
+            self,
+            vertex_id: VERTEX_ID_T,
+            fields: Optional[Iterable[ATTRIBUTE_T_co]] = None
+    ) -> VERTEX_T_co:
+        return await asyncio.wrap_future(self.load_future(vertex_id, fields))
+
+    def load_many(
+            self,
+            vertex_ids: Iterable[VERTEX_ID_T],
+            fields: Optional[Iterable[ATTRIBUTE_T_co]] = None
+    ) -> List[VERTEX_T_co]:
+        fields = tuple(fields) if fields else None
+        futures = [self.load_future(vertex_id, fields) for vertex_id in vertex_ids]
+        return [future.result() for future in futures]
+
+    def __take(self, key: _FIELDS_KEY_T) -> Dict[VertexId, List[Future]]:
+        # called with the lock held
+        timer = self.__timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        return self.__pending.pop(key, {})
+
+    def __flush(self, key: _FIELDS_KEY_T) -> None:
+        with self.__lock:
+            if self.__timers.get(key) is not threading.current_thread():
+                # the batch was already taken when it filled up
+                return
+            batch = self.__take(key)
+        self.__fetch(key, batch)
+
+    def __fetch(self, key: _FIELDS_KEY_T, batch: Dict[VertexId, List[Future]]) -> None:
+        if not batch:
+            return
+        with self.__lock:
+            self.batches += 1
+        # ogit/_id is needed to route the results back to the callers
+        fields = key | {attribute_to_str(SystemAttribute.OGIT__ID)} if key else None
+        try:
+            found: Dict[VertexId, VERTEX_T_co] = {}
+            for vertex in self.__client.model.search.get_by_ids(*batch, fields=fields):
+                found[vertex.id] = vertex
+        except BaseException as e:
+            for futures in batch.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+        for vertex_id, futures in batch.items():
+            vertex = found.get(vertex_id)
+            for future in futures:
+                if vertex is None:
+                    future.set_exception(KeyError(vertex_id))
+                else:
+                    future.set_result(vertex)
+
+    def flush(self) -> None:
+        """
+        Fetch all pending batches now instead of waiting for their delay.
+        """
+        with self.__lock:
+            batches: List[Tuple[_FIELDS_KEY_T, Dict[VertexId, List[Future]]]] = \
+                [(key, self.__take(key)) for key in list(self.__pending)]
+        for key, batch in batches:
+            self.__fetch(key, batch)
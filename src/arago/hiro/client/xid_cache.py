@@ -0,0 +1,49 @@
+import time
+from typing import Optional, Dict, Callable, Final, Any
+
+from arago.hiro.model.graph.vertex import ExternalVertexId, VertexId
+from arago.hiro.utils.cache import LruCache, _DEFAULT
+
+
+class XidCache(LruCache[ExternalVertexId, Optional[VertexId]]):
+    """
+    Maps external ids to vertex ids; None records an external id known not to exist (negative entry).
+    """
+    negative_ttl: Final[Optional[float]]
+    _xids_by_id: Final[Dict[VertexId, ExternalVertexId]]
+
+    def __init__(
+            self,
+            maxsize: int = 100_000,
+            ttl: Optional[float] = 3600.0,
+            negative_ttl: Optional[float] = 30.0,
+            clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        super().__init__(maxsize, ttl, clock)
+        self.negative_ttl = negative_ttl
+        self._xids_by_id = {}
+
+    def _removed(self, key: ExternalVertexId, value: Optional[VertexId]) -> None:
+        if value is not None and self._xids_by_id.get(value) == key:
+            del self._xids_by_id[value]
+
+    def put(self, key: ExternalVertexId, value: Optional[VertexId], ttl: Any = _DEFAULT) -> None:
+        if ttl is _DEFAULT:
+            ttl = self.ttl if value is not None else self.negative_ttl
+        with self._lock:
+            super().put(key, value, ttl)
+            if value is not None:
+                self._xids_by_id[value] = key
+
+    def put_absent(self, key: ExternalVertexId) -> None:
+        self.put(key, None)
+
+    def invalidate_id(self, vertex_id: VertexId) -> bool:
+        """
+        Drop the entry resolving to vertex_id, e.g. after the vertex was deleted or re-keyed.
+        """
+        with self._lock:
+            key = self._xids_by_id.get(vertex_id)
+            if key is None:
+                return False
+            return self.invalidate(key)
@@ -1,5 +1,6 @@
+from datetime import datetime
 from typing import TYPE_CHECKING, Mapping, Any, Generator, Dict, Optional, Union, Type, Final, Iterable, Tuple, \
-    Literal
+    Literal, List
 
 from requests.models import Response
 
@@ -7,9 +8,13 @@ from arago.hiro.abc.search import AbcSearchRest, AbcSearchData, AbcSearchModel,
 from arago.hiro.model.graph.attribute import ATTRIBUTE_T
 from arago.hiro.model.graph.edge import EDGE_TYPE_T
 from arago.hiro.model.graph.vertex import Vertex, VERTEX_ID_T, VERTEX_XID_T_co, VERTEX_T_co, VERTEX_XID_T, \
-    VERTEX_TYPE_T
+    VERTEX_TYPE_T, VertexId
 from arago.hiro.model.probe import Version
-from arago.hiro.model.search import Order
+from arago.hiro.model.search import Order, RefreshResult, Subgraph
+from arago.hiro.utils.fanout import FanOut
+from arago.hiro.utils.paging import PagedRun, LookupRun
+from arago.hiro.utils.result_set import ResultSet
+from arago.hiro.utils.scan import Scan, ScanCursor
 
 if TYPE_CHECKING:
     from arago.hiro.client.rest_base_client import HiroRestBaseClient
@@ -137,7 +142,9 @@ class SearchData(AbcSearchData):
             req_data: Optional[Mapping[str, Any]] = None,
             headers: Optional[Mapping[str, str]] = None
     ) -> Generator[Dict[str, Any], None, None]:
-        return self.__client.index(query, fields, order, offset, limit, req_data, headers)
+        return self.__client.index(
+            query, order=order, offset=offset, limit=limit, fields=fields, req_data=req_data, headers=headers
+        )
 
     def graph(
             self,
@@ -182,6 +189,42 @@ class SearchModel(AbcSearchModel):
     ) -> Generator[VERTEX_T_co, None, None]:
         return self.__client.connected(vertex_id, edge_type, direction, fields, vertex_types, offset, limit)
 
+    def connected_count(
+            self,
+            vertex_id: VERTEX_ID_T,
+            edge_type: EDGE_TYPE_T,
+            direction: Optional[Literal['in', 'out', 'both']] = None,
+            vertex_types: Optional[Iterable[VERTEX_TYPE_T]] = None
+    ) -> int:
+        return self.__client.connected_count(vertex_id, edge_type, direction, vertex_types)
+
+    def connected_many(
+            self,
+            vertex_ids: Iterable[VERTEX_ID_T],
+            edge_type: EDGE_TYPE_T,
+            direction: Optional[Literal['in', 'out', 'both']] = None,
+            vertex_types: Optional[Iterable[VERTEX_TYPE_T]] = None,
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            max_query_length: int = 8192
+    ) -> Generator[Tuple[VertexId, List[VERTEX_T_co]], None, None]:
+        return self.__client.connected_many(vertex_ids, edge_type, direction, vertex_types, fields, max_query_length)
+
+    def subgraph(
+            self,
+            roots: Iterable[VERTEX_ID_T],
+            edge_types: Optional[Iterable[EDGE_TYPE_T]] = None,
+            direction: Optional[Literal['in', 'out', 'both']] = None,
+            depth: int = 1,
+            vertex_types: Optional[Iterable[VERTEX_TYPE_T]] = None,
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            max_vertices: Optional[int] = None,
+            concurrency: int = 4,
+            max_query_length: int = 8192
+    ) -> Subgraph:
+        return self.__client.subgraph(
+            roots, edge_types, direction, depth, vertex_types, fields, max_vertices, concurrency, max_query_length
+        )
+
     def external_id(
             self,
             external_id: VERTEX_XID_T,
@@ -198,6 +241,29 @@ class SearchModel(AbcSearchModel):
     ) -> Generator[VERTEX_T_co, None, None]:
         return self.__client.get_by_ids(*vertex_ids, fields=fields, order=order)
 
+    def get_by_ids_parallel(
+            self,
+            vertex_ids: Iterable[VERTEX_ID_T],
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            chunk_size: int = 500,
+            concurrency: int = 4,
+            window: Optional[int] = None,
+            keep_order: bool = True,
+            max_query_length: int = 65536,
+            retries: int = 2
+    ) -> LookupRun[VERTEX_T_co]:
+        return self.__client.get_by_ids_parallel(
+            vertex_ids, fields, chunk_size, concurrency, window, keep_order, max_query_length, retries
+        )
+
+    def refresh(
+            self,
+            vertices: Iterable[VERTEX_T_co],
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            chunk_size: int = 100
+    ) -> RefreshResult:
+        return self.__client.refresh(vertices, fields, chunk_size)
+
     def index(
             self,
             query: str,
@@ -229,6 +295,65 @@ class SearchModel(AbcSearchModel):
 
         return self.__client.index(query, fields, order, offset, limit)
 
+    def index_result_set(
+            self,
+            query: str,
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            order: Optional[Order] = None,
+            offset: Optional[int] = None,
+            limit: Optional[int] = None,
+            memory_items: int = 10000,
+            spill_dir: Optional[str] = None
+    ) -> ResultSet[VERTEX_T_co]:
+        return self.__client.index_result_set(query, fields, order, offset, limit, memory_items, spill_dir)
+
+    def index_count(self, query: str) -> int:
+        return self.__client.index_count(query)
+
+    def index_many(
+            self,
+            queries: Iterable[str],
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            order: Optional[Order] = None,
+            concurrency: int = 4,
+            buffer: int = 1000
+    ) -> FanOut[VERTEX_T_co]:
+        return self.__client.index_many(queries, fields, order, concurrency, buffer)
+
+    def index_parallel(
+            self,
+            query: str,
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            order: Optional[Order] = None,
+            page_size: int = 1000,
+            concurrency: int = 4,
+            window: Optional[int] = None
+    ) -> PagedRun[VERTEX_T_co]:
+        return self.__client.index_parallel(query, fields, order, page_size, concurrency, window)
+
+    def scan(
+            self,
+            query: str,
+            fields: Optional[Iterable[ATTRIBUTE_T]] = None,
+            key: Literal['ogit/_id', 'ogit/_created-on'] = 'ogit/_id',
+            page_size: int = 1000,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+            partitions: int = 1,
+            concurrency: int = 4,
+            cursor: Optional[Union[str, ScanCursor]] = None
+    ) -> Scan[VERTEX_T_co]:
+        return self.__client.scan(
+            query, fields, key, page_size, start, end, partitions, concurrency, cursor
+        )
+
+    def graph_count(
+            self,
+            root: Union[VERTEX_ID_T, VERTEX_XID_T_co],
+            query: str
+    ) -> int:
+        return self.__client.graph_count(root, query)
+
     def graph(
             self,
             root: Union[VERTEX_ID_T, VERTEX_XID_T_co],
@@ -10,6 +10,7 @@ from arago.hiro.abc.storage import AbcStorageModel, AbcStorageBlobModel, AbcStor
 from arago.hiro.client.rest_base_client import HiroRestBaseClient
 from arago.hiro.model.probe import Version
 from arago.hiro.model.storage import BlobId, TimeSeriesId, TimeSeriesValue
+from arago.hiro.utils.download import Download, DOWNLOAD_TARGET_T
 
 
 # TODO fix requests to have headers and params for Rest
@@ -81,6 +82,18 @@ class StorageBlobData(AbcStorageBlobData):
     ) -> None:
         return self.__client.set(blob_id, content, content_type)
 
+    def download(
+            self,
+            blob_id: str,
+            target: DOWNLOAD_TARGET_T,
+            content_id: Optional[str] = None,
+            include_deleted: Optional[bool] = False,
+            part_size: int = 8 * 1024 * 1024,
+            concurrency: int = 4,
+            resume: bool = True
+    ) -> Download:
+        return self.__client.download(blob_id, target, content_id, include_deleted, part_size, concurrency, resume)
+
 
 class StorageBlobModel(AbcStorageBlobModel):
     __client: Final[AbcStorageBlobModel]
@@ -115,6 +128,18 @@ class StorageBlobModel(AbcStorageBlobModel):
     ) -> None:
         return self.__client.set(blob_id, content, content_type)
 
+    def download(
+            self,
+            blob_id: BlobId,
+            target: DOWNLOAD_TARGET_T,
+            content_id: Optional[str] = None,
+            include_deleted: Optional[bool] = False,
+            part_size: int = 8 * 1024 * 1024,
+            concurrency: int = 4,
+            resume: bool = True
+    ) -> Download:
+        return self.__client.download(blob_id, target, content_id, include_deleted, part_size, concurrency, resume)
+
 
 class StorageLogRest(AbcStorageLogRest):
     def __init__(self, client: 'HiroRestBaseClient') -> None:
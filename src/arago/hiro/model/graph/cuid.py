@@ -1,3 +1,7 @@
+import re
+from typing import Iterable, List, NamedTuple, Sequence, Any
+
+
 class Cuid(str):
     # de.arago.graphit.server.api.graph.GraphIdGenerator
     # https://github.com/ericelliott/cuid
@@ -61,3 +65,70 @@ def validate(cuid: str) -> bool:
     if not cuid.isalnum():
         raise ValueError(f'Expected only ASCII alpha numeric chars')
     return True
+
+
+_CUID_RE = re.compile(r'c[0-9A-Za-z]{24}', re.ASCII)
+
+
+def all_valid(cuids: Iterable[str]) -> bool:
+    fullmatch = _CUID_RE.fullmatch
+    return all(fullmatch(cuid) for cuid in cuids)
+
+
+def invalid_indexes(cuids: Iterable[str]) -> List[int]:
+    fullmatch = _CUID_RE.fullmatch
+    return [i for i, cuid in enumerate(cuids) if not fullmatch(cuid)]
+
+
+class CuidComponents(NamedTuple):
+    timestamp: Sequence[int]
+    counter: Sequence[int]
+    fingerprint: Sequence[int]
+    random: Sequence[int]
+
+
+def decode(cuids: Sequence[str]) -> CuidComponents:
+    """
+    Decode the components of many cuids at once; the result holds one list per component in input order.
+    """
+    return CuidComponents(
+        [int(cuid[1:9], 36) for cuid in cuids],
+        [int(cuid[9:13], 36) for cuid in cuids],
+        [int(cuid[13:17], 36) for cuid in cuids],
+        [int(cuid[17:25], 36) for cuid in cuids],
+    )
+
+
+def decode_numpy(cuids: Sequence[str]) -> CuidComponents:
+    """
+    Like decode() but vectorised, returning numpy int64 arrays; requires numpy.
+    """
+    import numpy as np
+
+    table = np.full(256, -1, dtype=np.int64)
+    table[np.frombuffer(b'0123456789', dtype=np.uint8)] = np.arange(10)
+    table[np.frombuffer(b'abcdefghijklmnopqrstuvwxyz', dtype=np.uint8)] = np.arange(10, 36)
+    table[np.frombuffer(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', dtype=np.uint8)] = np.arange(10, 36)
+
+    count = len(cuids)
+    # the total alone would let a short and a long id pass together
+    lengths = np.fromiter(map(len, cuids), dtype=np.int64, count=count)
+    if (lengths != 25).any():
+        raise ValueError('Expected len() == 25 for all cuids')
+    chars = np.frombuffer(''.join(cuids).encode('ascii'), dtype=np.uint8).reshape(count, 25)
+    if (chars[:, 0] != ord('c')).any():
+        raise ValueError("Expected 'c' as first char of all cuids")
+    digits = table[chars]
+    if (digits[:, 1:] < 0).any():
+        raise ValueError('Expected only ASCII alpha numeric chars')
+
+    def horner(block: Any) -> Any:
+        powers = 36 ** np.arange(block.shape[1] - 1, -1, -1, dtype=np.int64)
+        return block @ powers
+
+    return CuidComponents(
+        horner(digits[:, 1:9]),
+        horner(digits[:, 9:13]),
+        horner(digits[:, 13:17]),
+        horner(digits[:, 17:25]),
+    )
@@ -1,13 +1,13 @@
 from dataclasses import dataclass, field
-from datetime import datetime
 from functools import cached_property
-from typing import Final, List, Optional, Mapping, Union, Any, TYPE_CHECKING, TypeVar
+from typing import Final, List, Optional, Mapping, Union, Any, TYPE_CHECKING, TypeVar, Dict, Tuple, Callable, Type
 
 from arago.hiro.model.graph.attribute import VirtualAttribute, GraphType
 from arago.hiro.model.graph.dict import GraphDict
 from arago.hiro.model.graph.vertex import VertexId
 from arago.hiro.utils.cast import to_bool
-from arago.hiro.utils.datetime import timestamp_ms_to_datetime
+from arago.hiro.utils.datetime import LazyDatetime
+from arago.hiro.utils.serialization import bound_client
 from arago.ogit import OgitAttribute, OgitEntity, OgitVerb as OgitVerb
 from arago.ontology import OntologyEntity, OntologyVerb, OntologyAttribute
 
@@ -50,6 +50,11 @@ class EdgeId(str):
         return VertexId(value)
 
 
+def make_edge_id(out_vertex_id: str, edge_type: str, in_vertex_id: str) -> EdgeId:
+    # the server derives edge ids deterministically, so they can be known before the edge is created
+    return EdgeId(EDGE_ID_DELIMITER.join((out_vertex_id, edge_type, in_vertex_id)))
+
+
 @dataclass
 class Edge:
     id: Optional[EdgeId] = field(default=None)
@@ -63,16 +68,19 @@ class Edge:
 
     created_by_app: Optional[VertexId] = field(default=None)
     created_by: Optional[str] = field(default=None)
-    created_on: Optional[datetime] = field(default=None)
+    created_on_ms: Optional[int] = field(default=None)
 
     deleted_by_app: Optional[VertexId] = field(default=None)
     deleted_by: Optional[str] = field(default=None)
-    deleted_on: Optional[datetime] = field(default=None)
+    deleted_on_ms: Optional[int] = field(default=None)
     is_deleted: bool = field(default=False)
 
     _draft: bool = field(default=True)
     client: Optional['HiroClient'] = field(default=None)
 
+    created_on = LazyDatetime()
+    deleted_on = LazyDatetime()
+
     def __init__(
             self,
             data: Optional[Mapping[Union[str, OntologyAttribute, OgitAttribute], Any]],
@@ -136,7 +144,7 @@ class Edge:
             del m[k]
         k = OgitAttribute.OGIT__CREATED_ON
         if k in m:
-            self.created_on = timestamp_ms_to_datetime(m[k])
+            self.created_on_ms = int(m[k])
             del m[k]
 
         k = OgitAttribute.OGIT__DELETED_BY_APP
@@ -149,7 +157,7 @@ class Edge:
             del m[k]
         k = OgitAttribute.OGIT__DELETED_ON
         if k in m:
-            self.deleted_on = timestamp_ms_to_datetime(m[k])
+            self.deleted_on_ms = int(m[k])
             del m[k]
         k = OgitAttribute.OGIT__IS_DELETED
         if k in m:
@@ -174,6 +182,78 @@ class Edge:
             else:
                 raise KeyError(f'Unexpected key found: {k!r}')
 
+    def to_dict(self) -> Dict[str, Any]:
+        r = dict()
+        if self.id is not None:
+            k = OgitAttribute.OGIT__ID.value.name.uri
+            v = str(self.id)
+            r[k] = v
+        if self.type is not None:
+            k = OgitAttribute.OGIT__TYPE.value.name.uri
+            v = self.type.name.uri
+            r[k] = v
+
+        if self.out_type is not None:
+            k = VirtualAttribute.OGIT__OUT_TYPE.value.name.uri
+            v = self.out_type.name.uri
+            r[k] = v
+        if self.out_id is not None:
+            k = VirtualAttribute.OGIT__OUT_ID.value.name.uri
+            v = str(self.out_id)
+            r[k] = v
+        if self.edge_id is not None:
+            k = OgitAttribute.OGIT__EDGE_ID.value.name.uri
+            v = str(self.edge_id)
+            r[k] = v
+        if self.in_type is not None:
+            k = VirtualAttribute.OGIT__IN_TYPE.value.name.uri
+            v = self.in_type.name.uri
+            r[k] = v
+        if self.in_id is not None:
+            k = VirtualAttribute.OGIT__IN_ID.value.name.uri
+            v = str(self.in_id)
+            r[k] = v
+
+        if self.created_by_app is not None:
+            k = OgitAttribute.OGIT__CREATOR_APP.value.name.uri
+            v = str(self.created_by_app)
+            r[k] = v
+        if self.created_by is not None:
+            k = OgitAttribute.OGIT__CREATOR.value.name.uri
+            v = self.created_by
+            r[k] = v
+        if self.created_on_ms is not None:
+            k = OgitAttribute.OGIT__CREATED_ON.value.name.uri
+            v = self.created_on_ms
+            r[k] = v
+
+        if self.deleted_by_app is not None:
+            k = OgitAttribute.OGIT__DELETED_BY_APP.value.name.uri
+            v = str(self.deleted_by_app)
+            r[k] = v
+        if self.deleted_by is not None:
+            k = OgitAttribute.OGIT__DELETED_BY.value.name.uri
+            v = self.deleted_by
+            r[k] = v
+        if self.deleted_on_ms is not None:
+            k = OgitAttribute.OGIT__DELETED_ON.value.name.uri
+            v = self.deleted_on_ms
+            r[k] = v
+        if self.is_deleted is not None:
+            k = OgitAttribute.OGIT__IS_DELETED.value.name.uri
+            v = self.is_deleted
+            r[k] = v
+
+        return r
+
+    def __reduce__(self) -> Tuple[Callable[..., 'Edge'], Tuple[Any, ...]]:
+        # the client is dropped and re-bound from arago.hiro.utils.serialization.bound_client on load
+        return restore_edge, (type(self), self.to_dict(), self._draft)
+
+
+def restore_edge(cls: Type[Edge], data: Mapping[str, Any], draft: bool) -> Edge:
+    return cls(data, client=bound_client.get(), draft=draft)
+
 
 EDGE_T_co = TypeVar('EDGE_T_co', bound=Edge, covariant=True)
 EDGE_T = EDGE_T_co
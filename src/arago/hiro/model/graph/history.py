@@ -1,9 +1,12 @@
 import enum
 from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property
 from types import MappingProxyType
-from typing import Any
+from typing import Any, Tuple, Type
 
 from arago.hiro.model.graph.vertex import Vertex, VertexId, VersionId
+from arago.hiro.utils.datetime import timestamp_ms_to_datetime
 from arago.ontology import Attribute
 
 
@@ -27,6 +30,13 @@ class HistoryMeta:
     vid: VersionId
     version: int
 
+    @cached_property
+    def timestamp_datetime(self) -> datetime:
+        return timestamp_ms_to_datetime(self.timestamp)
+
+    def __reduce__(self) -> Tuple[Type['HistoryMeta'], Tuple[Any, ...]]:
+        return HistoryMeta, (self.id, self.nanotime, self.timestamp, self.vid, self.version)
+
 
 @dataclass(frozen=True)
 class HistoryEntry:
@@ -35,6 +45,9 @@ class HistoryEntry:
     data: Vertex  # TODO freeze vertex
     meta: HistoryMeta
 
+    def __reduce__(self) -> Tuple[Type['HistoryEntry'], Tuple[Any, ...]]:
+        return HistoryEntry, (self.identity, self.action, self.data, self.meta)
+
 
 @dataclass(frozen=True)
 class HistoryDiff:
@@ -0,0 +1,126 @@
+import threading
+import weakref
+from typing import Set, List, Final, Iterable, Dict, Any, Optional, TYPE_CHECKING
+
+from arago.hiro.model.graph.attribute import SystemAttribute, attribute_to_str
+from arago.ontology import Attribute
+
+if TYPE_CHECKING:
+    from arago.hiro.client.adaptive_fields import FieldProfile
+    from arago.hiro.client.client import HiroClient
+    from arago.hiro.model.graph.vertex import Vertex
+
+
+class Projection:
+    """
+    Remembers which fields the vertices of one result were fetched with.
+
+    Reading an attribute that was left out fetches it for every vertex of the result still alive, in
+    /query/ids calls of up to chunk_size vertices, instead of raising KeyError. Reading a vertex as a whole
+    (to_dict(), iteration, len(), attributes) first completes those vertices from their full versions.
+    Without fields nothing was left out; the projection then only reports the attributes read to its profile.
+    """
+    chunk_size: Final[int]
+    fields: Final[Optional[Set[str]]]
+    profile: Final[Optional['FieldProfile']]
+    __client: Final['HiroClient']
+    __vertices: Final[List['weakref.ref[Vertex]']]
+    __lock: Final[threading.Lock]
+    __complete: bool
+    loads: int
+
+    def __init__(
+            self,
+            client: 'HiroClient',
+            fields: Optional[Iterable[str]],
+            chunk_size: int = 100,
+            profile: Optional['FieldProfile'] = None
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.fields = set(fields) if fields is not None else None
+        self.profile = profile
+        self.__client = client
+        self.__vertices = []
+        self.__lock = threading.Lock()
+        self.__complete = False
+        self.loads = 0
+
+    def add(self, vertex: 'Vertex') -> 'Vertex':
+        vertex._projection = self
+        if self.fields is not None:
+            with self.__lock:
+                self.__vertices.append(weakref.ref(vertex))
+        return vertex
+
+    def touch(self, attribute: object) -> None:
+        # called on every attribute read
+        if self.profile is not None:
+            self.profile.record(attribute)
+
+    def __alive(self) -> Dict[str, List['Vertex']]:
+        # called with the lock held
+        by_id: Dict[str, List['Vertex']] = {}
+        alive = []
+        for ref in self.__vertices:
+            vertex = ref()
+            if vertex is None:
+                continue
+            alive.append(ref)
+            if vertex.id is not None:
+                by_id.setdefault(str(vertex.id), []).append(vertex)
+        self.__vertices[:] = alive
+        return by_id
+
+    def load(self, attribute: object) -> None:
+        """
+        Fetch attribute for all vertices of the result unless it was part of the projection or loaded before.
+        """
+        if self.fields is None or not isinstance(attribute, Attribute):
+            return
+        name = attribute_to_str(attribute)
+        # system attributes are not back-filled
+        if name in self.fields or name.startswith('ogit/_'):
+            return
+        with self.__lock:
+            if name in self.fields or self.__complete:
+                return
+            by_id = self.__alive()
+            e_id = attribute_to_str(SystemAttribute.OGIT__ID)
+            vertex_ids = list(by_id)
+            for offset in range(0, len(vertex_ids), self.chunk_size):
+                chunk = vertex_ids[offset:offset + self.chunk_size]
+                items = self.__client.data.search.get_by_ids(*chunk, fields=(e_id, name))
+                for item in items:
+                    value: Any = item.get(name)
+                    if value is None:
+                        continue
+                    for vertex in by_id.get(item.get(e_id), ()):
+                        vertex._fill(attribute, value)
+            self.loads += 1
+            if self.profile is not None:
+                self.profile.miss()
+            self.fields.add(name)
+
+    def load_all(self) -> None:
+        """
+        Complete all vertices of the result still alive with their full versions.
+        """
+        if self.fields is None:
+            return
+        with self.__lock:
+            if self.__complete:
+                return
+            by_id = self.__alive()
+            e_id = attribute_to_str(SystemAttribute.OGIT__ID)
+            vertex_ids = list(by_id)
+            for offset in range(0, len(vertex_ids), self.chunk_size):
+                chunk = vertex_ids[offset:offset + self.chunk_size]
+                for item in self.__client.data.search.get_by_ids(*chunk):
+                    for vertex in by_id.get(item.get(e_id), ()):
+                        vertex._fill_from(type(vertex)(item, draft=False))
+            # reads keep being reported to the profile but load nothing more
+            self.__complete = True
+            self.__vertices.clear()
+            self.loads += 1
+            if self.profile is not None:
+                self.profile.miss()
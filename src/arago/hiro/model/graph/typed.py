@@ -0,0 +1,204 @@
+from typing import Dict, Iterable, Optional, Type, Any, Mapping, Union, Tuple
+
+from arago.hiro.model.graph.attribute import to_attribute
+from arago.hiro.model.graph.vertex import Vertex, to_vertex_type
+from arago.hiro.utils.serialization import bound_client
+from arago.ogit import OgitAttribute, OgitEntity
+from arago.ontology import OntologyEntity, Attribute
+
+VERTEX_CLASSES: Dict[OntologyEntity, Type[Vertex]] = {}
+
+_MISSING = object()
+
+
+def slot_name(attribute: OgitAttribute) -> str:
+    return attribute.name.lower()
+
+
+def spellings(attribute: OgitAttribute) -> Tuple[str, ...]:
+    # string keys to_attribute resolves to attribute, its uri first
+    uri = attribute.value.name.uri
+    aliases = (
+        k for k, m in OgitAttribute.__members__.items()
+        if m is attribute and k != uri and (k.startswith('ogit/') or k.startswith('ogit:'))
+    )
+    return (uri, *aliases)
+
+
+def class_name(entity: Union[OgitEntity, OntologyEntity]) -> str:
+    # ogit:Auth/Account -> OgitAuthAccount
+    uri = to_vertex_type(entity).name.uri
+    return ''.join(part[:1].upper() + part[1:] for part in uri.replace(':', '/').replace('-', '/').split('/'))
+
+
+def vertex_class_source(
+        entity: Union[OgitEntity, OntologyEntity],
+        attributes: Iterable[OgitAttribute],
+        name: Optional[str] = None
+) -> str:
+    """
+    Render the source of a Vertex subclass which keeps the given attributes in slots instead of the GraphDict.
+    The source expects `base`, `entity`, `to_attribute`, `OgitAttribute`, `Attribute`, `restore_typed_vertex` and
+    `_MISSING` in its namespace.
+    """
+    attributes = tuple(dict.fromkeys(attributes))
+    if name is None:
+        name = class_name(entity)
+    slots = tuple(slot_name(a) for a in attributes)
+    uris = tuple(a.value.name.uri for a in attributes)
+
+    lines = [
+        f'class {name}(base):',
+        f'    __slots__ = {slots!r}',
+        f'    entity = entity',
+        f'    _slot_by_attribute = {{',
+        *(f'        to_attribute({a.value.name.uri!r}): {s!r},' for a, s in zip(attributes, slots)),
+        f'    }}',
+        f'',
+        f'    def __init__(self, data=None, client=None, draft=True):',
+        f'        if data is not None:',
+        f'            data = dict(data)',
+    ]
+    # the uri first, then the other spellings to_attribute accepts; keys given as OgitAttribute or
+    # Attribute reach the slots through __setitem__ from Vertex.__init__
+    for a, s in zip(attributes, slots):
+        for spelling in spellings(a):
+            lines += [
+                f'            v = data.pop({spelling!r}, _MISSING)',
+                f'            if v is not _MISSING:',
+                f'                self.{s} = v',
+            ]
+    lines += [
+        f'        super().__init__(data, client, draft)',
+        f'',
+        f'    def to_dict(self):',
+        f'        r = super().to_dict()',
+    ]
+    for s, uri in zip(slots, uris):
+        lines += [
+            f'        v = getattr(self, {s!r}, _MISSING)',
+            f'        if v is not _MISSING:',
+            f'            r[{uri!r}] = v',
+        ]
+    lines += [
+        f'        return r',
+        f'',
+        f'    def __reduce__(self):',
+        f'        return restore_typed_vertex, (self.entity, self.to_dict(), self._draft)',
+        f'',
+        f'    def __eq__(self, other):',
+        f'        r = super().__eq__(other)',
+        f'        if r is not True:',
+        f'            return r',
+        f'        return all(',
+        f'            getattr(self, s, _MISSING) == getattr(other, s, _MISSING) for s in self.__slots__',
+        f'        )',
+        f'',
+        f'    def __setitem__(self, k, v):',
+        f'        k = to_attribute(k)',
+        f'        s = self._slot_by_attribute.get(k)',
+        f'        if s is None:',
+        f'            self._attributes[k] = v',
+        f'        else:',
+        f'            setattr(self, s, v)',
+        f'',
+        f'    def __getitem__(self, k):',
+        f'        k = to_attribute(k)',
+        f'        s = self._slot_by_attribute.get(k)',
+        f'        if s is None:',
+        f'            return super().__getitem__(k)',
+        f'        v = getattr(self, s, _MISSING)',
+        f'        if self._projection is not None:',
+        f'            self._projection.touch(k)',
+        f'            if v is _MISSING:',
+        f'                self._projection.load(k)',
+        f'                v = getattr(self, s, _MISSING)',
+        f'        if v is _MISSING:',
+        f'            raise KeyError(k)',
+        f'        return v',
+        f'',
+        f'    def __delitem__(self, k):',
+        f'        k = to_attribute(k)',
+        f'        s = self._slot_by_attribute.get(k)',
+        f'        if s is None:',
+        f'            del self._attributes[k]',
+        f'        elif getattr(self, s, _MISSING) is _MISSING:',
+        f'            raise KeyError(k)',
+        f'        else:',
+        f'            delattr(self, s)',
+        f'',
+        f'    def __contains__(self, o):',
+        f'        k = to_attribute(o) if isinstance(o, (OgitAttribute, Attribute, str)) else o',
+        f'        s = self._slot_by_attribute.get(k)',
+        f'        if s is None:',
+        f'            return super().__contains__(k)',
+        f'        if self._projection is not None:',
+        f'            self._projection.touch(k)',
+        f'            if getattr(self, s, _MISSING) is _MISSING:',
+        f'                self._projection.load(k)',
+        f'        return getattr(self, s, _MISSING) is not _MISSING',
+        f'',
+        f'    def _fill(self, k, v):',
+        f'        s = self._slot_by_attribute.get(k)',
+        f'        if s is None:',
+        f'            super()._fill(k, v)',
+        f'        elif getattr(self, s, _MISSING) is _MISSING:',
+        f'            setattr(self, s, v)',
+        f'',
+        f'    def __iter__(self):',
+        f'        self._load_all()',
+        f'        for k, s in self._slot_by_attribute.items():',
+        f'            if getattr(self, s, _MISSING) is not _MISSING:',
+        f'                yield k',
+        f'        yield from self._attributes',
+        f'',
+        f'    def __len__(self):',
+        f'        return sum(1 for _ in self)',
+        f'',
+    ]
+    return '\n'.join(lines)
+
+
+def make_vertex_class(
+        entity: Union[OgitEntity, OntologyEntity],
+        attributes: Iterable[OgitAttribute],
+        name: Optional[str] = None,
+        base: Type[Vertex] = Vertex,
+        register: bool = True
+) -> Type[Vertex]:
+    e_entity = to_vertex_type(entity)
+    source = vertex_class_source(e_entity, attributes, name)
+    namespace = {
+        'base': base,
+        'entity': e_entity,
+        'to_attribute': to_attribute,
+        'OgitAttribute': OgitAttribute,
+        'Attribute': Attribute,
+        'restore_typed_vertex': restore_typed_vertex,
+        '_MISSING': _MISSING,
+    }
+    exec(compile(source, f'<typed vertex {e_entity.name.uri}>', 'exec'), namespace)
+    cls = namespace[name if name is not None else class_name(e_entity)]
+    cls.__module__ = __name__
+    if register:
+        register_vertex_class(cls)
+    return cls
+
+
+def register_vertex_class(cls: Type[Vertex]) -> Type[Vertex]:
+    VERTEX_CLASSES[to_vertex_type(cls.entity)] = cls
+    return cls
+
+
+def unregister_vertex_class(entity: Union[OgitEntity, OntologyEntity]) -> Optional[Type[Vertex]]:
+    return VERTEX_CLASSES.pop(to_vertex_type(entity), None)
+
+
+def restore_typed_vertex(
+        entity: OntologyEntity,
+        data: Mapping[str, Any],
+        draft: bool
+) -> Vertex:
+    # the generated class may not exist in the loading process
+    cls = VERTEX_CLASSES.get(entity, Vertex)
+    return cls(data, client=bound_client.get(), draft=draft)
@@ -1,7 +1,8 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Flag, auto
-from typing import Optional, Set, Dict, Any, Mapping, Union, Iterator, TYPE_CHECKING, TypeVar
+from typing import Optional, Set, Dict, Any, Mapping, Union, Iterator, TYPE_CHECKING, TypeVar, Tuple, Callable, Type, \
+    NamedTuple, List, Sequence, Final, FrozenSet
 
 from arago.hiro.client.rest_base_client import HiroRestBaseClient
 from arago.ogit import OgitAttribute, OgitEntity as OgitEntity
@@ -10,10 +11,12 @@ from .attribute import GraphType, ATTRIBUTE_T, to_attribute
 from .cuid import Cuid
 from .dict import GraphDict
 from ...utils.cast import to_bool
-from ...utils.datetime import timestamp_ms_to_datetime, datetime_to_timestamp_ms
+from ...utils.datetime import timestamp_ms_to_datetime, LazyDatetime
+from ...utils.serialization import bound_client
 
 if TYPE_CHECKING:
     from arago.hiro.client.client import HiroClient
+    from arago.hiro.model.graph.projection import Projection
 
 
 class VertexId(Cuid):
@@ -33,22 +36,53 @@ class ExternalVertexId(str):
     pass
 
 
+# noinspection SpellCheckingInspection
+_B62_DIGITS: Dict[str, int] = {c: i for i, c in enumerate(
+    '0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')}
+
+
+# kept by _fill_from: identity and bookkeeping of the projected vertex
+_NOT_FILLED: Final[FrozenSet[str]] = frozenset((
+    'id', 'type', '_draft', '_has_graph_type', 'client', '_attributes', '_projection'))
+
+
 def b62decode(value: str) -> int:
+    digits = _B62_DIGITS
     result = 0
     for c in value:
-        # noinspection SpellCheckingInspection
-        result = 62 * result + '0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'.find(c)
+        result = 62 * result + digits.get(c, -1)
     return result
 
 
 class VersionId(str):
     def timestamp(self) -> datetime:
-        return timestamp_ms_to_datetime(int(self[:self.find('-')]))
+        return timestamp_ms_to_datetime(self.timestamp_ms())
+
+    def timestamp_ms(self) -> int:
+        return int(self[:self.find('-')])
 
     def random(self) -> int:  # 6 chars
         return b62decode(self[self.find('-') + 1:])
 
 
+class VersionIdComponents(NamedTuple):
+    timestamp: List[int]
+    random: List[int]
+
+
+def decode_version_ids(v_ids: Sequence[str]) -> VersionIdComponents:
+    """
+    Decode the components of many version ids at once; timestamps are returned as integer milliseconds.
+    """
+    timestamps = []
+    randoms = []
+    for v_id in v_ids:
+        head, _, tail = v_id.partition('-')
+        timestamps.append(int(head))
+        randoms.append(b62decode(tail))
+    return VersionIdComponents(timestamps, randoms)
+
+
 class VertexFlag(Flag):
     DRAFT = auto()
     HAS_GRAPH_TYPE = auto()
@@ -68,13 +102,13 @@ class Vertex:  # MutableMapping
 
     created_by_app: Optional[VertexId] = field()
     created_by: Optional[str] = field()
-    created_on: Optional[datetime] = field()
+    created_on_ms: Optional[int] = field()
     modified_by_app: Optional[VertexId] = field()
     modified_by: Optional[str] = field()
-    modified_on: Optional[datetime] = field()
+    modified_on_ms: Optional[int] = field()
     deleted_by_app: Optional[VertexId] = field()
     deleted_by: Optional[str] = field()
-    deleted_on: Optional[datetime] = field()
+    deleted_on_ms: Optional[int] = field()
     is_deleted: bool = field()
 
     owner: Optional[str] = field()
@@ -94,7 +128,12 @@ class Vertex:  # MutableMapping
     _draft: bool = field(repr=False, compare=False)
     _has_graph_type: bool = field(repr=False)
     client: Optional['HiroClient'] = field(repr=False, compare=False)
-    attributes: GraphDict = field()
+    _attributes: GraphDict = field()
+    _projection: Optional['Projection'] = field(default=None, repr=False, compare=False)
+
+    created_on = LazyDatetime()
+    modified_on = LazyDatetime()
+    deleted_on = LazyDatetime()
 
     def __init__(
             self,
@@ -105,6 +144,8 @@ class Vertex:  # MutableMapping
         super().__init__()
         if isinstance(client, HiroRestBaseClient):
             self.client = client.root
+        else:
+            self.client = None
         self._draft = draft
 
         if data is not None:
@@ -167,10 +208,10 @@ class Vertex:  # MutableMapping
                 self.created_by = None
             k = OgitAttribute.OGIT__CREATED_ON
             if k in m:
-                self.created_on = timestamp_ms_to_datetime(m[k])
+                self.created_on_ms = int(m[k])
                 del m[k]
             else:
-                self.created_on = None
+                self.created_on_ms = None
 
             k = OgitAttribute.OGIT__MODIFIED_BY_APP
             if k in m:
@@ -186,10 +227,10 @@ class Vertex:  # MutableMapping
                 self.modified_by = None
             k = OgitAttribute.OGIT__MODIFIED_ON
             if k in m:
-                self.modified_on = timestamp_ms_to_datetime(m[k])
+                self.modified_on_ms = int(m[k])
                 del m[k]
             else:
-                self.modified_on = None
+                self.modified_on_ms = None
 
             k = OgitAttribute.OGIT__DELETED_BY_APP
             if k in m:
@@ -205,10 +246,10 @@ class Vertex:  # MutableMapping
                 self.deleted_by = None
             k = OgitAttribute.OGIT__DELETED_ON
             if k in m:
-                self.deleted_on = timestamp_ms_to_datetime(m[k])
+                self.deleted_on_ms = int(m[k])
                 del m[k]
             else:
-                self.deleted_on = None
+                self.deleted_on_ms = None
             k = OgitAttribute.OGIT__IS_DELETED
             if k in m:
                 self.is_deleted = to_bool(m[k])
@@ -271,7 +312,7 @@ class Vertex:  # MutableMapping
                 k = OgitAttribute.OGIT__GRAPH_TYPE  # virtual attribute
                 del m[k]
 
-            self.attributes = GraphDict()
+            self._attributes = GraphDict()
 
             for k in m:
                 if isinstance(k, Attribute):
@@ -296,7 +337,13 @@ class Vertex:  # MutableMapping
             #                 else:
             #                     raise KeyError(f'Unexpected key found: {k!r}')
 
+    @property
+    def attributes(self) -> GraphDict:
+        self._load_all()
+        return self._attributes
+
     def to_dict(self) -> Dict[str, Any]:
+        self._load_all()
         r = dict()
         if self._has_graph_type:
             k = OgitAttribute.OGIT__GRAPH_TYPE.value.name.uri
@@ -332,9 +379,9 @@ class Vertex:  # MutableMapping
             k = OgitAttribute.OGIT__CREATOR.value.name.uri
             v = self.created_by
             r[k] = v
-        if self.created_on is not None:
+        if self.created_on_ms is not None:
             k = OgitAttribute.OGIT__CREATED_ON.value.name.uri
-            v = datetime_to_timestamp_ms(self.created_on)
+            v = self.created_on_ms
             r[k] = v
 
         if self.modified_by_app is not None:
@@ -345,9 +392,9 @@ class Vertex:  # MutableMapping
             k = OgitAttribute.OGIT__MODIFIED_BY.value.name.uri
             v = self.modified_by
             r[k] = v
-        if self.modified_on is not None:
+        if self.modified_on_ms is not None:
             k = OgitAttribute.OGIT__MODIFIED_ON.value.name.uri
-            v = datetime_to_timestamp_ms(self.modified_on)
+            v = self.modified_on_ms
             r[k] = v
 
         if self.deleted_by_app is not None:
@@ -358,9 +405,9 @@ class Vertex:  # MutableMapping
             k = OgitAttribute.OGIT__DELETED_BY.value.name.uri
             v = self.deleted_by
             r[k] = v
-        if self.deleted_on is not None:
+        if self.deleted_on_ms is not None:
             k = OgitAttribute.OGIT__DELETED_ON.value.name.uri
-            v = datetime_to_timestamp_ms(self.deleted_on)
+            v = self.deleted_on_ms
             r[k] = v
         if self.is_deleted is not None:
             k = OgitAttribute.OGIT__IS_DELETED.value.name.uri
@@ -399,34 +446,68 @@ class Vertex:  # MutableMapping
             r[k] = v
 
         a: Attribute
-        for a, v in self.attributes.items():
+        for a, v in self._attributes.items():
             k = a.name.uri
             r[k] = v
 
         return r
 
+    def __reduce__(self) -> Tuple[Callable[..., 'Vertex'], Tuple[Any, ...]]:
+        # the client is dropped and re-bound from arago.hiro.utils.serialization.bound_client on load
+        return restore_vertex, (type(self), self.to_dict(), self._draft)
+
     def __setitem__(self, k: Union[OgitAttribute, Attribute, str], v: Any) -> None:
         k = to_attribute(k)
-        self.attributes[k] = v
+        self._attributes[k] = v
 
     def __getitem__(self, k: Union[OgitAttribute, Attribute, str]) -> Any:
         k = to_attribute(k)
-        return self.attributes[k]
+        if self._projection is not None:
+            self._projection.touch(k)
+            if k not in self._attributes:
+                self._projection.load(k)
+        return self._attributes[k]
 
     def __delitem__(self, k: Union[OgitAttribute, Attribute, str]) -> None:
         k = to_attribute(k)
-        del self.attributes[k]
+        del self._attributes[k]
 
     def __contains__(self, o: object) -> bool:
         if isinstance(o, (OgitAttribute, Attribute, str)):
             o = to_attribute(o)
-        return self.attributes.__contains__(o)
+        if self._projection is not None:
+            self._projection.touch(o)
+            if o not in self._attributes:
+                self._projection.load(o)
+        return self._attributes.__contains__(o)
+
+    def _fill(self, k: Attribute, v: Any) -> None:
+        # back-fill from a Projection; values set locally meanwhile win
+        if k not in self._attributes:
+            self._attributes[k] = v
+
+    def _fill_from(self, other: 'Vertex') -> None:
+        # complete from the full vertex of a Projection; values set locally meanwhile win
+        for f in fields(Vertex):
+            if f.name in _NOT_FILLED:
+                continue
+            if getattr(self, f.name) in (None, set()):
+                setattr(self, f.name, getattr(other, f.name))
+        for k in other:
+            self._fill(k, other[k])
+
+    def _load_all(self) -> None:
+        # whole-vertex reads must not see the attributes a Projection left out
+        if self._projection is not None:
+            self._projection.load_all()
 
     def __len__(self) -> int:
-        return len(self.attributes)
+        self._load_all()
+        return len(self._attributes)
 
     def __iter__(self) -> Iterator:
-        return iter(self.attributes)
+        self._load_all()
+        return iter(self._attributes)
 
     def resolve_id(
             self,
@@ -447,6 +528,10 @@ class Vertex:  # MutableMapping
         return self.client.model.graph.vertex.delete(self.id)
 
 
+def restore_vertex(cls: Type[Vertex], data: Mapping[str, Any], draft: bool) -> Vertex:
+    return cls(data, client=bound_client.get(), draft=draft)
+
+
 VERTEX_T_co = TypeVar('VERTEX_T_co', bound=Vertex, covariant=True)
 VERTEX_T = Union[
     VERTEX_T_co,
@@ -1,10 +1,113 @@
-from typing import NamedTuple, Literal
+from dataclasses import dataclass
+from typing import NamedTuple, Literal, List, Optional, Iterable, Union, Iterator, Dict, Tuple
 
 from arago.hiro.model.graph.attribute import ATTRIBUTE_T
+from arago.hiro.model.graph.vertex import Vertex, VertexId
 
 
 class Order(NamedTuple):
     field: ATTRIBUTE_T
     dir: Literal['asc', 'dec']
 
+
+@dataclass(frozen=True)
+class RefreshResult:
+    vertices: List[Vertex]  # input order; changed vertices are replaced by their current state
+    changed: List[VertexId]
+    missing: List[VertexId]  # deleted or no longer visible
+
+
+class SubgraphEdge(NamedTuple):
+    out_id: VertexId
+    type: str
+    in_id: VertexId
+
+
+@dataclass(frozen=True)
+class Subgraph:
+    vertices: Dict[VertexId, Vertex]  # discovery order, roots first
+    edges: List[SubgraphEdge]  # edges followed, each once
+    depth: int  # levels expanded
+    truncated: bool  # max_vertices was reached before depth
+
 # TODO impl escape elastic search query
+
+
+def quote_term(value: str) -> str:
+    # quoted term of an Elasticsearch query string
+    return '"%s"' % value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def connected_query(
+        edge_type: str,
+        direction: Optional[Literal['in', 'out', 'both']] = None,
+        vertex_types: Optional[Iterable[str]] = None
+) -> str:
+    # gremlin traversal from a root to its connected vertices
+    if direction == 'out':
+        stmt = f"outE('{edge_type}').inV()"
+    elif direction == 'in':
+        stmt = f"inE('{edge_type}').outV()"
+    elif direction == 'both' or direction is None:
+        stmt = f"bothE('{edge_type}').otherV()"
+    else:
+        raise ValueError(direction)
+    if vertex_types:
+        args = ','.join(f"'{vertex_type}'" for vertex_type in vertex_types)
+        stmt += f".has('ogit/_type',within({args}))"
+    return stmt
+
+
+def connected_edges_query(
+        vertex_ids: Iterable[str],
+        edge_type: Optional[Union[str, Iterable[str]]],
+        direction: Optional[Literal['in', 'out', 'both']] = None,
+        vertex_types: Optional[Iterable[str]] = None
+) -> str:
+    # gremlin traversal from many roots to their edges, which name the vertices on both ends
+    roots = ','.join(f"'{vertex_id}'" for vertex_id in vertex_ids)
+    if edge_type is None:
+        labels = ''
+    elif isinstance(edge_type, str):
+        labels = f"'{edge_type}'"
+    else:
+        labels = ','.join(f"'{label}'" for label in edge_type)
+    args = ','.join(f"'{vertex_type}'" for vertex_type in vertex_types) if vertex_types else None
+    if direction == 'out':
+        stmt = f"V({roots}).outE({labels})"
+        if args:
+            stmt += f".has('ogit/_in-type',within({args}))"
+    elif direction == 'in':
+        stmt = f"V({roots}).inE({labels})"
+        if args:
+            stmt += f".has('ogit/_out-type',within({args}))"
+    elif direction == 'both' or direction is None:
+        stmt = f"V({roots}).bothE({labels})"
+        if args:
+            stmt += f".or(has('ogit/_in-type',within({args})),has('ogit/_out-type',within({args})))"
+    else:
+        raise ValueError(direction)
+    return stmt
+
+
+def chunk_by_length(
+        values: Iterable[str],
+        overhead: int,
+        limit: int,
+        separator: int = 1,
+        max_items: Optional[int] = None
+) -> Iterator[List[str]]:
+    """
+    Group values into lists whose joined length plus overhead stays within limit, and of at most max_items
+    values; a single longer value forms a list of its own.
+    """
+    chunk = []
+    length = overhead
+    for value in values:
+        if chunk and (length + len(value) + separator > limit or len(chunk) == max_items):
+            yield chunk
+            chunk, length = [], overhead
+        chunk.append(value)
+        length += len(value) + separator
+    if chunk:
+        yield chunk
@@ -0,0 +1,175 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from typing import TypeVar, Generic, Optional, Callable, Iterable, Iterator, List, Deque, Tuple, Any, Final
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+@dataclass
+class BulkResult(Generic[T, R]):
+    index: int
+    item: T
+    value: Optional[R] = field(default=None)
+    error: Optional[BaseException] = field(default=None)
+    latency: float = field(default=0.0)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BulkStats:
+    count: int
+    errors: int
+    latencies: List[float]
+    started: Optional[float]
+    finished: Optional[float]
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.latencies = []
+        self.started = None
+        self.finished = None
+
+    def add(self, result: BulkResult) -> None:
+        self.count += 1
+        if not result.ok:
+            self.errors += 1
+        self.latencies.append(result.latency)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    @property
+    def throughput(self) -> float:
+        # items per second
+        elapsed = self.elapsed
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def percentile(self, p: float) -> float:
+        # nearest-rank
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(p / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(count={self.count}, errors={self.errors}, elapsed={self.elapsed:.3f}s, ' \
+               f'throughput={self.throughput:.1f}/s, p50={self.percentile(50):.3f}s, ' \
+               f'p95={self.percentile(95):.3f}s, p99={self.percentile(99):.3f}s)'
+
+
+class BulkRun(Generic[T, R], Iterator[BulkResult[T, R]]):
+    """
+    Applies fn to every item with up to concurrency threads and yields one BulkResult per item in input order.
+
+    Items are pulled lazily; at most window items are in flight or buffered at any time.
+    Errors are captured per item and do not stop the run.
+    """
+    __fn: Final[Callable[[T], R]]
+    __items: Final[Iterator[Tuple[int, T]]]
+    __window: Final[int]
+    __executor: Optional[ThreadPoolExecutor]
+    __pending: Final[Deque[Tuple[int, T, 'Future[Tuple[Optional[R], Optional[BaseException], float]]']]]
+    __lock: Final[threading.Lock]
+    stats: Final[BulkStats]
+
+    def __init__(
+            self,
+            fn: Callable[[T], R],
+            items: Iterable[T],
+            concurrency: int = 8,
+            window: Optional[int] = None
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError(f'Expected concurrency >= 1; got {concurrency}')
+        if window is None:
+            window = concurrency * 4
+        if window < concurrency:
+            raise ValueError(f'Expected window >= concurrency; got {window}')
+        self.__fn = fn
+        self.__items = enumerate(items)
+        self.__window = window
+        self.__executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='hiro-bulk')
+        self.__pending = deque()
+        self.__lock = threading.Lock()
+        self.stats = BulkStats()
+
+    def __call(self, item: T) -> Tuple[Optional[R], Optional[BaseException], float]:
+        start = time.perf_counter()
+        try:
+            value = self.__fn(item)
+            return value, None, time.perf_counter() - start
+        except Exception as e:
+            return None, e, time.perf_counter() - start
+
+    def __fill(self) -> None:
+        while self.__executor is not None and len(self.__pending) < self.__window:
+            try:
+                index, item = next(self.__items)
+            except StopIteration:
+                break
+            future = self.__executor.submit(self.__call, item)
+            self.__pending.append((index, item, future))
+
+    def __iter__(self) -> 'BulkRun[T, R]':
+        return self
+
+    def __next__(self) -> BulkResult[T, R]:
+        with self.__lock:
+            if self.stats.started is None:
+                self.stats.started = time.perf_counter()
+            self.__fill()
+            if not self.__pending:
+                self.close()
+                raise StopIteration
+            index, item, future = self.__pending.popleft()
+            value, error, latency = future.result()
+            result = BulkResult(index, item, value, error, latency)
+            self.stats.add(result)
+            self.__fill()
+            return result
+
+    def close(self) -> None:
+        """
+        Stop submitting new items, cancel queued ones and release the worker threads.
+        """
+        executor = self.__executor
+        if executor is None:
+            return
+        self.__executor = None
+        for _, _, future in self.__pending:
+            future.cancel()
+        self.__pending.clear()
+        executor.shutdown(wait=True)
+        if self.stats.finished is None:
+            self.stats.finished = time.perf_counter()
+
+    def __enter__(self) -> 'BulkRun[T, R]':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def values(self) -> List[R]:
+        """
+        Consume the run and return all values in input order, raising the first error encountered.
+        """
+        result = []
+        for r in self:
+            if r.error is not None:
+                self.close()
+                raise r.error
+            result.append(r.value)
+        return result
@@ -0,0 +1,190 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import TypeVar, Generic, Optional, Callable, Dict, Tuple, Any, Final, Hashable, Iterator
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+_DEFAULT: Final = object()
+
+
+class CacheStats:
+    hits: int
+    misses: int
+    loads: int
+    coalesced: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(hits={self.hits}, misses={self.misses}, hit_ratio={self.hit_ratio:.3f}, ' \
+               f'loads={self.loads}, coalesced={self.coalesced}, evictions={self.evictions}, ' \
+               f'expirations={self.expirations}, invalidations={self.invalidations})'
+
+
+class _Flight:
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class LruCache(Generic[K, V]):
+    """
+    Thread-safe least recently used cache with optional time to live per entry.
+
+    get_or_load() lets concurrent misses for the same key share a single load.
+    """
+    maxsize: Final[int]
+    ttl: Final[Optional[float]]
+    stats: Final[CacheStats]
+    _clock: Final[Callable[[], float]]
+    _entries: Final['OrderedDict[K, Tuple[V, Optional[float]]]']
+    _flights: Final[Dict[K, _Flight]]
+    _lock: Final[threading.RLock]
+
+    def __init__(
+            self,
+            maxsize: int = 1024,
+            ttl: Optional[float] = None,
+            clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError(f'Expected maxsize >= 1; got {maxsize}')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.RLock()
+
+    def _removed(self, key: K, value: V) -> None:
+        # hook for subclasses maintaining secondary indexes; called with the lock held
+        pass
+
+    def _pop(self, key: K) -> Tuple[V, Optional[float]]:
+        entry = self._entries.pop(key)
+        self._removed(key, entry[0])
+        return entry
+
+    def _lookup(self, key: K) -> Tuple[bool, Optional[V]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return False, None
+        value, expires = entry
+        if expires is not None and expires <= self._clock():
+            self._pop(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return True, value
+
+    def lookup(self, key: K) -> Tuple[bool, Optional[V]]:
+        """
+        Return (True, value) for a live entry and (False, None) otherwise; cached None values are found.
+        """
+        with self._lock:
+            return self._lookup(key)
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        found, value = self.lookup(key)
+        return value if found else default
+
+    def put(self, key: K, value: V, ttl: Any = _DEFAULT) -> None:
+        if ttl is _DEFAULT:
+            ttl = self.ttl
+        expires = self._clock() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (value, expires)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._pop(oldest)
+                self.stats.evictions += 1
+
+    def invalidate(self, key: K) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._pop(key)
+            self.stats.invalidations += 1
+            return True
+
+    def invalidate_if(self, predicate: Callable[[K, V], bool]) -> int:
+        with self._lock:
+            keys = [k for k, (v, _) in self._entries.items() if predicate(k, v)]
+            for k in keys:
+                self._pop(k)
+            self.stats.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            for k in list(self._entries):
+                self._pop(k)
+
+    def get_or_load(self, key: K, loader: Callable[[K], V], ttl: Any = _DEFAULT) -> V:
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.stats.coalesced += 1
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            value = loader(key)
+            with self._lock:
+                self.stats.loads += 1
+                self.put(key, value, ttl)
+            flight.value = value
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[1] is None or entry[1] > self._clock())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[K]:
+        with self._lock:
+            return iter(list(self._entries))
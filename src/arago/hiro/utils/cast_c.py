@@ -1,11 +1,16 @@
-from typing import Generator, Iterator
+from typing import Generator, Iterator, Optional, Iterable, TYPE_CHECKING
 from typing import Mapping, Any
 
 from arago.hiro.model.graph.dict import GraphDict
+from arago.hiro.model.graph.projection import Projection
 from arago.hiro.model.graph.vertex import HIRO_BASE_CLIENT_T_co, VERTEX_T_co, to_vertex_type, Vertex
+from arago.hiro.model.graph.typed import VERTEX_CLASSES
 from arago.hiro.model.storage import BlobVertex, TimeSeriesVertex
 from arago.ogit import OgitAttribute, OgitEntity
 
+if TYPE_CHECKING:
+    from arago.hiro.client.adaptive_fields import FieldProfile
+
 
 def to_vertex(
         data: Mapping[str, Any],
@@ -14,6 +19,9 @@ def to_vertex(
     vertex_type = GraphDict(data).get(OgitAttribute.OGIT__TYPE)
     e_vertex_type = to_vertex_type(vertex_type)
 
+    cls = VERTEX_CLASSES.get(e_vertex_type)
+    if cls is not None:
+        return cls(data, client=client, draft=False)
     if e_vertex_type is OgitEntity.OGIT_ATTACHMENT:
         return BlobVertex(data, client=client, draft=False)
     elif e_vertex_type is OgitEntity.OGIT_DATA_LOG:
@@ -26,7 +34,29 @@ def to_vertex(
 
 def to_vertices(
         items: Iterator[Mapping[str, Any]],
-        client: HIRO_BASE_CLIENT_T_co
+        client: HIRO_BASE_CLIENT_T_co,
+        fields: Optional[Iterable[str]] = None,
+        profile: Optional['FieldProfile'] = None
+) -> Generator[VERTEX_T_co, None, None]:
+    read_ahead = client.root.read_ahead if client is not None else None
+    if read_ahead is None:
+        yield from _to_vertices(items, client, fields, profile)
+    else:
+        # reading, parsing and building vertices overlap with the consumer
+        yield from read_ahead.wrap(_to_vertices(items, client, fields, profile))
+
+
+def _to_vertices(
+        items: Iterator[Mapping[str, Any]],
+        client: HIRO_BASE_CLIENT_T_co,
+        fields: Optional[Iterable[str]] = None,
+        profile: Optional['FieldProfile'] = None
 ) -> Generator[VERTEX_T_co, None, None]:
+    if (not fields and profile is None) or client is None:
+        for item in items:
+            yield to_vertex(item, client)
+        return
+    # the vertices of a projected result share a Projection which back-fills omitted fields on access
+    projection = Projection(client.root, fields or None, profile=profile)
     for item in items:
-        yield to_vertex(item, client)
+        yield projection.add(to_vertex(item, client))
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, Any, Tuple
 
 
 def timestamp_ms_to_datetime(value: Optional[int] = None) -> Optional[datetime]:
@@ -14,3 +14,35 @@ def datetime_to_timestamp_ms(value: Optional[datetime] = None) -> Optional[int]:
     if value.tzinfo is None:
         raise ValueError('tzinfo is required')
     return int(value.timestamp() * 1e3)
+
+
+class LazyDatetime:
+    """
+    Exposes the integer milliseconds stored in ``<name>_ms`` as timezone aware datetime.
+
+    The datetime is created on first access and cached until ``<name>_ms`` changes.
+    """
+    name: str
+    ms_name: str
+    cache_name: str
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.ms_name = f'{name}_ms'
+        self.cache_name = f'_{name}_cache'
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        value: Optional[int] = getattr(instance, self.ms_name)
+        if value is None:
+            return None
+        cache: Optional[Tuple[int, datetime]] = instance.__dict__.get(self.cache_name)
+        if cache is not None and cache[0] == value:
+            return cache[1]
+        result = timestamp_ms_to_datetime(value)
+        instance.__dict__[self.cache_name] = (value, result)
+        return result
+
+    def __set__(self, instance: Any, value: Optional[datetime]) -> None:
+        setattr(instance, self.ms_name, datetime_to_timestamp_ms(value))
@@ -0,0 +1,227 @@
+import json
+import mmap
+import os
+import re
+from dataclasses import dataclass
+from typing import Optional, Callable, Mapping, Union, Tuple, List, Set, Final
+
+from requests import HTTPError
+from requests.models import Response
+
+from arago.hiro.client.exception import HiroClientError, HiroServerError
+from arago.hiro.utils.bulk import BulkRun
+
+DOWNLOAD_TARGET_T = Union[str, 'os.PathLike[str]', bytearray, memoryview, mmap.mmap]
+
+# fetch(headers) issues the GET of the content with the extra request headers
+DOWNLOAD_FETCH_T = Callable[[Mapping[str, str]], Response]
+
+# next to a partially downloaded file; records the parts already written
+STATE_SUFFIX: Final[str] = '.hiro-download'
+
+_content_range_re = re.compile(r'bytes (\d+)-(\d+)/(\d+)')
+
+
+@dataclass(frozen=True)
+class Download:
+    size: int
+    parts: int  # parts fetched by this call
+    resumed: int  # bytes found complete from an earlier call
+    ranged: bool  # False: the server ignored ranges and the content came in one stream
+
+
+def _read_into(response: Response, view: memoryview) -> None:
+    with response:
+        raw = response.raw
+        pos = 0
+        while pos < len(view):
+            with view[pos:] as rest:
+                n = raw.readinto(rest)
+            if not n:
+                raise RuntimeError(f'Expected {len(view)} bytes; got {pos}')
+            pos += n
+
+
+def _range_headers(start: int, end: int, validator: Optional[str] = None) -> Mapping[str, str]:
+    headers = {
+        'Range': f'bytes={start}-{end}',
+        # a range of encoded content is useless
+        'Accept-Encoding': 'identity',
+    }
+    if validator is not None:
+        headers['If-Range'] = validator
+    return headers
+
+
+def _is_range(response: Response, start: int, end: int, size: int) -> bool:
+    # a 206 for another range than requested would land in the wrong slice
+    match = _content_range_re.fullmatch(response.headers.get('Content-Range', ''))
+    return match is not None and (int(match.group(1)), int(match.group(2)), int(match.group(3))) == (start, end, size)
+
+
+def _probe(fetch: DOWNLOAD_FETCH_T, part_size: int) -> Tuple[Response, Optional[int]]:
+    """
+    The response to a request for the first part, and the content size if the server honoured the range.
+    """
+    try:
+        response = fetch(_range_headers(0, part_size - 1))
+    except (HiroClientError, HiroServerError) as e:
+        cause = e.__cause__
+        if not isinstance(cause, HTTPError) or cause.response is None or cause.response.status_code != 416:
+            raise
+        # range not satisfiable: empty content
+        response = fetch({'Accept-Encoding': 'identity'})
+        return response, None
+    if response.status_code == 206:
+        match = _content_range_re.fullmatch(response.headers.get('Content-Range', ''))
+        size = int(match.group(3)) if match is not None else None
+        if size is None or not _is_range(response, 0, min(part_size, size) - 1, size):
+            response.close()
+            raise RuntimeError(
+                f'Expected Content-Range bytes 0-{part_size - 1}/*; got {response.headers.get("Content-Range")!r}')
+        return response, size
+    return response, None
+
+
+def _single_stream(response: Response, target: DOWNLOAD_TARGET_T) -> Download:
+    size = 0
+    with response:
+        raw = response.raw
+        if isinstance(target, (str, os.PathLike)):
+            buffer = bytearray(1024 * 1024)
+            with memoryview(buffer) as view, open(target, 'wb') as file:
+                while True:
+                    n = raw.readinto(view)
+                    if not n:
+                        break
+                    with view[:n] as chunk:
+                        file.write(chunk)
+                    size += n
+        else:
+            with memoryview(target).cast('B') as view:
+                while True:
+                    with view[size:] as rest:
+                        n = raw.readinto(rest) if len(rest) else 0
+                    if not n:
+                        if len(view) == size and raw.read(1):
+                            raise ValueError(f'Content larger than the target of {len(view)} bytes')
+                        break
+                    size += n
+    return Download(size, 1, 0, False)
+
+
+def _load_state(path: str, size: int, part_size: int, validator: Optional[str]) -> Set[int]:
+    try:
+        with open(path + STATE_SUFFIX, 'r') as file:
+            state = json.load(file)
+        if not os.path.isfile(path) or os.path.getsize(path) != size:
+            return set()
+    except (OSError, ValueError):
+        return set()
+    if state.get('size') != size or state.get('part_size') != part_size or state.get('validator') != validator:
+        # another content or another split
+        return set()
+    return set(state.get('done', ()))
+
+
+def _save_state(path: str, size: int, part_size: int, validator: Optional[str], done: Set[int]) -> None:
+    state = {'size': size, 'part_size': part_size, 'validator': validator, 'done': sorted(done)}
+    tmp = path + STATE_SUFFIX + '.tmp'
+    with open(tmp, 'w') as file:
+        json.dump(state, file)
+    os.replace(tmp, path + STATE_SUFFIX)
+
+
+def download(
+        fetch: DOWNLOAD_FETCH_T,
+        target: DOWNLOAD_TARGET_T,
+        part_size: int = 8 * 1024 * 1024,
+        concurrency: int = 4,
+        resume: bool = True
+) -> Download:
+    """
+    Download content into target, a file path or a writable buffer of at least the content size.
+
+    The content is split into HTTP Range requests of part_size bytes, up to concurrency of them in flight,
+    each read straight into its slice of the pre-sized file (mapped into memory) or buffer. For a path, the
+    finished parts are recorded next to the file until the download completes; with resume a later call
+    fetches only the missing parts, provided size and ETag / Last-Modified are unchanged. A weak ETag is not
+    used, as If-Range never matches it. Without either validator nothing is recorded, as a changed content
+    could not be told apart. Servers ignoring ranges
+    are read in one stream; a part answered with another range than requested fails the download.
+    """
+    if part_size < 1:
+        raise ValueError(f'Expected part_size >= 1; got {part_size}')
+    response, size = _probe(fetch, part_size)
+    if size is None:
+        return _single_stream(response, target)
+    # If-Range only matches a strong validator; a weak ETag would turn every part into a 200
+    etag = response.headers.get('ETag')
+    if etag is not None and etag.startswith('W/'):
+        etag = None
+    validator = etag or response.headers.get('Last-Modified')
+    is_path = isinstance(target, (str, os.PathLike))
+    path = os.fspath(target) if is_path else None
+    # parts of an unidentifiable content must not be mixed with those of another
+    keep_state = is_path and validator is not None
+    done = _load_state(path, size, part_size, validator) if keep_state and resume else set()
+    resumed = sum(min(part_size, size - i * part_size) for i in done)
+    parts = [(i, i * part_size, min((i + 1) * part_size, size)) for i in range(-(-size // part_size))]
+
+    def run(view: memoryview) -> int:
+        fetched = 0
+        if 0 in done:
+            response.close()
+        else:
+            with view[0:parts[0][2]] as first:
+                _read_into(response, first)
+            done.add(0)
+            fetched += 1
+            if keep_state:
+                _save_state(path, size, part_size, validator, done)
+
+        def fetch_part(part: Tuple[int, int, int]) -> int:
+            index, start, end = part
+            part_response = fetch(_range_headers(start, end - 1, validator))
+            if part_response.status_code != 206:
+                part_response.close()
+                raise RuntimeError('Content changed during download')
+            if not _is_range(part_response, start, end - 1, size):
+                part_response.close()
+                raise RuntimeError(
+                    f'Expected Content-Range bytes {start}-{end - 1}/{size}; '
+                    f'got {part_response.headers.get("Content-Range")!r}')
+            with view[start:end] as part_view:
+                _read_into(part_response, part_view)
+            return index
+
+        pending: List[Tuple[int, int, int]] = [part for part in parts if part[0] not in done]
+        with BulkRun(fetch_part, pending, concurrency) as bulk:
+            for result in bulk:
+                if result.error is not None:
+                    raise result.error
+                done.add(result.value)
+                fetched += 1
+                if keep_state:
+                    _save_state(path, size, part_size, validator, done)
+        return fetched
+
+    try:
+        if not is_path:
+            with memoryview(target).cast('B') as view:
+                if len(view) < size:
+                    raise ValueError(f'Expected a target of at least {size} bytes; got {len(view)}')
+                fetched = run(view)
+        else:
+            with open(path, 'r+b' if done else 'w+b') as file:
+                file.truncate(size)
+                with mmap.mmap(file.fileno(), size) as mapped:
+                    with memoryview(mapped) as view:
+                        fetched = run(view)
+                    mapped.flush()
+            if os.path.exists(path + STATE_SUFFIX):
+                os.remove(path + STATE_SUFFIX)
+    finally:
+        response.close()
+    return Download(size, fetched, resumed, True)
+
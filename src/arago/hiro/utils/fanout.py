@@ -0,0 +1,187 @@
+import heapq
+import queue
+import threading
+import weakref
+from typing import TypeVar, Generic, Optional, Callable, Iterable, Iterator, List, Tuple, Any, Final, Hashable, \
+    Sequence, Set
+
+T = TypeVar('T')
+
+_END: Final = object()
+
+
+class _Stop(Exception):
+    pass
+
+
+# the workers are daemon threads holding no reference to their FanOut: an abandoned one is collected and
+# stops them, and one still referenced does not keep the interpreter from exiting
+
+def _put(entries: 'queue.Queue[Tuple[Any, Any, Any]]', stop: threading.Event, entry: Tuple[Any, Any, Any]) -> None:
+    while True:
+        if stop.is_set():
+            raise _Stop()
+        try:
+            entries.put(entry, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+
+def _run(
+        source: Callable[[], Iterable[Any]],
+        key: Callable[[Any], Hashable],
+        sort_key: Optional[Callable[[Any], Any]],
+        convert: Optional[Callable[[Any], Any]],
+        entries: 'queue.Queue[Tuple[Any, Any, Any]]',
+        stop: threading.Event
+) -> None:
+    try:
+        for item in source():
+            sort_value = sort_key(item) if sort_key is not None else None
+            value = convert(item) if convert is not None else item
+            _put(entries, stop, (sort_value, key(item), value))
+        _put(entries, stop, (None, _END, None))
+    except _Stop:
+        pass
+    except BaseException as e:
+        try:
+            _put(entries, stop, (None, _END, e))
+        except _Stop:
+            pass
+
+
+def _work(
+        tasks: 'queue.SimpleQueue[Tuple[Callable[[], Iterable[Any]], queue.Queue[Tuple[Any, Any, Any]]]]',
+        key: Callable[[Any], Hashable],
+        sort_key: Optional[Callable[[Any], Any]],
+        convert: Optional[Callable[[Any], Any]],
+        stop: threading.Event
+) -> None:
+    while not stop.is_set():
+        try:
+            source, entries = tasks.get_nowait()
+        except queue.Empty:
+            return
+        _run(source, key, sort_key, convert, entries, stop)
+
+
+def _arrivals(shared: 'queue.Queue[Tuple[Any, Any, Any]]', running: int) -> Iterator[Tuple[Any, Hashable, Any]]:
+    while running:
+        entry = shared.get()
+        if entry[1] is _END:
+            if entry[2] is not None:
+                raise entry[2]
+            running -= 1
+            continue
+        yield entry
+
+
+def _drain(own: 'queue.Queue[Tuple[Any, Any, Any]]') -> Iterator[Tuple[Any, Hashable, Any]]:
+    while True:
+        entry = own.get()
+        if entry[1] is _END:
+            if entry[2] is not None:
+                raise entry[2]
+            return
+        yield entry
+
+
+class FanOut(Generic[T], Iterator[T]):
+    """
+    Runs sources concurrently and yields every item once per key.
+
+    Without sort_key items are yielded as they arrive, with up to concurrency sources running at a time.
+    With sort_key every source must already be sorted by it; all sources then run at once, each on its own
+    thread, and their items are merged into one sorted stream, so more sources than concurrency raise
+    ValueError. convert runs on the source threads. Each source is at most buffer
+    items ahead of the consumer.
+
+    Use it as a context manager or close() it when stopping early; an abandoned FanOut stops its threads once
+    it is garbage collected.
+    """
+    items: int
+    duplicates: int
+    __seen: Final[Set[Hashable]]
+    __queues: Final[List['queue.Queue[Tuple[Any, Any, Any]]']]
+    __stop: Final[threading.Event]
+    __threads: Optional[List[threading.Thread]]
+    __finalizer: Optional[weakref.finalize]
+    __items: Iterator[Tuple[Any, Hashable, T]]
+
+    def __init__(
+            self,
+            sources: Sequence[Callable[[], Iterable[Any]]],
+            key: Callable[[Any], Hashable],
+            sort_key: Optional[Callable[[Any], Any]] = None,
+            reverse: bool = False,
+            convert: Optional[Callable[[Any], T]] = None,
+            concurrency: int = 4,
+            buffer: int = 1000
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError(f'Expected concurrency >= 1; got {concurrency}')
+        self.items = 0
+        self.duplicates = 0
+        self.__seen = set()
+        self.__stop = threading.Event()
+        if sort_key is None:
+            shared = queue.Queue(maxsize=buffer)
+            self.__queues = [shared] * len(sources)
+            self.__items = _arrivals(shared, len(sources))
+        else:
+            # a merge needs the head of every source
+            if len(sources) > concurrency:
+                raise ValueError(f'Expected at most concurrency={concurrency} sources to merge; got {len(sources)}')
+            self.__queues = [queue.Queue(maxsize=buffer) for _ in sources]
+            self.__items = heapq.merge(
+                *(_drain(own) for own in self.__queues), key=lambda entry: entry[0], reverse=reverse)
+        if sources:
+            tasks = queue.SimpleQueue()
+            for i, source in enumerate(sources):
+                tasks.put((source, self.__queues[i]))
+            self.__threads = [
+                threading.Thread(
+                    target=_work, args=(tasks, key, sort_key, convert, self.__stop),
+                    name=f'hiro-fanout-{n}', daemon=True)
+                for n in range(min(concurrency, len(sources)))
+            ]
+            for thread in self.__threads:
+                thread.start()
+            self.__finalizer = weakref.finalize(self, self.__stop.set)
+        else:
+            self.__threads = None
+            self.__finalizer = None
+
+    def __iter__(self) -> 'FanOut[T]':
+        return self
+
+    def __next__(self) -> T:
+        while True:
+            try:
+                _, key, value = next(self.__items)
+            except BaseException:
+                # exhausted or a source failed
+                self.close()
+                raise
+            if key in self.__seen:
+                self.duplicates += 1
+                continue
+            self.__seen.add(key)
+            self.items += 1
+            return value
+
+    def close(self) -> None:
+        threads, self.__threads = self.__threads, None
+        if threads is None:
+            return
+        self.__finalizer.detach()
+        self.__stop.set()
+        for thread in threads:
+            thread.join()
+
+    def __enter__(self) -> 'FanOut[T]':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
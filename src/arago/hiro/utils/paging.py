@@ -0,0 +1,130 @@
+import time
+from dataclasses import dataclass
+from typing import TypeVar, Generic, Optional, Callable, Iterable, Iterator, Any, Final, List, Tuple
+
+from arago.hiro.utils.bulk import BulkRun, BulkStats
+
+T = TypeVar('T')
+P = TypeVar('P')
+
+
+class PagedRun(Generic[T], Iterator[T]):
+    """
+    Fetches pages with up to concurrency threads and yields their items in page order.
+
+    At most window pages are in flight or waiting in the reorder buffer. stats holds one latency per page;
+    the first failed page stops the run and its error is raised.
+    """
+    __run: Final[BulkRun]
+    __items: Iterator[T]
+    items: int
+
+    def __init__(
+            self,
+            fetch: Callable[[P], Iterable[T]],
+            pages: Iterable[P],
+            concurrency: int = 4,
+            window: Optional[int] = None
+    ) -> None:
+        self.__run = BulkRun(lambda page: list(fetch(page)), pages, concurrency, window)
+        self.__items = iter(())
+        self.items = 0
+
+    @property
+    def stats(self) -> BulkStats:
+        return self.__run.stats
+
+    def __iter__(self) -> 'PagedRun[T]':
+        return self
+
+    def __next__(self) -> T:
+        while True:
+            item = next(self.__items, self)
+            if item is not self:
+                self.items += 1
+                return item
+            result = next(self.__run)
+            if result.error is not None:
+                self.close()
+                raise result.error
+            self.__items = iter(result.value)
+
+    def close(self) -> None:
+        self.__run.close()
+
+    def __enter__(self) -> 'PagedRun[T]':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class _Missing:
+    __slots__ = ('keys',)
+
+    def __init__(self, keys: List[Any]) -> None:
+        self.keys = keys
+
+
+@dataclass(frozen=True)
+class LookupFailure(Generic[P]):
+    chunk: P
+    error: BaseException
+    attempts: int
+
+
+class LookupRun(PagedRun[T]):
+    """
+    PagedRun over chunks of keys whose fetch returns the items found and the keys not found.
+
+    A chunk whose fetch fails is retried up to retries times, waiting retry_delay seconds doubled after
+    every attempt; if it still fails, the run goes on with the other chunks. missing collects the keys not
+    found and failed the chunks given up on with their last error, in chunk order, as far as the run has
+    been consumed.
+    """
+    missing: Final[List[Any]]
+    failed: Final[List[LookupFailure]]
+
+    def __init__(
+            self,
+            fetch: Callable[[P], Tuple[List[T], List[Any]]],
+            chunks: Iterable[P],
+            concurrency: int = 4,
+            window: Optional[int] = None,
+            retries: int = 2,
+            retry_delay: float = 0.5
+    ) -> None:
+        if retries < 0:
+            raise ValueError(f'Expected retries >= 0; got {retries}')
+
+        def fetch_page(chunk: P) -> List[Any]:
+            attempt = 0
+            while True:
+                attempt += 1
+                try:
+                    items, missing = fetch(chunk)
+                except Exception as e:
+                    if attempt > retries:
+                        return [LookupFailure(chunk, e, attempt)]
+                    time.sleep(retry_delay * 2 ** (attempt - 1))
+                    continue
+                return items + [_Missing(missing)] if missing else items
+
+        super().__init__(fetch_page, chunks, concurrency, window)
+        self.missing = []
+        self.failed = []
+
+    def __next__(self) -> T:
+        while True:
+            item = super().__next__()
+            if isinstance(item, _Missing):
+                self.items -= 1
+                self.missing.extend(item.keys)
+            elif isinstance(item, LookupFailure):
+                self.items -= 1
+                self.failed.append(item)
+            else:
+                return item
+
+    def __iter__(self) -> 'LookupRun[T]':
+        return self
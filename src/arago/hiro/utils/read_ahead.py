@@ -0,0 +1,171 @@
+import contextvars
+import queue
+import threading
+import time
+from typing import TypeVar, Generic, Optional, Iterable, Iterator, Any, Final, Tuple
+
+T = TypeVar('T')
+
+_END: Final = object()
+
+
+class _Stop(Exception):
+    pass
+
+
+class ReadAheadStats:
+    streams: int
+    items: int
+    max_depth: int
+    consumer_wait: float  # seconds the consumer waited for the next item
+    producer_wait: float  # seconds decoding was paused on a full queue
+    __lock: Final[threading.Lock]
+
+    def __init__(self) -> None:
+        self.streams = 0
+        self.items = 0
+        self.max_depth = 0
+        self.consumer_wait = 0.0
+        self.producer_wait = 0.0
+        self.__lock = threading.Lock()
+
+    def add(self, stream: 'ReadAheadIterator') -> None:
+        with self.__lock:
+            self.streams += 1
+            self.items += stream.items
+            self.max_depth = max(self.max_depth, stream.max_depth)
+            self.consumer_wait += stream.consumer_wait
+            self.producer_wait += stream.producer_wait
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(streams={self.streams}, items={self.items}, max_depth={self.max_depth}, ' \
+               f'consumer_wait={self.consumer_wait:.3f}s, producer_wait={self.producer_wait:.3f}s)'
+
+
+class ReadAheadIterator(Generic[T], Iterator[T]):
+    """
+    Pulls items on a background thread into a queue of up to depth items, so that reading and decoding
+    overlap with the consumer's work.
+
+    consumer_wait growing means the source is the bottleneck, producer_wait growing means the consumer is.
+    """
+    items: int
+    max_depth: int
+    consumer_wait: float
+    producer_wait: float
+    __queue: Final['queue.Queue[Tuple[Any, Optional[BaseException]]]']
+    __stop: Final[threading.Event]
+    __stats: Final[Optional[ReadAheadStats]]
+    __thread: Optional[threading.Thread]
+
+    def __init__(self, items: Iterable[T], depth: int = 1000, stats: Optional[ReadAheadStats] = None) -> None:
+        if depth < 1:
+            raise ValueError(f'Expected depth >= 1; got {depth}')
+        self.items = 0
+        self.max_depth = 0
+        self.consumer_wait = 0.0
+        self.producer_wait = 0.0
+        self.__queue = queue.Queue(maxsize=depth)
+        self.__stop = threading.Event()
+        self.__stats = stats
+        # the source runs with the caller's context variables
+        context = contextvars.copy_context()
+        self.__thread = threading.Thread(
+            target=context.run, args=(self.__run, items), name='hiro-read-ahead', daemon=True)
+        self.__thread.start()
+
+    @property
+    def depth(self) -> int:
+        return self.__queue.qsize()
+
+    def __put(self, entry: Tuple[Any, Optional[BaseException]]) -> None:
+        try:
+            self.__queue.put_nowait(entry)
+            return
+        except queue.Full:
+            pass
+        start = time.perf_counter()
+        try:
+            while True:
+                if self.__stop.is_set():
+                    raise _Stop()
+                try:
+                    self.__queue.put(entry, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+        finally:
+            self.producer_wait += time.perf_counter() - start
+
+    def __run(self, items: Iterable[T]) -> None:
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                self.__put((item, None))
+            self.__put((_END, None))
+        except _Stop:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                # release the connection of an abandoned response
+                close()
+        except BaseException as e:
+            try:
+                self.__put((_END, e))
+            except _Stop:
+                pass
+
+    def __iter__(self) -> 'ReadAheadIterator[T]':
+        return self
+
+    def __next__(self) -> T:
+        if self.__thread is None:
+            raise StopIteration
+        try:
+            item, error = self.__queue.get_nowait()
+        except queue.Empty:
+            start = time.perf_counter()
+            item, error = self.__queue.get()
+            self.consumer_wait += time.perf_counter() - start
+        if item is _END:
+            self.close()
+            if error is not None:
+                raise error
+            raise StopIteration
+        self.items += 1
+        # depth before this item was taken
+        self.max_depth = max(self.max_depth, self.__queue.qsize() + 1)
+        return item
+
+    def close(self) -> None:
+        thread, self.__thread = self.__thread, None
+        if thread is None:
+            return
+        # a producer blocked on the network notices the stop once its next item arrives
+        self.__stop.set()
+        if self.__stats is not None:
+            self.__stats.add(self)
+
+    def __enter__(self) -> 'ReadAheadIterator[T]':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class ReadAhead:
+    """
+    Opt-in background decoding of search and graph results: vertices are read, parsed and built on a
+    thread per result while the consumer works on the previous ones. stats sums up all finished results.
+    Enable it with `client.read_ahead = ReadAhead()`.
+    """
+    depth: Final[int]
+    stats: Final[ReadAheadStats]
+
+    def __init__(self, depth: int = 1000) -> None:
+        if depth < 1:
+            raise ValueError(f'Expected depth >= 1; got {depth}')
+        self.depth = depth
+        self.stats = ReadAheadStats()
+
+    def wrap(self, items: Iterable[T]) -> ReadAheadIterator[T]:
+        return ReadAheadIterator(items, self.depth, self.stats)
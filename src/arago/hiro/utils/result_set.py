@@ -0,0 +1,219 @@
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import weakref
+from array import array
+from typing import TypeVar, Generic, Optional, Iterable, Iterator, List, Any, Final, Sequence, Union, BinaryIO, \
+    TYPE_CHECKING, overload
+
+from arago.hiro.utils.serialization import bind_client, bound_client
+
+if TYPE_CHECKING:
+    from arago.hiro.client.rest_base_client import HiroRestBaseClient
+
+T = TypeVar('T')
+
+
+def _remove(file: BinaryIO, path: str) -> None:
+    file.close()
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class ResultSet(Generic[T], Sequence[T]):
+    """
+    Re-iterable result of a query: the first memory_items items are kept in memory, the rest are pickled
+    to a temporary file in spill_dir and read back on demand.
+
+    items is consumed lazily, as far as iteration, indexing or len() need it, so a result is fetched once
+    however often it is read. Spilled items are unpickled afresh on every access; spilled vertices are bound
+    to client. Slices return lists. close() removes the spill file.
+
+        vertices = client.model.search.index_result_set(query)
+    """
+    memory_items: Final[int]
+    __source: Optional[Iterator[T]]
+    __error: Optional[BaseException]
+    __memory: Final[List[T]]
+    __offsets: Final[array]  # spill file position of every spilled item
+    __flushed: int
+    __spill_dir: Final[Optional[str]]
+    __file: Optional[BinaryIO]
+    __path: Optional[str]
+    __finalizer: Optional[weakref.finalize]
+    __client: Final[Optional['HiroRestBaseClient']]
+    __lock: Final[threading.RLock]
+
+    def __init__(
+            self,
+            items: Iterable[T],
+            memory_items: int = 10000,
+            spill_dir: Optional[str] = None,
+            client: Optional['HiroRestBaseClient'] = None
+    ) -> None:
+        if memory_items < 0:
+            raise ValueError(f'Expected memory_items >= 0; got {memory_items}')
+        self.memory_items = memory_items
+        self.__source = iter(items)
+        self.__error = None
+        self.__memory = []
+        self.__offsets = array('Q')
+        self.__flushed = 0
+        self.__spill_dir = spill_dir
+        self.__file = None
+        self.__path = None
+        self.__finalizer = None
+        self.__client = client.root if client is not None else None
+        self.__lock = threading.RLock()
+
+    @property
+    def complete(self) -> bool:
+        return self.__source is None
+
+    @property
+    def spilled(self) -> int:
+        return len(self.__offsets)
+
+    @property
+    def __count(self) -> int:
+        return len(self.__memory) + len(self.__offsets)
+
+    def __spill(self, item: T) -> None:
+        if self.__file is None:
+            fd, self.__path = tempfile.mkstemp(prefix='hiro-result-', suffix='.pickle', dir=self.__spill_dir)
+            self.__file = os.fdopen(fd, 'w+b')
+            # the file goes with the result set, even if close() is never called
+            self.__finalizer = weakref.finalize(self, _remove, self.__file, self.__path)
+        self.__offsets.append(self.__file.tell())
+        self.__file.write(pickle.dumps(item, pickle.HIGHEST_PROTOCOL))
+
+    def __fill(self, index: int) -> bool:
+        """
+        Read items up to index; False if the result has fewer items.
+        """
+        with self.__lock:
+            while self.__count <= index and self.__source is not None:
+                try:
+                    item = next(self.__source)
+                except StopIteration:
+                    self.__source = None
+                    break
+                except BaseException as e:
+                    # the source is done for; a result set that silently ended early would be wrong
+                    self.__source = None
+                    self.__error = e
+                    raise
+                if len(self.__memory) < self.memory_items:
+                    self.__memory.append(item)
+                else:
+                    self.__spill(item)
+            if self.__error is not None and self.__count <= index:
+                raise self.__error
+            return index < self.__count
+
+    def __flush(self, index: int) -> None:
+        # called with the lock held
+        spilled = index - len(self.__memory)
+        if spilled >= self.__flushed:
+            self.__file.flush()
+            self.__flushed = len(self.__offsets)
+
+    def __load(self, file: BinaryIO) -> T:
+        if self.__client is None:
+            return pickle.load(file)
+        token = bind_client(self.__client)
+        try:
+            return pickle.load(file)
+        finally:
+            bound_client.reset(token)
+
+    def __read(self, index: int) -> T:
+        if index < len(self.__memory):
+            return self.__memory[index]
+        with self.__lock:
+            self.__flush(index)
+            file = self.__file
+            end = file.tell()
+            file.seek(self.__offsets[index - len(self.__memory)])
+            try:
+                return self.__load(file)
+            finally:
+                file.seek(end)
+
+    def __iter__(self) -> Iterator[T]:
+        index = 0
+        reader = None
+        try:
+            while self.__fill(index):
+                if index < len(self.__memory):
+                    item = self.__memory[index]
+                else:
+                    with self.__lock:
+                        self.__flush(index)
+                        if reader is None:
+                            # sequential reads of the spill file, through a handle of our own
+                            reader = open(self.__path, 'rb')
+                            reader.seek(self.__offsets[index - len(self.__memory)])
+                    item = self.__load(reader)
+                yield item
+                index += 1
+        finally:
+            if reader is not None:
+                reader.close()
+
+    def __len__(self) -> int:
+        self.__fill(sys.maxsize)
+        return self.__count
+
+    @overload
+    def __getitem__(self, index: int) -> T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        if isinstance(index, slice):
+            start, stop, step = index.start, index.stop, index.step
+            if all(i is None or i >= 0 for i in (start, stop)) and (step is None or step > 0) and stop is not None:
+                # a forward slice only reads as far as it reaches
+                if stop > 0:
+                    self.__fill(stop - 1)
+                stop = min(stop, self.__count)
+                return [self.__read(i) for i in range(start or 0, stop, step or 1)]
+            return [self.__read(i) for i in range(*index.indices(len(self)))]
+        if not isinstance(index, int):
+            raise TypeError(type(index))
+        if index < 0:
+            index += len(self)
+        if index < 0 or not self.__fill(index):
+            raise IndexError('ResultSet index out of range')
+        return self.__read(index)
+
+    def close(self) -> None:
+        """
+        Stop reading the source and remove the spill file; read items in memory stay available.
+        """
+        with self.__lock:
+            source, self.__source = self.__source, None
+            close = getattr(source, 'close', None)
+            if close is not None:
+                # release the connection of an abandoned response
+                close()
+            del self.__offsets[:]
+            self.__flushed = 0
+            self.__file = None
+            if self.__finalizer is not None:
+                self.__finalizer()
+                self.__finalizer = None
+
+    def __enter__(self) -> 'ResultSet[T]':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,256 @@
+import base64
+import json
+import queue
+import threading
+import weakref
+from dataclasses import dataclass, field, replace, asdict
+from typing import TypeVar, Generic, Optional, Callable, Iterator, List, Tuple, Any, Final
+
+T = TypeVar('T')
+
+
+@dataclass(frozen=True)
+class ScanPartition:
+    lower: Optional[int] = field(default=None)  # key range start in ms, inclusive
+    upper: Optional[int] = field(default=None)  # key range end in ms, exclusive
+    last_on: Optional[int] = field(default=None)
+    last_id: Optional[str] = field(default=None)
+    done: bool = field(default=False)
+
+
+@dataclass(frozen=True)
+class ScanCursor:
+    """
+    Position of a scan: the last emitted key of every partition. token() survives a process restart.
+    """
+    query: str
+    key: str
+    partitions: Tuple[ScanPartition, ...]
+
+    @property
+    def done(self) -> bool:
+        return all(p.done for p in self.partitions)
+
+    def token(self) -> str:
+        data = {'query': self.query, 'key': self.key, 'partitions': [asdict(p) for p in self.partitions]}
+        return base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def from_token(token: str) -> 'ScanCursor':
+        data = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        partitions = tuple(ScanPartition(**p) for p in data['partitions'])
+        return ScanCursor(data['query'], data['key'], partitions)
+
+
+def split_range(start: int, end: int, partitions: int) -> Tuple[ScanPartition, ...]:
+    if partitions < 1:
+        raise ValueError(f'Expected partitions >= 1; got {partitions}')
+    if end <= start:
+        raise ValueError(f'Expected end > start; got {start}..{end}')
+    step = -(-(end - start) // partitions)
+    return tuple(ScanPartition(lower, min(lower + step, end)) for lower in range(start, end, step))
+
+
+class _Stop(Exception):
+    pass
+
+
+# the workers are daemon threads holding no reference to their Scan: an abandoned scan is collected and
+# stops them, and one still referenced does not keep the interpreter from exiting
+
+def _put(
+        entries: 'queue.Queue[Tuple[int, Any, Optional[ScanPartition]]]',
+        stop: threading.Event,
+        entry: Tuple[int, Any, Optional[ScanPartition]]
+) -> None:
+    while True:
+        if stop.is_set():
+            raise _Stop()
+        try:
+            entries.put(entry, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+
+def _run(
+        fetch: Callable[[ScanPartition], List[T]],
+        key_of: Callable[[T], Tuple[Optional[int], str]],
+        page_size: int,
+        entries: 'queue.Queue[Tuple[int, Any, Optional[ScanPartition]]]',
+        stop: threading.Event,
+        index: int,
+        partition: ScanPartition
+) -> None:
+    try:
+        while not partition.done:
+            if stop.is_set():
+                raise _Stop()
+            items = fetch(partition)
+            if items:
+                last_on, last_id = key_of(items[-1])
+                partition = replace(partition, last_on=last_on, last_id=last_id)
+            partition = replace(partition, done=len(items) < page_size)
+            _put(entries, stop, (index, items, partition))
+        _put(entries, stop, (index, None, None))
+    except _Stop:
+        pass
+    except BaseException as e:
+        try:
+            _put(entries, stop, (index, e, None))
+        except _Stop:
+            pass
+
+
+def _work(
+        tasks: 'queue.SimpleQueue[Tuple[int, ScanPartition]]',
+        fetch: Callable[[ScanPartition], List[T]],
+        key_of: Callable[[T], Tuple[Optional[int], str]],
+        page_size: int,
+        entries: 'queue.Queue[Tuple[int, Any, Optional[ScanPartition]]]',
+        stop: threading.Event
+) -> None:
+    while not stop.is_set():
+        try:
+            index, partition = tasks.get_nowait()
+        except queue.Empty:
+            return
+        _run(fetch, key_of, page_size, entries, stop, index, partition)
+
+
+class Scan(Generic[T], Iterator[T]):
+    """
+    Runs the partitions of a cursor with up to concurrency threads and yields their items as pages arrive.
+
+    Items of one partition keep their key order; partitions are interleaved. At most window pages are
+    buffered. cursor is advanced with every emitted item, so a scan resumed from cursor.token() continues
+    right after the last item the consumer received.
+
+    Use it as a context manager or close() it when stopping early; an abandoned scan stops its threads once
+    it is garbage collected. A managed scan starts fetching only when entered as a context manager and
+    refuses to be iterated otherwise.
+    """
+    page_size: Final[int]
+    pages: int
+    items: int
+    __key_of: Final[Callable[[T], Tuple[Optional[int], str]]]
+    __query: Final[str]
+    __key: Final[str]
+    __partitions: Final[List[ScanPartition]]
+    __queue: Final['queue.Queue[Tuple[int, Any, Optional[ScanPartition]]]']
+    __stop: Final[threading.Event]
+    __threads: Optional[List[threading.Thread]]
+    __finalizer: Optional[weakref.finalize]
+    __started: bool
+    __running: int
+    __page: Iterator[T]
+    __page_index: int
+    __page_next: Optional[ScanPartition]
+
+    def __init__(
+            self,
+            fetch: Callable[[ScanPartition], List[T]],
+            key_of: Callable[[T], Tuple[Optional[int], str]],
+            cursor: ScanCursor,
+            page_size: int,
+            concurrency: int = 4,
+            window: Optional[int] = None,
+            managed: bool = False
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError(f'Expected concurrency >= 1; got {concurrency}')
+        self.page_size = page_size
+        self.pages = 0
+        self.items = 0
+        self.__key_of = key_of
+        self.__query = cursor.query
+        self.__key = cursor.key
+        self.__partitions = list(cursor.partitions)
+        self.__queue = queue.Queue(maxsize=window if window is not None else concurrency * 2)
+        self.__stop = threading.Event()
+        self.__page = iter(())
+        self.__page_index = -1
+        self.__page_next = None
+        pending = [i for i, p in enumerate(self.__partitions) if not p.done]
+        self.__running = len(pending)
+        if pending:
+            tasks = queue.SimpleQueue()
+            for i in pending:
+                tasks.put((i, self.__partitions[i]))
+            self.__threads = [
+                threading.Thread(
+                    target=_work, args=(tasks, fetch, key_of, page_size, self.__queue, self.__stop),
+                    name=f'hiro-scan-{n}', daemon=True)
+                for n in range(min(concurrency, len(pending)))
+            ]
+        else:
+            self.__threads = None
+        self.__finalizer = None
+        self.__started = False
+        if not managed:
+            self.__start()
+
+    def __start(self) -> None:
+        if self.__started:
+            return
+        self.__started = True
+        if self.__threads is not None:
+            for thread in self.__threads:
+                thread.start()
+            self.__finalizer = weakref.finalize(self, self.__stop.set)
+
+    @property
+    def cursor(self) -> ScanCursor:
+        return ScanCursor(self.__query, self.__key, tuple(self.__partitions))
+
+    def __iter__(self) -> 'Scan[T]':
+        return self
+
+    def __next__(self) -> T:
+        if not self.__started:
+            raise RuntimeError('Expected a managed scan to be entered with a with statement before iterating')
+        while True:
+            item = next(self.__page, self)
+            if item is not self:
+                last_on, last_id = self.__key_of(item)
+                i = self.__page_index
+                self.__partitions[i] = replace(self.__partitions[i], last_on=last_on, last_id=last_id)
+                self.items += 1
+                return item
+            if self.__page_next is not None:
+                # the page is through; this also records a partition running out
+                self.__partitions[self.__page_index] = self.__page_next
+                self.__page_next = None
+            if self.__running == 0:
+                self.close()
+                raise StopIteration
+            index, value, partition = self.__queue.get()
+            if isinstance(value, BaseException):
+                self.close()
+                raise value
+            if value is None:
+                self.__running -= 1
+                continue
+            self.pages += 1
+            self.__page = iter(value)
+            self.__page_index = index
+            self.__page_next = partition
+
+    def close(self) -> None:
+        """
+        Stop fetching; the cursor keeps the position of the last emitted item.
+        """
+        threads, self.__threads = self.__threads, None
+        if threads is None or not self.__started:
+            return
+        self.__finalizer.detach()
+        self.__stop.set()
+        for thread in threads:
+            thread.join()
+
+    def __enter__(self) -> 'Scan[T]':
+        self.__start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
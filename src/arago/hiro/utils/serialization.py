@@ -0,0 +1,30 @@
+import pickle
+from contextvars import ContextVar, Token
+from typing import Any, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from arago.hiro.client.rest_base_client import HiroRestBaseClient
+
+# Model objects drop their client when pickled and pick up the client bound here when unpickled.
+bound_client: ContextVar[Optional['HiroRestBaseClient']] = ContextVar('bound_client', default=None)
+
+
+def bind_client(client: Optional['HiroRestBaseClient']) -> Token:
+    """
+    Bind client to unpickled model objects of the current context, e.g. in a process pool initializer.
+    """
+    return bound_client.set(client.root if client is not None else None)
+
+
+def dumps(obj: Any, protocol: int = pickle.HIGHEST_PROTOCOL) -> bytes:
+    return pickle.dumps(obj, protocol)
+
+
+def loads(data: bytes, client: Optional['HiroRestBaseClient'] = None) -> Any:
+    if client is None:
+        return pickle.loads(data)
+    token = bind_client(client)
+    try:
+        return pickle.loads(data)
+    finally:
+        bound_client.reset(token)
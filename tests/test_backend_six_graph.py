@@ -178,6 +178,25 @@ class TestClassGraphVertexGet:
         assert isinstance(res, Vertex)
         pass
 
+    def test_cached(self, client: HiroClient):
+        from arago.hiro.backend.six.graph import Hiro6GraphModel
+        from arago.hiro.client.vertex_cache import VertexCache
+        graph = Hiro6GraphModel(client)
+        client.vertex_cache = cache = VertexCache(ttl=60)
+        try:
+            vertex = graph.vertex.create(OgitEntity.OGIT_COMMENT)
+            res_a = graph.vertex.get(vertex.id)
+            res_b = graph.vertex.get(vertex.id)
+            assert res_a == res_b
+            assert 1 == cache.stats.hits
+            graph.vertex.update(vertex.id, {OgitAttribute.OGIT_CONTENT: 'foo'})
+            assert 'foo' == graph.vertex.get(vertex.id)[OgitAttribute.OGIT_CONTENT]
+            graph.vertex.delete(vertex.id)
+            print(cache.stats)
+        finally:
+            client.vertex_cache = None
+        pass
+
 
 class TestClassGraphVertexUpdate:
     def test_vertex_update_model(self, client: HiroClient):
@@ -199,6 +218,47 @@ class TestClassGraphVertexDelete:
         pass
 
 
+class TestClassGraphVertexBulk:
+    def test_vertex_bulk_model(self, client: HiroClient):
+        from arago.hiro.backend.six.graph import Hiro6GraphModel
+        graph = Hiro6GraphModel(client)
+        xids = [uuid() for _ in range(20)]
+        run = graph.vertex.bulk_create(
+            ({OgitAttribute.OGIT__TYPE: OgitEntity.OGIT_COMMENT, OgitAttribute.OGIT__XID: xid} for xid in xids),
+            concurrency=4
+        )
+        created = run.values()
+        assert xids == [v.xid for v in created]
+        print(run.stats)
+        updated = graph.vertex.bulk_update(
+            (v.id, {OgitAttribute.OGIT_CONTENT: 'foo'}) for v in created
+        ).values()
+        assert [v.id for v in created] == [v.id for v in updated]
+        run = graph.vertex.bulk_delete(v.id for v in created)
+        assert all(r.ok for r in run)
+        print(run.stats)
+        pass
+
+
+class TestClassGraphVertexUpsert:
+    def test_vertex_upsert_model(self, client: HiroClient):
+        from arago.hiro.backend.six.graph import Hiro6GraphModel
+        graph = Hiro6GraphModel(client)
+        xids = [uuid() for _ in range(10)]
+        existing = graph.vertex.create(OgitEntity.OGIT_COMMENT, {OgitAttribute.OGIT__XID: xids[0]})
+        run = graph.vertex.upsert({
+            OgitAttribute.OGIT__TYPE: OgitEntity.OGIT_COMMENT,
+            OgitAttribute.OGIT__XID: xid,
+            OgitAttribute.OGIT_CONTENT: 'foo',
+        } for xid in xids)
+        res = run.values()
+        assert existing.id == res[0].id
+        assert xids == [v.xid for v in res]
+        assert all(client.xid_cache.get(xid) == v.id for xid, v in zip(xids, res))
+        graph.vertex.bulk_delete(res).values()
+        pass
+
+
 class TestClassGraphVertexHistory:
     def test_vertex_history_model_element(self, client: HiroClient):
         from arago.hiro.backend.six.graph import Hiro6GraphModel
@@ -241,6 +301,28 @@ class TestClassGraphVertexHistory:
         assert isinstance(key, Attribute)
         pass
 
+    def test_vertex_history_stored(self, client: HiroClient):
+        from arago.hiro.backend.six.graph import Hiro6GraphModel
+        from arago.hiro.client.version_store import VersionStore
+        graph = Hiro6GraphModel(client)
+        client.version_store = store = VersionStore()
+        try:
+            vertex = graph.vertex.create(OgitEntity.OGIT_COMMENT)
+            graph.vertex.update(vertex.id, {OgitAttribute.OGIT_CONTENT: 'foo'})
+            res_1 = list(graph.vertex.history(vertex))
+            assert store.watermark(vertex.id, HistoryFormat.ELEMENT.value) is not None
+            graph.vertex.update(vertex.id, {OgitAttribute.OGIT_CONTENT: 'bar'})
+            res_2 = list(graph.vertex.history(vertex))
+            assert len(res_1) + 1 == len(res_2)
+            old = res_2[-2]
+            res_3 = graph.vertex.get(vertex.id, v_id=old.v_id)
+            assert old.v == res_3.v
+            graph.vertex.delete(vertex.id)
+        finally:
+            client.version_store = None
+            store.close()
+        pass
+
 
 class TestClassGraphEdgeCreate:
     def test_edge_create_model(self, client: HiroClient):
@@ -253,6 +335,22 @@ class TestClassGraphEdgeCreate:
         pass
 
 
+class TestClassGraphEdgeBulkCreate:
+    def test_edge_bulk_create_model(self, client: HiroClient):
+        from arago.hiro.backend.six.graph import Hiro6GraphModel
+        graph = Hiro6GraphModel(client)
+        vertex_a = graph.vertex.create(OgitEntity.OGIT_ATTACHMENT)
+        vertices_b = [graph.vertex.create(OgitEntity.OGIT_COMMENT) for _ in range(5)]
+        edges = [(vertex_a, OgitVerb.OGIT_BELONGS, vertex_b) for vertex_b in vertices_b]
+        res = graph.edge.bulk_create(edges + edges).values()
+        assert 10 == len(res)
+        assert all(isinstance(edge, Edge) for edge in res)
+        run = graph.edge.bulk_create(edges, fetch_existing=True)
+        assert all(r.ok for r in run)
+        print(run.stats)
+        pass
+
+
 class TestClassGraphEdgeDelete:
     def test_edge_delete_model(self, client: HiroClient):
         from arago.hiro.backend.six.graph import Hiro6GraphModel
@@ -0,0 +1,171 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from arago.hiro.backend.six.graph import Hiro6GraphEdgeModel
+from arago.hiro.client.exception import HiroClientError
+from arago.hiro.model.graph.edge import make_edge_id
+from arago.hiro.utils.bulk import BulkRun
+from arago.hiro.utils.paging import PagedRun, LookupRun
+
+
+class TestClassBulkRun:
+    def test_order_and_errors(self):
+        def fn(i: int) -> int:
+            time.sleep((10 - i % 10) / 1000)
+            if i == 7:
+                raise ValueError(i)
+            return i * 2
+
+        run = BulkRun(fn, range(50), concurrency=8)
+        results = list(run)
+        assert list(range(50)) == [r.index for r in results]
+        assert [i * 2 for i in range(50) if i != 7] == [r.value for r in results if r.ok]
+        assert isinstance(results[7].error, ValueError)
+        assert 50 == run.stats.count
+        assert 1 == run.stats.errors
+        assert run.stats.percentile(50) <= run.stats.percentile(99)
+        print(run.stats)
+
+    def test_window(self):
+        pulled = 0
+        lock = threading.Lock()
+
+        def items():
+            nonlocal pulled
+            for i in range(1000):
+                with lock:
+                    pulled += 1
+                yield i
+
+        run = BulkRun(lambda i: i, items(), concurrency=2, window=4)
+        next(run)
+        assert pulled <= 5
+        run.close()
+        assert [] == list(run)
+
+    def test_values_raises(self):
+        def fn(i: int) -> int:
+            if i == 3:
+                raise KeyError(i)
+            return i
+
+        with pytest.raises(KeyError):
+            BulkRun(fn, range(10)).values()
+
+
+class TestClassPagedRun:
+    def test_page_order(self):
+        def fetch(offset: int) -> range:
+            # later pages finish first
+            time.sleep((100 - offset) / 10000)
+            return range(offset, min(offset + 10, 95))
+
+        with PagedRun(fetch, range(0, 95, 10), concurrency=4) as run:
+            assert list(range(95)) == list(run)
+        assert 10 == run.stats.count
+        assert 95 == run.items
+
+    def test_error_stops(self):
+        def fetch(offset: int) -> range:
+            if offset == 20:
+                raise ValueError(offset)
+            return range(offset, offset + 10)
+
+        run = PagedRun(fetch, range(0, 100, 10), concurrency=2)
+        items = []
+        with pytest.raises(ValueError):
+            for item in run:
+                items.append(item)
+        assert list(range(20)) == items
+
+
+class TestClassLookupRun:
+    def test_missing(self):
+        known = {i: f'v{i}' for i in range(0, 50, 2)}
+
+        def fetch(chunk: list):
+            return [known[i] for i in chunk if i in known], [i for i in chunk if i not in known]
+
+        chunks = [list(range(i, i + 10)) for i in range(0, 50, 10)]
+        with LookupRun(fetch, chunks, concurrency=3) as run:
+            assert [f'v{i}' for i in range(0, 50, 2)] == list(run)
+        assert list(range(1, 50, 2)) == run.missing
+        assert 25 == run.items
+
+    def test_failed_chunk(self):
+        attempts = {}
+        lock = threading.Lock()
+
+        def fetch(chunk: list):
+            with lock:
+                attempts[chunk[0]] = attempts.get(chunk[0], 0) + 1
+                n = attempts[chunk[0]]
+            if chunk[0] == 10 or (chunk[0] == 30 and n == 1):
+                raise ConnectionError(chunk[0])
+            return [f'v{i}' for i in chunk], []
+
+        chunks = [list(range(i, i + 10)) for i in range(0, 50, 10)]
+        with LookupRun(fetch, chunks, concurrency=3, retries=1, retry_delay=0.01) as run:
+            items = list(run)
+        assert [f'v{i}' for i in [*range(0, 10), *range(20, 50)]] == items
+        assert 40 == run.items
+        assert [list(range(10, 20))] == [failure.chunk for failure in run.failed]
+        assert isinstance(run.failed[0].error, ConnectionError)
+        assert 2 == run.failed[0].attempts
+        assert 2 == attempts[30]
+
+
+class FakeEdgeData:
+    def __init__(self, fail=(), conflict=()) -> None:
+        self.fail = set(fail)
+        self.conflict = set(conflict)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def create(self, out_vertex_id, edge_type, in_vertex_id):
+        with self.lock:
+            self.calls.append(out_vertex_id)
+        # slow enough for duplicates to arrive while the first attempt is in flight
+        time.sleep(0.05)
+        if out_vertex_id in self.fail:
+            raise HiroClientError('bad request', status_code=400)
+        if out_vertex_id in self.conflict:
+            raise HiroClientError('edge already exists', status_code=409)
+        return {
+            'ogit/_id': make_edge_id(out_vertex_id, edge_type, in_vertex_id),
+            'ogit/_type': edge_type,
+            'ogit/_out-id': out_vertex_id,
+            'ogit/_in-id': in_vertex_id,
+        }
+
+
+def edge_model(data: FakeEdgeData) -> Hiro6GraphEdgeModel:
+    model = Hiro6GraphEdgeModel.__new__(Hiro6GraphEdgeModel)
+    model._Hiro6GraphEdgeModel__data_client = data
+    model._Hiro6GraphEdgeModel__base_client = SimpleNamespace(root=SimpleNamespace(model=SimpleNamespace(search=None)))
+    return model
+
+
+class TestClassEdgeBulkCreate:
+    def test_dedupe(self):
+        data = FakeEdgeData(conflict=('c',))
+        edges = [('a', 'ogit/relates', 'x'), ('a', 'ogit/relates', 'x'), ('b', 'ogit/relates', 'x'),
+                 ('c', 'ogit/relates', 'x')]
+        existing = [make_edge_id('b', 'ogit/relates', 'x')]
+        results = list(edge_model(data).bulk_create(edges, existing=existing, concurrency=4))
+        assert all(r.ok for r in results)
+        assert ['a', 'c'] == sorted(data.calls)
+        assert [make_edge_id(*edge) for edge in edges] == [str(r.value.id) for r in results]
+
+    def test_duplicate_shares_failure(self):
+        data = FakeEdgeData(fail=('a',))
+        edges = [('a', 'ogit/relates', 'x'), ('a', 'ogit/relates', 'x'), ('b', 'ogit/relates', 'x')]
+        results = list(edge_model(data).bulk_create(edges, concurrency=4))
+        assert ['a', 'b'] == sorted(data.calls)
+        assert isinstance(results[0].error, HiroClientError)
+        # the copy is not reported as created
+        assert results[1].error is results[0].error
+        assert results[2].ok
@@ -0,0 +1,284 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from arago.hiro.backend.six.graph import Hiro6GraphVertexModel
+from arago.hiro.client.query_cache import QueryCache, normalise_query
+from arago.hiro.client.version_store import VersionStore
+from arago.hiro.client.vertex_cache import VertexCache
+from arago.hiro.client.xid_cache import XidCache
+from arago.hiro.model.graph.vertex import ExternalVertexId, VertexId
+from arago.hiro.utils.cache import LruCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestClassLruCache:
+    def test_lru_eviction(self):
+        cache = LruCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert 1 == cache.get('a')
+        cache.put('c', 3)
+        assert 'b' not in cache
+        assert ['a', 'c'] == list(cache)
+        assert 1 == cache.stats.evictions
+
+    def test_ttl(self):
+        clock = Clock()
+        cache = LruCache(ttl=10, clock=clock)
+        cache.put('a', 1)
+        cache.put('b', 2, ttl=None)
+        clock.now = 11
+        assert (False, None) == cache.lookup('a')
+        assert (True, 2) == cache.lookup('b')
+        assert 1 == cache.stats.expirations
+
+    def test_single_flight(self):
+        cache = LruCache()
+        calls = []
+        barrier = threading.Event()
+
+        def loader(key: str) -> str:
+            calls.append(key)
+            barrier.wait()
+            return key.upper()
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('a', loader))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        barrier.set()
+        for thread in threads:
+            thread.join()
+        assert ['a'] == calls
+        assert ['A'] * 8 == results
+        assert 'A' == cache.get_or_load('a', loader)
+        assert 1 == cache.stats.loads
+
+    def test_load_error(self):
+        cache = LruCache()
+
+        def loader(key: str) -> str:
+            raise KeyError(key)
+
+        with pytest.raises(KeyError):
+            cache.get_or_load('a', loader)
+        assert 'a' not in cache
+
+
+class TestClassXidCache:
+    def test_negative_and_invalidate(self):
+        clock = Clock()
+        cache = XidCache(ttl=100, negative_ttl=1, clock=clock)
+        xid_a, xid_b = ExternalVertexId('a'), ExternalVertexId('b')
+        cache.put(xid_a, VertexId('id-a'))
+        cache.put_absent(xid_b)
+        assert (True, None) == cache.lookup(xid_b)
+        clock.now = 2
+        assert (False, None) == cache.lookup(xid_b)
+        assert cache.invalidate_id(VertexId('id-a'))
+        assert xid_a not in cache
+        assert not cache.invalidate_id(VertexId('id-a'))
+        print(cache.stats)
+
+
+class TestClassVertexCache:
+    def test_read_through(self):
+        clock = Clock()
+        cache = VertexCache(ttl=10, stale_ttl=10, clock=clock)
+        fetches = []
+
+        def fetch():
+            fetches.append(clock.now)
+            return {'ogit/_id': 'id-a', 'ogit/_v': len(fetches)}
+
+        key = cache.key('id', 'id-a', ['ogit/_v'])
+        assert 1 == cache.get_or_fetch(key, fetch)['ogit/_v']
+        assert 1 == cache.get_or_fetch(key, fetch)['ogit/_v']
+        assert 1 == len(fetches)
+
+        clock.now = 15
+        assert 1 == cache.get_or_fetch(key, fetch)['ogit/_v']
+        cache.close()
+        assert 2 == len(fetches)
+        assert 2 == cache.get_or_fetch(key, fetch)['ogit/_v']
+        assert 1 == cache.stats.stale_hits
+        assert 1 == cache.stats.refreshes
+
+        xid_key = cache.key('xid', 'xid-a')
+        cache.get_or_fetch(xid_key, lambda: [fetch()])
+        assert 2 == cache.invalidate_id('id-a')
+        assert key not in cache
+        assert xid_key not in cache
+        print(cache.stats)
+
+
+class TestClassQueryCache:
+    @staticmethod
+    def fetcher(items: list, calls: list):
+        def fetch():
+            calls.append(1)
+            return iter(items)
+
+        return fetch
+
+    def test_normalised_key(self):
+        assert 'a "x  y" b' == normalise_query(' a\n  "x  y"   b ')
+        key_a = QueryCache.key('index', {'query': '+a  +b', 'fields': 'x,y'})
+        key_b = QueryCache.key('index', {'fields': 'y,x', 'query': '+a +b'})
+        assert key_a == key_b
+        assert key_a != QueryCache.key('index', {'query': '+a +b', 'fields': 'x,y', 'limit': 1})
+
+    def test_hit_and_partial_read(self):
+        cache = QueryCache()
+        items = [{'ogit/_id': 'a', 'ogit/_type': 'ogit/Node'}, {'ogit/_id': 'b', 'ogit/_type': 'ogit/Node'}]
+        calls = []
+        key = cache.key('index', {'query': 'q'})
+        gen = cache.get_or_fetch(key, self.fetcher(items, calls))
+        next(gen)
+        gen.close()
+        # a result not read to the end is not kept
+        assert key not in cache
+        assert items == list(cache.get_or_fetch(key, self.fetcher(items, calls)))
+        assert items == list(cache.get_or_fetch(key, self.fetcher(items, calls)))
+        assert 2 == len(calls)
+        assert 1 / 3 == cache.stats.hit_ratio
+        assert 1 == cache.stats.kinds['index'].hits
+
+    def test_ttl(self):
+        clock = Clock()
+        cache = QueryCache(ttl=10, clock=clock)
+        cache.set_ttl('short', 1)
+        cache.set_ttl('never', 0)
+        calls = []
+        for query in ('long', 'short', 'never'):
+            list(cache.get_or_fetch(cache.key('index', {'query': query}), self.fetcher([{}], calls)))
+        clock.now = 5
+        for query in ('long', 'short', 'never'):
+            list(cache.get_or_fetch(cache.key('index', {'query': query}), self.fetcher([{}], calls)))
+        assert 5 == len(calls)
+
+    def test_spill(self, tmp_path):
+        cache = QueryCache(spill_bytes=100, spill_dir=str(tmp_path))
+        items = [{'ogit/_id': str(i), 'ogit/_type': 'ogit/Node'} for i in range(50)]
+        key = cache.key('graph', {'root': 'r', 'query': 'out()'})
+        assert items == list(cache.get_or_fetch(key, self.fetcher(items, [])))
+        assert 1 == cache.stats.spills
+        assert 0 == cache.stats.memory_bytes
+        assert 1 == len(list(tmp_path.iterdir()))
+        assert items == list(cache.get_or_fetch(key, self.fetcher([], [])))
+        cache.invalidate(key)
+        assert [] == list(tmp_path.iterdir())
+        assert 0 == cache.stats.disk_bytes
+
+    def test_memory_bound(self):
+        cache = QueryCache(max_bytes=1000)
+        for i in range(20):
+            items = [{'ogit/_id': f'{i}-{j}'} for j in range(5)]
+            list(cache.get_or_fetch(cache.key('index', {'query': str(i)}), self.fetcher(items, [])))
+        assert cache.stats.memory_bytes <= 1000
+        assert 0 < cache.stats.evictions
+        assert cache.key('index', {'query': '19'}) in cache
+
+    def test_invalidate_type(self):
+        cache = QueryCache()
+        node = cache.key('index', {'query': r'+ogit\/_type:"ogit/Node"'})
+        comment = cache.key('index', {'query': 'q'})
+        projected = cache.key('index', {'query': 'p', 'fields': 'ogit/_id'})
+        list(cache.get_or_fetch(node, self.fetcher([], [])))
+        list(cache.get_or_fetch(comment, self.fetcher([{'ogit/_type': 'ogit/Comment'}], [])))
+        list(cache.get_or_fetch(projected, self.fetcher([{'ogit/_id': 'a'}], [])))
+        assert 2 == cache.invalidate_type('ogit/Node')
+        assert node not in cache
+        assert projected not in cache
+        assert comment in cache
+        assert 1 == cache.invalidate_type('ogit/Comment')
+
+
+class TestClassVersionStore:
+    @staticmethod
+    def element(version: int, timestamp: int) -> dict:
+        return {
+            'ogit/_id': 'a',
+            'ogit/_v': version,
+            'ogit/_v-id': f'{timestamp}-abcdef',
+            'ogit/_modified-on': timestamp,
+        }
+
+    def test_add_items(self):
+        store = VersionStore()
+        assert 20 == store.add('a', 'element', [self.element(1, 10), self.element(2, 20)])
+        # versions are immutable; the second copy is ignored
+        store.add('a', 'element', [self.element(2, 20), self.element(3, 30)])
+        assert [1, 2, 3] == [i['ogit/_v'] for i in store.items('a', 'element')]
+        assert [2, 3] == [i['ogit/_v'] for i in store.items('a', 'element', start=20)]
+        assert [1, 2] == [i['ogit/_v'] for i in store.items('a', 'element', end=20)]
+        assert [] == store.items('a', 'full')
+        assert [] == store.items('b', 'element')
+
+    def test_get(self):
+        store = VersionStore()
+        store.add('a', 'element', [self.element(1, 10), self.element(2, 20)])
+        assert 2 == store.get('a', 'element', version=2)['ogit/_v']
+        assert 1 == store.get('a', 'element', v_id='10-abcdef')['ogit/_v']
+        assert store.get('a', 'element', version=3) is None
+        with pytest.raises(ValueError):
+            store.get('a', 'element')
+
+    def test_full_format(self):
+        store = VersionStore()
+        item = {'identity': 'a', 'action': 'CREATE', 'data': {'ogit/_id': 'a'},
+                'meta': {'id': 'a', 'nanotime': 1, 'timestamp': 10, 'vid': '10-abcdef', 'version': 1}}
+        assert 10 == store.add('a', 'full', [item])
+        assert item == store.get('a', 'full', v_id='10-abcdef')
+
+    def test_watermark(self):
+        store = VersionStore()
+        assert store.watermark('a', 'element') is None
+        store.set_watermark('a', 'element', 20)
+        store.set_watermark('a', 'element', 10)
+        assert 20 == store.watermark('a', 'element')
+
+    def test_persistent(self, tmp_path):
+        path = tmp_path / 'history.sqlite'
+        store = VersionStore(path)
+        store.add('a', 'element', [self.element(1, 10)])
+        store.set_watermark('a', 'element', 10)
+        store.close()
+        store = VersionStore(path)
+        assert 10 == store.watermark('a', 'element')
+        assert 1 == store.get('a', 'element', version=1)['ogit/_v']
+        store.close()
+
+    def test_deleted_version(self):
+        store = VersionStore()
+        deleted = {**self.element(2, 20), 'ogit/_v-id': '30-abcdef', 'ogit/_deleted-on': 30, 'ogit/_is-deleted': True}
+        assert 30 == store.add('a', 'element', [self.element(1, 10), deleted])
+        assert [2] == [i['ogit/_v'] for i in store.items('a', 'element', start=30)]
+
+    def test_get_version_fields(self):
+        requests = []
+
+        class FakeVertexData:
+            @staticmethod
+            def history(vertex_id, **kwargs):
+                requests.append(kwargs)
+                yield {**TestClassVersionStore.element(1, 10), 'ogit/name': 'foo', 'ogit/content': 'bar'}
+
+        model = Hiro6GraphVertexModel.__new__(Hiro6GraphVertexModel)
+        root = SimpleNamespace(version_store=None, resolve_vertex_id=lambda vertex, vertex_id, vertex_xid: vertex_id)
+        model._Hiro6GraphVertexModel__base_client = SimpleNamespace(root=root)
+        model._Hiro6GraphVertexModel__data_client = FakeVertexData()
+        vertex = model.get('a', v_id='10-abcdef', fields=('ogit/name',))
+        assert {'ogit/_id': 'a', 'ogit/name': 'foo', 'ogit/_is-deleted': False} == vertex.to_dict()
+        assert 'true' == requests[0]['params']['includeDeleted']
@@ -0,0 +1,215 @@
+import io
+import json
+import os
+import re
+import threading
+
+import pytest
+
+from arago.hiro.utils.download import download, STATE_SUFFIX
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict, body: bytes) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.raw = io.BytesIO(body)
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+    def __enter__(self) -> 'FakeResponse':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class FakeServer:
+    def __init__(
+            self,
+            content: bytes = CONTENT,
+            ranges: bool = True,
+            etag: str = '"v1"',
+            last_modified: str = None
+    ) -> None:
+        self.content = content
+        self.ranges = ranges
+        self.etag = etag
+        self.last_modified = last_modified
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def fetch(self, headers) -> FakeResponse:
+        with self.lock:
+            self.requests.append(dict(headers))
+        match = re.fullmatch(r'bytes=(\d+)-(\d+)', headers.get('Range', ''))
+        validator = {'ETag': self.etag} if self.etag is not None else {}
+        if self.last_modified is not None:
+            validator['Last-Modified'] = self.last_modified
+        if_range = headers.get('If-Range')
+        # a weak ETag never matches If-Range
+        strong = {v for v in (self.etag, self.last_modified) if v is not None and not v.startswith('W/')}
+        if not self.ranges or match is None or (if_range is not None and if_range not in strong):
+            return FakeResponse(200, validator, self.content)
+        start, end = int(match.group(1)), min(int(match.group(2)), len(self.content) - 1)
+        return FakeResponse(206, {
+            **validator,
+            'Content-Range': f'bytes {start}-{end}/{len(self.content)}'
+        }, self.content[start:end + 1])
+
+
+class TestClassDownload:
+    def test_ranged_to_file(self, tmp_path):
+        server = FakeServer()
+        path = str(tmp_path / 'blob')
+        result = download(server.fetch, path, part_size=1000, concurrency=3)
+        with open(path, 'rb') as file:
+            assert CONTENT == file.read()
+        assert result.ranged
+        assert 11 == result.parts == len(server.requests)
+        assert 10240 == result.size
+        assert not os.path.exists(path + STATE_SUFFIX)
+        assert all(r['If-Range'] == '"v1"' for r in server.requests[1:])
+
+    def test_ranged_to_buffer(self):
+        server = FakeServer()
+        buffer = bytearray(len(CONTENT) + 10)
+        result = download(server.fetch, buffer, part_size=4096)
+        assert CONTENT == buffer[:len(CONTENT)]
+        assert 3 == result.parts
+
+    def test_buffer_too_small(self):
+        with pytest.raises(ValueError):
+            download(FakeServer().fetch, bytearray(100), part_size=4096)
+
+    def test_single_stream(self, tmp_path):
+        server = FakeServer(ranges=False)
+        path = str(tmp_path / 'blob')
+        result = download(server.fetch, path, part_size=1000)
+        with open(path, 'rb') as file:
+            assert CONTENT == file.read()
+        assert not result.ranged
+        assert 1 == len(server.requests)
+        buffer = bytearray(len(CONTENT))
+        assert len(CONTENT) == download(server.fetch, buffer).size
+        assert CONTENT == buffer
+        with pytest.raises(ValueError):
+            download(server.fetch, bytearray(100))
+
+    def test_resume(self, tmp_path):
+        server = FakeServer()
+        path = str(tmp_path / 'blob')
+        with open(path, 'wb') as file:
+            file.write(CONTENT[:3000] + bytes(len(CONTENT) - 3000))
+        with open(path + STATE_SUFFIX, 'w') as file:
+            json.dump({'size': len(CONTENT), 'part_size': 1000, 'validator': '"v1"', 'done': [0, 1, 2]}, file)
+        result = download(server.fetch, path, part_size=1000)
+        with open(path, 'rb') as file:
+            assert CONTENT == file.read()
+        assert 3000 == result.resumed
+        assert 8 == result.parts
+        # the probe and the missing parts
+        assert 9 == len(server.requests)
+
+    def test_resume_changed_content(self, tmp_path):
+        server = FakeServer(etag='"v2"')
+        path = str(tmp_path / 'blob')
+        with open(path, 'wb') as file:
+            file.write(bytes(len(CONTENT)))
+        with open(path + STATE_SUFFIX, 'w') as file:
+            json.dump({'size': len(CONTENT), 'part_size': 1000, 'validator': '"v1"', 'done': [0, 1, 2]}, file)
+        result = download(server.fetch, path, part_size=1000)
+        with open(path, 'rb') as file:
+            assert CONTENT == file.read()
+        assert 0 == result.resumed
+
+    def test_failed_part_keeps_state(self, tmp_path):
+        server = FakeServer()
+        fetch = server.fetch
+
+        def failing(headers):
+            if headers.get('Range') == 'bytes=5000-5999':
+                raise ConnectionError()
+            return fetch(headers)
+
+        path = str(tmp_path / 'blob')
+        with pytest.raises(ConnectionError):
+            download(failing, path, part_size=1000, concurrency=1)
+        with open(path + STATE_SUFFIX) as file:
+            assert [0, 1, 2, 3, 4] == json.load(file)['done']
+        result = download(server.fetch, path, part_size=1000)
+        assert 5000 == result.resumed
+        with open(path, 'rb') as file:
+            assert CONTENT == file.read()
+
+    def test_no_validator_no_resume(self, tmp_path):
+        server = FakeServer(etag=None)
+        fetch = server.fetch
+
+        def failing(headers):
+            if headers.get('Range') == 'bytes=5000-5999':
+                raise ConnectionError()
+            return fetch(headers)
+
+        path = str(tmp_path / 'blob')
+        with pytest.raises(ConnectionError):
+            download(failing, path, part_size=1000, concurrency=1)
+        assert not os.path.exists(path + STATE_SUFFIX)
+
+        with open(path + STATE_SUFFIX, 'w') as file:
+            json.dump({'size': len(CONTENT), 'part_size': 1000, 'validator': None, 'done': [0, 1, 2]}, file)
+        result = download(server.fetch, path, part_size=1000)
+        assert 0 == result.resumed
+        with open(path, 'rb') as file:
+            assert CONTENT == file.read()
+        assert not os.path.exists(path + STATE_SUFFIX)
+
+    def test_weak_etag(self, tmp_path):
+        server = FakeServer(etag='W/"v1"', last_modified='Mon, 19 Oct 2026 10:00:00 GMT')
+        path = str(tmp_path / 'blob')
+        result = download(server.fetch, path, part_size=1000)
+        assert 0 == result.resumed
+        with open(path, 'rb') as file:
+            assert CONTENT == file.read()
+        assert all(r['If-Range'] == 'Mon, 19 Oct 2026 10:00:00 GMT' for r in server.requests[1:])
+
+        server = FakeServer(etag='W/"v1"')
+        fetch = server.fetch
+
+        def failing(headers):
+            if headers.get('Range') == 'bytes=5000-5999':
+                raise ConnectionError()
+            return fetch(headers)
+
+        path = str(tmp_path / 'weak')
+        with pytest.raises(ConnectionError):
+            download(failing, path, part_size=1000, concurrency=1)
+        assert all('If-Range' not in r for r in server.requests)
+        assert not os.path.exists(path + STATE_SUFFIX)
+        download(server.fetch, path, part_size=1000)
+        with open(path, 'rb') as file:
+            assert CONTENT == file.read()
+
+    def test_wrong_content_range(self):
+        server = FakeServer()
+        fetch = server.fetch
+
+        def shifted(headers):
+            if headers.get('Range') == 'bytes=2000-2999':
+                headers = {**headers, 'Range': 'bytes=0-999'}
+            return fetch(headers)
+
+        with pytest.raises(RuntimeError):
+            download(shifted, bytearray(len(CONTENT)), part_size=1000)
+
+        def probe_shifted(headers):
+            if headers.get('Range') == 'bytes=0-999':
+                headers = {**headers, 'Range': 'bytes=1000-1999'}
+            return fetch(headers)
+
+        with pytest.raises(RuntimeError):
+            download(probe_shifted, bytearray(len(CONTENT)), part_size=1000)
@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+
+from arago.hiro.utils.fanout import FanOut
+
+
+class TestClassFanOut:
+    def test_dedupe(self):
+        sources = [lambda: range(0, 50), lambda: range(25, 75), lambda: range(0, 100, 10)]
+        with FanOut(sources, key=lambda i: i, concurrency=2, buffer=4) as run:
+            assert list(range(75)) + [80, 90] == sorted(run)
+        assert 77 == run.items
+        assert 50 + 50 + 10 - 77 == run.duplicates
+
+    def test_merge(self):
+        def source(values):
+            def items():
+                for value in values:
+                    time.sleep(0.001)
+                    yield {'id': value % 7, 'v': value}
+            return items
+
+        sources = [source(range(0, 30, 3)), source(range(0, 30, 2)), source(range(1, 30, 5))]
+        with FanOut(sources, key=lambda i: i['v'], sort_key=lambda i: i['v'], convert=lambda i: i['v'],
+                    buffer=2) as run:
+            assert sorted({*range(0, 30, 3), *range(0, 30, 2), *range(1, 30, 5)}) == list(run)
+
+    def test_merge_reverse(self):
+        sources = [lambda: [5, 3, 1], lambda: [6, 4, 3]]
+        run = FanOut(sources, key=lambda i: i, sort_key=lambda i: i, reverse=True)
+        assert [6, 5, 4, 3, 1] == list(run)
+
+    def test_merge_concurrency(self):
+        sources = [lambda: [1], lambda: [2], lambda: [3]]
+        with pytest.raises(ValueError):
+            FanOut(sources, key=lambda i: i, sort_key=lambda i: i, concurrency=2)
+        assert [3, 2, 1] == list(FanOut(sources, key=lambda i: i, sort_key=lambda i: -i, concurrency=3))
+
+    def test_error(self):
+        def failing():
+            yield 1
+            raise ValueError()
+
+        run = FanOut([failing, lambda: range(100, 200)], key=lambda i: i, sort_key=lambda i: i)
+        with pytest.raises(ValueError):
+            list(run)
+
+    def test_abandoned(self):
+        def fanout_threads() -> int:
+            return sum(1 for t in threading.enumerate() if t.name.startswith('hiro-fanout'))
+
+        before = fanout_threads()
+        run = FanOut([lambda: range(1000), lambda: range(1000, 2000)], key=lambda i: i, buffer=2)
+        next(run)
+        del run
+        deadline = time.monotonic() + 5
+        while fanout_threads() > before and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert before == fanout_threads()
@@ -11,9 +11,11 @@ from arago.hiro.client.client import HiroClient
 from arago.hiro.model.auth import SessionCredentials, AccessToken
 from arago.hiro.model.graph.edge import Edge
 from arago.hiro.model.graph.vertex import VertexId, Vertex
+from arago.hiro.model.search import Order
 from arago.hiro.model.storage import BlobVertex, TimeSeriesValue, TimeSeriesVertex
 from arago.hiro.utils.datetime import datetime_to_timestamp_ms
-from arago.ogit import OgitEntity, OgitVerb
+from arago.hiro.utils.result_set import ResultSet
+from arago.ogit import OgitEntity, OgitVerb, OgitAttribute
 
 
 def uuid() -> str:
@@ -378,6 +380,108 @@ class TestClassSearch:
         i = next(res)
         assert isinstance(i, Edge)
 
+    def test_count_model(self, client: HiroClient):
+        search = client.model.search
+        query = r'+ogit\/_type:"ogit/Node"'
+        assert search.index_count(query) == sum(1 for _ in search.index(query, fields=('ogit/_id',)))
+        assert search.graph_count(VertexId('ogit/Node'), 'out()') == sum(1 for _ in search.graph(
+            VertexId('ogit/Node'), 'out()'))
+        assert search.connected_count(VertexId('ogit/Node'), 'ogit/subclassOf', 'in') >= 0
+
+    def test_connected_many_model(self, client: HiroClient):
+        search = client.model.search
+        roots = [vertex.id for vertex in search.graph(VertexId('ogit/Node'), 'out()')][:5]
+        res = dict(search.connected_many(roots, 'ogit/subclassOf', 'out'))
+        assert roots == list(res)
+        for root in roots:
+            expected = {vertex.id for vertex in search.connected(root, 'ogit/subclassOf', 'out')}
+            assert expected == {vertex.id for vertex in res[root]}
+
+    def test_subgraph_model(self, client: HiroClient):
+        search = client.model.search
+        res = search.subgraph([VertexId('ogit/Node')], ['ogit/subclassOf'], 'in', depth=2, max_vertices=50)
+        assert VertexId('ogit/Node') in res.vertices
+        assert len(res.vertices) <= 50
+        for edge in res.edges:
+            assert edge.out_id in res.vertices
+            assert edge.in_id in res.vertices
+
+    def test_get_by_ids_parallel_model(self, client: HiroClient):
+        search = client.model.search
+        ids = [vertex.id for vertex in search.graph(VertexId('ogit/Node'), 'out()')]
+        with search.get_by_ids_parallel(ids + ['does-not-exist'], chunk_size=3, concurrency=2) as res:
+            assert ids == [vertex.id for vertex in res]
+        assert ['does-not-exist'] == res.missing
+
+    def test_index_many_model(self, client: HiroClient):
+        search = client.model.search
+        queries = [r'+ogit\/_type:"ogit/Node"', r'+ogit\/_id:"ogit/Node"', r'+ogit\/_type:"ogit/Node"']
+        expected = {vertex.id for vertex in search.index(queries[0], fields=('ogit/_id',))}
+        expected |= {vertex.id for vertex in search.index(queries[1], fields=('ogit/_id',))}
+        with search.index_many(queries, fields=('ogit/_id',), order=Order('ogit/_id', 'asc')) as res:
+            ids = [vertex.id for vertex in res]
+        assert sorted(expected) == ids
+
+    def test_index_result_set_model(self, client: HiroClient):
+        search = client.model.search
+        query = r'+ogit\/_type:"ogit/Node"'
+        with ResultSet(search.index(query, fields=('ogit/_id',)), memory_items=10, client=client) as res:
+            ids = [vertex.id for vertex in res]
+            assert ids == [vertex.id for vertex in res]
+            assert len(ids) == len(res)
+            if ids:
+                assert ids[-1] == res[-1].id
+
+    def test_index_model_parallel(self, client: HiroClient):
+        search = client.model.search
+        query = r'+ogit\/_type:"ogit/Node"'
+        expected = [vertex.id for vertex in search.index(query, fields=('ogit/_id',), order=Order('ogit/_id', 'asc'))]
+        with search.index_parallel(query, fields=('ogit/_id',), page_size=50, concurrency=4) as res:
+            assert expected == [vertex.id for vertex in res]
+        print(res.stats)
+
+    def test_scan_model(self, client: HiroClient):
+        search = client.model.search
+        query = r'+ogit\/_type:"ogit/Node"'
+        expected = {vertex.id for vertex in search.index(query, fields=('ogit/_id',))}
+        with search.scan(query, fields=('ogit/_id',), page_size=20) as scan:
+            first = [vertex.id for _, vertex in zip(range(30), scan)]
+            token = scan.cursor.token()
+        with search.scan(query, fields=('ogit/_id',), page_size=20, cursor=token) as scan:
+            rest = [vertex.id for vertex in scan]
+        assert expected == set(first + rest)
+        assert len(expected) == len(first + rest)
+
+    def test_index_model_adaptive(self, client: HiroClient):
+        from arago.hiro.client.adaptive_fields import AdaptiveFields
+        search = client.model.search
+        client.adaptive_fields = adaptive = AdaptiveFields()
+        try:
+            for _ in range(2):
+                with adaptive.named('nodes'):
+                    for vertex in search.index(r'+ogit\/_type:"ogit/Node"', limit=5):
+                        assert vertex.id is not None
+                        assert isinstance('ogit/name' in vertex, bool)
+            report = adaptive.report()
+            assert 'ogit/name' in report[0].fields
+        finally:
+            client.adaptive_fields = None
+
+    def test_refresh_model(self, client: HiroClient):
+        graph = client.model.graph
+        vertex_a = graph.vertex.create(OgitEntity.OGIT_COMMENT)
+        vertex_b = graph.vertex.create(OgitEntity.OGIT_COMMENT)
+        vertex_c = graph.vertex.create(OgitEntity.OGIT_COMMENT)
+        graph.vertex.update(vertex_b.id, {OgitAttribute.OGIT_CONTENT: 'foo'})
+        graph.vertex.delete(vertex_c.id)
+        res = client.model.search.refresh([vertex_a, vertex_b, vertex_c])
+        assert [vertex_b.id] == res.changed
+        assert [vertex_c.id] == res.missing
+        assert res.vertices[0] is vertex_a
+        assert 'foo' == res.vertices[1][OgitAttribute.OGIT_CONTENT]
+        graph.vertex.delete(vertex_a.id)
+        graph.vertex.delete(vertex_b.id)
+
 
 class TestClassStorage:
     @pytest.fixture
@@ -449,6 +553,17 @@ class TestClassStorage:
             i = next(g)
         assert isinstance(i, bytes)
 
+    def test_blob_download_model(self, client: HiroClient, empty_blob_vertex: BlobVertex, png_img: bytes, tmp_path):
+        storage = client.model.storage
+        storage.blob.set(empty_blob_vertex, png_img)
+        path = tmp_path / 'blob'
+        res = storage.blob.download(empty_blob_vertex, path, part_size=1024)
+        assert len(png_img) == res.size
+        assert png_img == path.read_bytes()
+        buffer = bytearray(len(png_img))
+        storage.blob.download(empty_blob_vertex, buffer, part_size=1024)
+        assert png_img == buffer
+
     @pytest.mark.skip
     def test_log_get_rest(self, client: HiroClient):
         storage = client.rest.storage
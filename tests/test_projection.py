@@ -0,0 +1,166 @@
+from types import SimpleNamespace
+
+import pytest
+
+from arago.hiro.client.adaptive_fields import AdaptiveFields, query_shape
+from arago.hiro.model.graph.typed import make_vertex_class, unregister_vertex_class
+from arago.hiro.utils.cast_c import to_vertices
+from arago.ogit import OgitEntity, OgitAttribute
+
+SERVER = {
+    'a': {'ogit/_id': 'a', 'ogit/_type': 'ogit/Note', 'ogit/name': 'A', '/color': 'red'},
+    'b': {'ogit/_id': 'b', 'ogit/_type': 'ogit/Note', 'ogit/name': 'B'},
+    'c': {'ogit/_id': 'c', 'ogit/_type': 'ogit/Note', 'ogit/name': 'C', '/color': 'blue'},
+}
+
+
+class FakeSearch:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def get_by_ids(self, *vertex_ids, fields=None):
+        self.calls.append((vertex_ids, fields))
+        for vertex_id in vertex_ids:
+            item = SERVER[vertex_id]
+            yield {k: v for k, v in item.items() if fields is None or k in fields}
+
+
+def fake_client(search: FakeSearch) -> SimpleNamespace:
+    client = SimpleNamespace(data=SimpleNamespace(search=search), read_ahead=None)
+    client.root = client
+    return client
+
+
+def projected(search: FakeSearch, fields=('ogit/_id', 'ogit/_type')) -> list:
+    items = list(search.get_by_ids(*SERVER, fields=fields))
+    search.calls.clear()
+    return list(to_vertices(iter(items), fake_client(search), fields))
+
+
+class TestClassProjection:
+    def test_back_fill_batched(self):
+        search = FakeSearch()
+        vertices = projected(search)
+        assert 'A' == vertices[0]['ogit/name']
+        assert 'B' == vertices[1]['ogit/name']
+        assert 'C' == vertices[2][OgitAttribute.OGIT_NAME]
+        assert [(('a', 'b', 'c'), ('ogit/_id', 'ogit/name'))] == search.calls
+
+    def test_absent_attribute(self):
+        search = FakeSearch()
+        vertices = projected(search)
+        assert '/color' in vertices[0]
+        assert '/color' not in vertices[1]
+        with pytest.raises(KeyError):
+            vertices[1]['/color']
+        assert 'blue' == vertices[2]['/color']
+        assert 1 == len(search.calls)
+
+    def test_local_value_wins(self):
+        search = FakeSearch()
+        vertices = projected(search)
+        vertices[1]['ogit/name'] = 'local'
+        assert 'A' == vertices[0]['ogit/name']
+        assert 'local' == vertices[1]['ogit/name']
+
+    def test_projected_fields_not_fetched(self):
+        search = FakeSearch()
+        vertices = projected(search, ('ogit/_id', 'ogit/_type', '/color'))
+        with pytest.raises(KeyError):
+            vertices[1]['/color']
+        assert [] == search.calls
+
+    def test_without_projection(self):
+        search = FakeSearch()
+        vertices = list(to_vertices(iter(SERVER.values()), None))
+        with pytest.raises(KeyError):
+            vertices[1]['/color']
+        assert [] == search.calls
+
+    def test_whole_vertex_complete(self):
+        search = FakeSearch()
+        vertices = projected(search)
+        assert {'ogit/_id': 'a', 'ogit/name': 'A', '/color': 'red'}.items() <= vertices[0].to_dict().items()
+        assert [(('a', 'b', 'c'), None)] == search.calls
+        assert 1 == len(vertices[1])
+        assert 2 == len(list(vertices[2]))
+        assert 'C' == vertices[2].attributes[OgitAttribute.OGIT_NAME]
+        assert 1 == len(search.calls)
+
+    def test_whole_vertex_local_value_wins(self):
+        search = FakeSearch()
+        vertices = projected(search)
+        vertices[0]['ogit/name'] = 'local'
+        assert 'local' == vertices[0].to_dict()['ogit/name']
+        assert 'B' == vertices[1].to_dict()['ogit/name']
+
+    def test_typed_vertex(self):
+        cls = make_vertex_class(OgitEntity.OGIT_NOTE, (OgitAttribute.OGIT_NAME,))
+        try:
+            search = FakeSearch()
+            vertices = projected(search)
+            assert type(vertices[0]) is cls
+            assert 'A' == vertices[0]['ogit/name']
+            assert 'B' == vertices[1].ogit_name
+            assert 1 == len(search.calls)
+            assert 2 == len(vertices[2])
+            assert 'blue' == vertices[2].to_dict()['/color']
+            assert 2 == len(search.calls)
+        finally:
+            unregister_vertex_class(OgitEntity.OGIT_NOTE)
+
+
+class TestClassAdaptiveFields:
+    def test_learn_and_project(self):
+        adaptive = AdaptiveFields()
+        search = FakeSearch()
+        client = fake_client(search)
+
+        profile = adaptive.profile(('index', 'query'))
+        assert profile.fields() is None
+        profile.executions += 1
+        vertices = list(to_vertices(iter(SERVER.values()), client, None, profile))
+        assert 'A' == vertices[0]['ogit/name']
+        assert [] == search.calls
+
+        profile = adaptive.profile(('index', 'query'))
+        fields = profile.fields()
+        assert 'ogit/name' in fields
+        assert 'ogit/_id' in fields
+        assert '/color' not in fields
+        profile.executions += 1
+        items = list(search.get_by_ids(*SERVER, fields=fields))
+        search.calls.clear()
+        vertices = list(to_vertices(iter(items), client, fields, profile))
+        assert 'B' == vertices[1]['ogit/name']
+        assert 'blue' == vertices[2]['/color']
+        assert 1 == len(search.calls)
+        assert 1 == profile.misses
+        assert '/color' in adaptive.profile(('index', 'query')).fields()
+
+    def test_named(self):
+        adaptive = AdaptiveFields(warmup=2)
+        with adaptive.named('tickets'):
+            profile = adaptive.profile(('index', 'a'))
+        assert profile is adaptive.profile('tickets')
+        assert profile is not adaptive.profile(('index', 'a'))
+        report = {r.key: r for r in adaptive.report()}
+        assert {'tickets', ('index', 'a')} == set(report)
+        assert report['tickets'].fields is None
+        adaptive.reset('tickets')
+        assert 1 == len(adaptive.report())
+
+    def test_query_shape(self):
+        assert r'+ogit\/_id:?' == query_shape(r'+ogit\/_id:(ck1 ck2 ck3)') == query_shape(r'+ogit\/_id:ck9')
+        assert r'+ogit\/_type:? +ogit\/_scope:?' == query_shape(r'+ogit\/_type:"ogit/Note" +ogit\/_scope:abc')
+        assert r'+ogit\/_created\-on:?' == query_shape(r'+ogit\/_created\-on:[10 TO 20}')
+        assert "outE(?).has(?,within(?)).limit(?)" == query_shape(
+            "outE('ogit/relates').has('ogit/_type',within('ogit/Note','ogit/Node')).limit(20)")
+
+    def test_bounded(self):
+        adaptive = AdaptiveFields(maxsize=2)
+        first = adaptive.profile('a')
+        adaptive.profile('b')
+        assert first is adaptive.profile('a')
+        adaptive.profile('c')
+        assert {'a', 'c'} == {r.key for r in adaptive.report()}
@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+
+from arago.hiro.utils.read_ahead import ReadAhead, ReadAheadIterator
+
+
+class TestClassReadAhead:
+    def test_items_and_stats(self):
+        read_ahead = ReadAhead(depth=5)
+        with read_ahead.wrap(iter(range(100))) as items:
+            assert list(range(100)) == list(items)
+        assert 1 == read_ahead.stats.streams
+        assert 100 == read_ahead.stats.items
+        assert read_ahead.stats.max_depth <= 5
+
+    def test_background(self):
+        threads = set()
+
+        def source():
+            for i in range(10):
+                threads.add(threading.current_thread())
+                yield i
+
+        items = ReadAheadIterator(source(), depth=20)
+        time.sleep(0.05)
+        # decoded ahead of the consumer
+        assert 10 <= items.depth
+        assert list(range(10)) == list(items)
+        assert threading.current_thread() not in threads
+
+    def test_slow_consumer(self):
+        items = ReadAheadIterator(iter(range(5)), depth=1)
+        for _ in items:
+            time.sleep(0.02)
+        assert items.producer_wait > 0.02
+
+    def test_error(self):
+        def source():
+            yield 1
+            raise ValueError()
+
+        items = ReadAheadIterator(source())
+        assert 1 == next(items)
+        with pytest.raises(ValueError):
+            next(items)
+
+    def test_close_releases_source(self):
+        closed = threading.Event()
+
+        def source():
+            try:
+                while True:
+                    yield 1
+            finally:
+                closed.set()
+
+        items = ReadAheadIterator(source(), depth=2)
+        next(items)
+        items.close()
+        assert closed.wait(1)
@@ -0,0 +1,96 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from arago.hiro.backend.six.search import Hiro6SearchModel
+from arago.hiro.model.graph.vertex import Vertex
+from arago.hiro.utils.result_set import ResultSet
+
+
+def counted(n: int, reads: list):
+    for i in range(n):
+        reads.append(i)
+        yield {'ogit/_id': str(i)}
+
+
+class TestClassResultSet:
+    def test_iterate_twice(self, tmp_path):
+        reads = []
+        result = ResultSet(counted(100, reads), memory_items=10, spill_dir=str(tmp_path))
+        first = list(result)
+        assert first == list(result)
+        assert [{'ogit/_id': str(i)} for i in range(100)] == first
+        # fetched once
+        assert 100 == len(reads)
+        assert 90 == result.spilled
+        assert 1 == len(os.listdir(tmp_path))
+
+    def test_lazy(self, tmp_path):
+        reads = []
+        result = ResultSet(counted(100, reads), memory_items=10, spill_dir=str(tmp_path))
+        assert {'ogit/_id': '25'} == result[25]
+        assert 26 == len(reads)
+        assert not result.complete
+        assert [{'ogit/_id': '30'}, {'ogit/_id': '32'}] == result[30:34:2]
+        assert 34 == len(reads)
+        assert 100 == len(result)
+        assert result.complete
+
+    def test_index_and_slice(self, tmp_path):
+        result = ResultSet(counted(20, []), memory_items=5, spill_dir=str(tmp_path))
+        assert {'ogit/_id': '19'} == result[-1]
+        assert {'ogit/_id': '3'} == result[3]
+        assert [str(i) for i in range(18, 1, -4)] == [item['ogit/_id'] for item in result[18:1:-4]]
+        assert [str(i) for i in range(4, 8)] == [item['ogit/_id'] for item in result[4:8]]
+        assert [] == result[30:40]
+        with pytest.raises(IndexError):
+            result[20]
+
+    def test_interleaved_iterators(self, tmp_path):
+        result = ResultSet(counted(30, []), memory_items=2, spill_dir=str(tmp_path))
+        a, b = iter(result), iter(result)
+        pairs = [(next(a), next(b), next(b)) for _ in range(10)]
+        assert [{'ogit/_id': str(i)} for i in range(10)] == [p[0] for p in pairs]
+        assert {'ogit/_id': '19'} == pairs[-1][2]
+        assert 30 == len(list(a)) + 10
+
+    def test_error(self, tmp_path):
+        def source():
+            yield 1
+            raise ValueError()
+
+        result = ResultSet(source(), spill_dir=str(tmp_path))
+        assert 1 == result[0]
+        with pytest.raises(ValueError):
+            list(result)
+        with pytest.raises(ValueError):
+            len(result)
+
+    def test_close_removes_spill_file(self, tmp_path):
+        result = ResultSet(counted(20, []), memory_items=5, spill_dir=str(tmp_path))
+        assert 20 == len(result)
+        result.close()
+        assert [] == os.listdir(tmp_path)
+        assert 5 == len(result)
+
+    def test_index_result_set(self, tmp_path):
+        reads = []
+
+        class FakeSearchData:
+            def index(self, query, order=None, offset=None, limit=None, fields=None):
+                for i in range(20):
+                    reads.append(i)
+                    yield {'ogit/_id': f'c{i:019d}', 'ogit/_type': 'ogit/Note'}
+
+        client = SimpleNamespace(adaptive_fields=None, read_ahead=None)
+        client.root = client
+        search = Hiro6SearchModel.__new__(Hiro6SearchModel)
+        search._Hiro6SearchModel__data_client = FakeSearchData()
+        search._Hiro6SearchModel__base_client = client
+        with search.index_result_set('*', memory_items=5, spill_dir=str(tmp_path)) as result:
+            assert 20 == len(result)
+            assert all(isinstance(vertex, Vertex) for vertex in result)
+            assert [str(vertex.id) for vertex in result] == [f'c{i:019d}' for i in range(20)]
+        assert 20 == len(reads)
+        assert [] == os.listdir(tmp_path)
@@ -0,0 +1,102 @@
+import gc
+import threading
+import time
+from typing import List, Tuple, Optional
+
+import pytest
+
+from arago.hiro.utils.scan import Scan, ScanCursor, ScanPartition, split_range
+
+# (created_on, id)
+ROWS = sorted((i * 7 % 50, f'id-{i:03d}') for i in range(200))
+
+
+def fetch_factory(page_size: int, calls: Optional[List[ScanPartition]] = None):
+    lock = threading.Lock()
+
+    def fetch(partition: ScanPartition) -> List[Tuple[int, str]]:
+        if calls is not None:
+            with lock:
+                calls.append(partition)
+        rows = [
+            r for r in ROWS
+            if (partition.lower is None or r[0] >= partition.lower)
+            and (partition.upper is None or r[0] < partition.upper)
+            and (partition.last_id is None or r > (partition.last_on, partition.last_id))
+        ]
+        return rows[:page_size]
+
+    return fetch
+
+
+def key_of(row: Tuple[int, str]) -> Tuple[int, str]:
+    return row
+
+
+class TestClassScan:
+    def test_single_partition(self):
+        cursor = ScanCursor('q', 'ogit/_created-on', (ScanPartition(),))
+        with Scan(fetch_factory(30), key_of, cursor, 30) as scan:
+            assert ROWS == list(scan)
+        assert scan.cursor.done
+        assert 7 == scan.pages
+
+    def test_partitions(self):
+        cursor = ScanCursor('q', 'ogit/_created-on', split_range(0, 50, 4))
+        assert 4 == len(cursor.partitions)
+        with Scan(fetch_factory(10), key_of, cursor, 10, concurrency=4) as scan:
+            rows = list(scan)
+        assert ROWS == sorted(rows)
+        assert scan.cursor.done
+
+    def test_resume(self):
+        cursor = ScanCursor('q', 'ogit/_created-on', split_range(0, 50, 3))
+        scan = Scan(fetch_factory(10), key_of, cursor, 10, concurrency=2)
+        first = [next(scan) for _ in range(45)]
+        token = scan.cursor.token()
+        scan.close()
+
+        resumed = ScanCursor.from_token(token)
+        assert 'q' == resumed.query
+        with Scan(fetch_factory(10), key_of, resumed, 10, concurrency=2) as scan:
+            rest = list(scan)
+        assert ROWS == sorted(first + rest)
+
+    def test_error(self):
+        def fetch(partition: ScanPartition) -> list:
+            raise ValueError('boom')
+
+        scan = Scan(fetch, key_of, ScanCursor('q', 'ogit/_id', (ScanPartition(),)), 10)
+        with pytest.raises(ValueError):
+            next(scan)
+
+    def test_abandoned(self):
+        def scan_threads() -> int:
+            return sum(1 for t in threading.enumerate() if t.name.startswith('hiro-scan'))
+
+        before = scan_threads()
+        scan = Scan(fetch_factory(5), key_of, ScanCursor('q', 'ogit/_id', (ScanPartition(),)), 5)
+        next(scan)
+        assert all(t.daemon for t in threading.enumerate() if t.name.startswith('hiro-scan'))
+        del scan
+        gc.collect()
+        deadline = time.monotonic() + 5
+        while scan_threads() > before and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert before == scan_threads()
+
+    def test_managed(self):
+        calls = []
+        scan = Scan(fetch_factory(30, calls), key_of, ScanCursor('q', 'ogit/_id', (ScanPartition(),)), 30,
+                    managed=True)
+        with pytest.raises(RuntimeError):
+            next(scan)
+        assert [] == calls
+        with scan:
+            assert ROWS == sorted(scan)
+
+    def test_split_range(self):
+        partitions = split_range(0, 10, 3)
+        assert [(0, 4), (4, 8), (8, 10)] == [(p.lower, p.upper) for p in partitions]
+        with pytest.raises(ValueError):
+            split_range(10, 10, 2)
@@ -0,0 +1,67 @@
+import pickle
+from datetime import datetime, timezone
+
+from arago.hiro.model.graph.edge import Edge
+from arago.hiro.model.graph.history import HistoryEntry, HistoryAction, HistoryMeta
+from arago.hiro.model.graph.vertex import Vertex, VertexId, VersionId
+from arago.hiro.model.storage import TimeSeriesValue
+from arago.hiro.utils.serialization import dumps, loads
+
+# noinspection SpellCheckingInspection
+VERTEX_DATA = {
+    'ogit/_created-on': 1585068142772,
+    '/ProcessIssue': 'process_me',
+    'ogit/status': 'TERMINATED',
+    'ogit/_modified-on': 1585069015158,
+    'ogit/_owner': 'arago.co',
+    'ogit/_v': 8,
+    'ogit/_modified-by-app': 'cjix82tev000ou473gko8jgey',
+    'ogit/_type': 'ogit/Automation/AutomationIssue',
+    'ogit/_id': 'ck864nagkv8qfgx02r2ybfoob',
+    'ogit/_creator': 'ffluegel@arago.co',
+    'ogit/_v-id': '1585069015158-fmpmKq',
+    'ogit/_is-deleted': False,
+    'ogit/_creator-app': 'cjix82rxi000gu473w5kvkpqv',
+    'ogit/_modified-by': 'hiro_engine',
+}
+
+# noinspection SpellCheckingInspection
+EDGE_DATA = {
+    'ogit/_id': 'ck864nagkv8qfgx02r2ybfoob$$ogit/relates$$cjix82tev000ou473gko8jgey',
+    'ogit/_type': 'ogit/relates',
+    'ogit/_out-id': 'ck864nagkv8qfgx02r2ybfoob',
+    'ogit/_in-id': 'cjix82tev000ou473gko8jgey',
+    'ogit/_created-on': 1585068142772,
+    'ogit/_creator': 'ffluegel@arago.co',
+    'ogit/_is-deleted': False,
+}
+
+
+class TestClassSerialization:
+    def test_vertex_round_trip(self):
+        vertex = Vertex(VERTEX_DATA, draft=False)
+        restored = pickle.loads(pickle.dumps(vertex))
+        assert isinstance(restored, Vertex)
+        assert restored == vertex
+        assert restored.client is None
+        assert restored.to_dict() == vertex.to_dict()
+
+    def test_edge_round_trip(self):
+        edge = Edge(EDGE_DATA, draft=False)
+        restored = loads(dumps(edge))
+        assert isinstance(restored, Edge)
+        assert restored == edge
+        assert restored.to_dict() == edge.to_dict()
+
+    def test_history_entry_round_trip(self):
+        vertex = Vertex(VERTEX_DATA, draft=False)
+        meta = HistoryMeta(vertex.id, 1, vertex.modified_on_ms, VersionId('1585069015158-fmpmKq'), 8)
+        assert meta.timestamp_datetime is not None
+        entry = HistoryEntry(VertexId('cjix82rxi000gu473w5kvkpqv'), HistoryAction.UPDATE, vertex, meta)
+        restored = loads(dumps(entry))
+        assert restored == entry
+        assert 'timestamp_datetime' not in restored.meta.__dict__
+
+    def test_time_series_value_round_trip(self):
+        value = TimeSeriesValue('42', datetime.now(timezone.utc))
+        assert loads(dumps(value)) == value
@@ -1,13 +1,18 @@
 import itertools
 import json
+import pickle
 
 import pytest
 
 from arago.hiro.model.graph.attribute import FreeAttribute, SystemAttribute, VirtualAttribute, VirtualSystemAttribute, \
     ReadOnlyAttribute, FinalAttribute, GraphType, to_attribute
+from arago.hiro.model.graph import cuid
+from arago.hiro.model.graph.cuid import Cuid
 from arago.hiro.model.graph.dict import GraphDict
-from arago.hiro.model.graph.vertex import Vertex, resolve_vertex_id, VertexId
-from arago.ogit import OgitAttribute
+from arago.hiro.model.graph.typed import make_vertex_class, unregister_vertex_class
+from arago.hiro.model.graph.vertex import Vertex, resolve_vertex_id, VertexId, VersionId, decode_version_ids
+from arago.hiro.utils.cast_c import to_vertex
+from arago.ogit import OgitAttribute, OgitEntity
 from arago.ontology import OntologyAttribute
 
 
@@ -44,6 +49,22 @@ class TestClassVertex:
             v_b = d_b[k_a]
             assert v_a == v_b
 
+    def test_lazy_datetime(self):
+        v = Vertex({
+            'ogit/_created-on': 1585068142772,
+            'ogit/_modified-on': 1585069015158,
+        }, draft=False)
+        assert v.created_on_ms == 1585068142772
+        assert v.deleted_on_ms is None
+        assert v.deleted_on is None
+        assert '_created_on_cache' not in v.__dict__
+        created_on = v.created_on
+        assert created_on.tzinfo is not None
+        assert created_on is v.created_on
+        v.modified_on = created_on
+        assert v.modified_on_ms == 1585068142772
+        assert v.to_dict()['ogit/_modified-on'] == 1585068142772
+
     def test_attr_cast_free(self):
         a_1 = FreeAttribute('/foo')
         assert isinstance(a_1, FreeAttribute)
@@ -160,3 +181,84 @@ class TestClassVertex:
             d = GraphDict({a: 'foo'})
             assert b in d
             assert 'foo' == d[b]
+
+
+class TestClassIdCodec:
+    CUIDS = (
+        'ck1s3b9ti0sbn0a25x8j6ysoh',
+        'ck8bq0gg10a2b0b64fmk2d2kc',
+        'cjpqg1uk3000d0c61z3f3pm2a',
+    )
+
+    def test_cuid_decode(self):
+        components = cuid.decode(self.CUIDS)
+        for i, value in enumerate(self.CUIDS):
+            c = Cuid(value)
+            assert components.timestamp[i] == c.timestamp
+            assert components.counter[i] == c.counter
+            assert components.fingerprint[i] == c.fingerprint
+            assert components.random[i] == c.random
+
+    def test_cuid_decode_numpy(self):
+        pytest.importorskip('numpy')
+        expected = cuid.decode(self.CUIDS)
+        actual = cuid.decode_numpy(self.CUIDS)
+        for a, b in zip(expected, actual):
+            assert list(a) == b.tolist()
+        with pytest.raises(ValueError):
+            cuid.decode_numpy(self.CUIDS + ('c',))
+        with pytest.raises(ValueError):
+            # 24 + 26 chars
+            cuid.decode_numpy(('ck1s3b9ti0sbn0a25x8j6yso', 'ck1s3b9ti0sbn0a25x8j6ysohh'))
+        with pytest.raises(ValueError):
+            cuid.decode_numpy(('xk1s3b9ti0sbn0a25x8j6ysoh',))
+
+    def test_cuid_validate(self):
+        assert cuid.all_valid(self.CUIDS)
+        ids = self.CUIDS + ('ck1s3b9ti0sbn0a25x8j6yso', 'xk1s3b9ti0sbn0a25x8j6ysoh', 'ck1s3b9ti0sbn0a25x8j6yso-')
+        assert not cuid.all_valid(ids)
+        assert [3, 4, 5] == cuid.invalid_indexes(ids)
+
+    def test_version_id_decode(self):
+        v_ids = ('1585069015158-fmpmKq', '1585069015159-000001')
+        components = decode_version_ids(v_ids)
+        assert [1585069015158, 1585069015159] == components.timestamp
+        assert [VersionId(v_ids[0]).random(), 1] == components.random
+
+
+class TestClassTypedVertex:
+    def test_make_vertex_class(self):
+        cls = make_vertex_class(OgitEntity.OGIT_NOTE, (OgitAttribute.OGIT_NAME, OgitAttribute.OGIT_CONTENT))
+        try:
+            data = {
+                'ogit/_id': 'ck1s3b9ti0sbn0a25x8j6ysoh',
+                'ogit/_type': 'ogit/Note',
+                'ogit/name': 'foo',
+                'ogit/subject': 'bar',
+            }
+            vertex = to_vertex(data, None)
+            assert type(vertex) is cls
+            assert 'foo' == vertex.ogit_name
+            assert 'foo' == vertex[OgitAttribute.OGIT_NAME]
+            assert 'bar' == vertex['ogit/subject']
+            assert 'ogit/content' not in vertex
+            assert 2 == len(vertex)
+            assert {**data, 'ogit/_is-deleted': False} == vertex.to_dict()
+            assert vertex == pickle.loads(pickle.dumps(vertex))
+
+            keyed = cls({OgitAttribute.OGIT_NAME: 'foo', OgitAttribute.OGIT_CONTENT.value: 'baz'}, draft=False)
+            assert 'foo' == keyed.ogit_name == keyed['ogit/name']
+            assert 'baz' == keyed.ogit_content == keyed[OgitAttribute.OGIT_CONTENT]
+            assert 2 == len(keyed)
+            spelled = cls({'ogit:name': 'foo'}, draft=False)
+            assert 'foo' == spelled.ogit_name
+            assert 1 == len(spelled)
+
+            vertex['ogit/content'] = 'baz'
+            assert 'baz' == vertex.ogit_content
+            del vertex[OgitAttribute.OGIT_CONTENT]
+            with pytest.raises(KeyError):
+                vertex[OgitAttribute.OGIT_CONTENT]
+        finally:
+            unregister_vertex_class(OgitEntity.OGIT_NOTE)
+        assert type(to_vertex(data, None)) is Vertex
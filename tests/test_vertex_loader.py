@@ -0,0 +1,112 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from arago.hiro.backend.six.graph import Hiro6GraphVertexModel
+from arago.hiro.client.vertex_loader import VertexLoader
+from arago.hiro.model.graph.vertex import Vertex
+
+
+class FakeSearch:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def get_by_ids(self, *vertex_ids, fields=None):
+        self.calls.append(vertex_ids)
+        for vertex_id in vertex_ids:
+            if not vertex_id.startswith('missing'):
+                yield Vertex({'ogit/_id': vertex_id}, None, False)
+
+
+def fake_client(search: FakeSearch) -> SimpleNamespace:
+    return SimpleNamespace(model=SimpleNamespace(search=search))
+
+
+class TestClassVertexLoader:
+    def test_coalesce_threads(self):
+        search = FakeSearch()
+        loader = VertexLoader(fake_client(search), max_batch=100, delay=0.05)
+        results = {}
+
+        def load(i: int) -> None:
+            results[i] = loader.load(f'id-{i % 10}')
+
+        threads = [threading.Thread(target=load, args=(i,)) for i in range(30)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert 1 == len(search.calls)
+        assert 10 == len(search.calls[0])
+        assert all(results[i].id == f'id-{i % 10}' for i in range(30))
+
+    def test_max_batch_and_missing(self):
+        search = FakeSearch()
+        loader = VertexLoader(fake_client(search), max_batch=4, delay=10)
+        futures = [loader.load_future(f'id-{i}') for i in range(8)]
+        assert [4, 4] == [len(call) for call in search.calls]
+        assert 'id-7' == futures[7].result().id
+        future = loader.load_future('missing-1')
+        loader.flush()
+        with pytest.raises(KeyError):
+            future.result()
+
+    def test_async(self):
+        search = FakeSearch()
+        loader = VertexLoader(fake_client(search), delay=0.01)
+
+        async def main():
+            return await asyncio.gather(*(loader.load_async(f'id-{i}') for i in range(5)))
+
+        vertices = asyncio.run(main())
+        assert [f'id-{i}' for i in range(5)] == [v.id for v in vertices]
+        assert 1 == len(search.calls)
+
+    def test_batched_get(self):
+        search = FakeSearch()
+        root = SimpleNamespace(
+            batch_gets=True,
+            resolve_vertex_id=lambda vertex, vertex_id, vertex_xid: vertex_id
+        )
+        root.vertex_loader = VertexLoader(fake_client(search), delay=0.05)
+        model = Hiro6GraphVertexModel.__new__(Hiro6GraphVertexModel)
+        model._Hiro6GraphVertexModel__base_client = SimpleNamespace(root=root)
+        barrier = threading.Barrier(4)
+        results = {}
+
+        def get_each(n: int) -> None:
+            # sequential gets, in step with the other threads
+            for i in range(5):
+                barrier.wait()
+                results[n, i] = model.get(f'id-{n}-{i}')
+
+        threads = [threading.Thread(target=get_each, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert 5 == len(search.calls)
+        assert all(4 == len(call) for call in search.calls)
+        assert all(results[n, i].id == f'id-{n}-{i}' for n in range(4) for i in range(5))
+        with pytest.raises(KeyError):
+            model.get('missing-1')
+        root.batch_gets = False
+        with pytest.raises(KeyError):
+            model.get('missing-2', batch=True)
+        assert 7 == len(search.calls)
+
+    def test_get_keyword_only(self):
+        search = FakeSearch()
+        root = SimpleNamespace(
+            batch_gets=False,
+            resolve_vertex_id=lambda vertex, vertex_id, vertex_xid: vertex_id
+        )
+        root.vertex_loader = VertexLoader(fake_client(search), delay=0)
+        model = Hiro6GraphVertexModel.__new__(Hiro6GraphVertexModel)
+        model._Hiro6GraphVertexModel__base_client = SimpleNamespace(root=root)
+        # v_id and batch are keyword-only, as declared by the overloads
+        with pytest.raises(RuntimeError):
+            model.get('id-1', None, True)
+        assert 'id-1' == model.get('id-1', None, batch=True).id